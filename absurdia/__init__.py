@@ -1,8 +1,8 @@
 # Absurdia Python bindings
 
-from absurdia.resources import *  # noqa
+import importlib
+
 from absurdia.version import VERSION
-from absurdia.clients import Client
 from absurdia.agent_credentials import (
     token, 
     agent_filepath, 
@@ -11,16 +11,42 @@ from absurdia.agent_credentials import (
 )
 
 __all__ = [
-    Client,
-    token,
-    agent_filepath,
-    agent_id,
-    agent_signature_key
+    "Client",
+    "AsyncClient",
+    "token",
+    "agent_filepath",
+    "agent_id",
+    "agent_signature_key"
 ]
 
+# Imported on first access (PEP 562), so that `import absurdia` does not
+# pay for `requests`, `asyncio` and the resources until they are used.
+_lazy_attributes = {
+    "Client": "absurdia.clients",
+    "AsyncClient": "absurdia.clients.async_client",
+    "ResourceRequestor": "absurdia.resources",
+    "AsyncResourceRequestor": "absurdia.resources",
+    "APIError": "absurdia.api_error",
+}
+
+
+def __getattr__(name):
+    module = _lazy_attributes.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
 # Configuration variables
 
 default_http_client = None
+# Base URL of the API, e.g. of an `absurdia.testing.LocalServer`.
+api_base = None
 app_info = None
 enable_telemetry = True
 max_network_retries = 5
@@ -1,40 +1,63 @@
+import inspect
 import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
 from copy import deepcopy
+from weakref import WeakSet
 
-import absurdia
+from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
 
-def _compute_diff(current, previous):
-    if isinstance(current, dict):
-        previous = previous or {}
-        diff = current.copy()
-        for key in set(previous.keys()) - set(diff.keys()):
+# Sentinel of a key absent from the previous values.
+_MISSING = object()
+
+
+def _compute_diff(current, previous=_MISSING):
+    """
+    Returns what changed from `previous` to `current`: nested dicts are
+    diffed key by key, other values are sent whole, and None or removed
+    keys become "", which unsets them. Returns _MISSING when nothing changed,
+    including a key set to None which was not there before.
+    """
+    if current is None:
+        return "" if previous is not None and previous is not _MISSING else _MISSING
+    if isinstance(current, dict) and isinstance(previous, dict):
+        diff = {}
+        for key, value in current.items():
+            child = _compute_diff(value, previous.get(key, _MISSING))
+            if child is not _MISSING:
+                diff[key] = child
+        for key in previous.keys() - current.keys():
             diff[key] = ""
-        return diff
-    return current if current is not None else ""
+        return diff if diff else _MISSING
+    if previous is not _MISSING and current == previous:
+        return _MISSING
+    return current
 
 
-def _serialize_list(array, previous):
-    array = array or []
-    previous = previous or []
-    params = {}
-
-    for i, v in enumerate(array):
-        previous_item = previous[i] if len(previous) > i else None
-        if hasattr(v, "serialize"):
-            params[str(i)] = v.serialize(previous_item)
-        else:
-            params[str(i)] = _compute_diff(v, previous_item)
-
-    return params
+def _snapshot(values: dict) -> dict:
+    """
+    Returns a copy of `values` which later changes to them, including to
+    nested dicts and lists, leave as is.
+    """
+    return {
+        k: deepcopy(v) if isinstance(v, (dict, list)) else v
+        for k, v in values.items()
+    }
 
 
 class AbsurdiaObject(dict):
+    # Called with the changed key, or None when every value is replaced, by
+    # the list holding the object to keep its indexes current.
+    _on_change = None
+
     def __init__(
         self,
         id: str = None,
         values: dict = {},
         response: APIResponse = None,
+        requestor=None,
         **params
     ):
         super().__init__()
@@ -42,14 +65,18 @@ class AbsurdiaObject(dict):
         self._unsaved_values = set()
         self._transient_values = set()
         self._response = response
+        self._requestor = requestor
         self._retrieve_params = params
 
-        if not bool(values):
+        if not bool(values) and response is not None:
             values = response.json
             if values.get("data"):
-                values = response.json["data"]
-        print(values)
+                values = values["data"]
         super().update(values)
+        # Values as last fetched or saved, which `serialize` diffs against.
+        self._saved = None
+        if response is not None or requestor is not None:
+            self._saved = _snapshot(self)
 
         if id:
             self._id = id
@@ -105,6 +132,8 @@ class AbsurdiaObject(dict):
         self._unsaved_values.add(k)
 
         super().__setitem__(k, v)
+        if self._on_change is not None:
+            self._on_change(k)
 
     def __getitem__(self, k):
         try:
@@ -128,6 +157,8 @@ class AbsurdiaObject(dict):
         # Allows for unpickling in Python 3.x
         if hasattr(self, "_unsaved_values") and k in self._unsaved_values:
             self._unsaved_values.remove(k)
+        if self._on_change is not None:
+            self._on_change(k)
 
     # Custom unpickling method that uses `update` to update the dictionary
     # without calling __setitem__, which would fail if any value is an empty
@@ -194,27 +225,118 @@ class AbsurdiaObject(dict):
             for key, value in dict(self).items()
         }
 
-    def serialize(self, previous):
-        params = {}
-        unsaved_keys = self._unsaved_values or set()
-        previous = previous or {}
+    def _saved_values(self):
+        """
+        Returns the values of the object as last fetched or saved, or None
+        when the object was not built from the API.
+        """
+        return getattr(self, "_saved", None)
+
+    def serialize(self, previous: dict = None) -> dict:
+        """
+        Returns the changes made to the object since `previous`, by default
+        its values as last fetched or saved: changed keys only, with nested
+        dicts reduced to their changed keys, and "" for removed keys.
+        Without previous values, returns the keys set on the object.
+        """
+        if previous is None:
+            previous = self._saved_values()
+        if previous is None:
+            previous = {}
+            keys = self._unsaved_values
+        else:
+            keys = self.keys()
 
-        for k, v in iter(self):
-            if k == "id" or (isinstance(k, str) and k.startswith("_")):
-                continue
-            elif isinstance(v, absurdia.api_resources.abstract.APIResource):
+        params = {}
+        for k in keys:
+            if k == "id" or (isinstance(k, str) and k.startswith("_")) or k not in self:
                 continue
-            elif hasattr(v, "serialize"):
-                child = v.serialize(previous.get(k, None))
-                if child != {}:
-                    params[k] = child
-            elif k in unsaved_keys:
-                params[k] = _compute_diff(v, previous.get(k, None))
-            elif k == "additional_owners" and v is not None:
-                params[k] = _serialize_list(v, previous.get(k, None))
-
+            v = self[k]
+            old = previous.get(k, _MISSING)
+            if hasattr(v, "serialize"):
+                child = v.serialize(old if isinstance(old, dict) else {})
+            else:
+                child = _compute_diff(v, old)
+            if child is not _MISSING and child != {}:
+                params[k] = child
+        for k in previous.keys() - self.keys():
+            if k != "id":
+                params[k] = ""
         return params
 
+    def refresh_from(self, response: APIResponse):
+        """
+        Replaces the values of the object, in place, with those of `response`.
+        Keys the response does not have any more are remembered as transient.
+        """
+        values = response.json
+        if values.get("data"):
+            values = values["data"]
+        self._transient_values = set(self.keys()) - set(values.keys())
+        super().clear()
+        super().update(values)
+        self._unsaved_values = set()
+        self._response = response
+        self._saved = _snapshot(self)
+        if values.get("id"):
+            self._id = values["id"]
+        if self._on_change is not None:
+            self._on_change(None)
+
+    def _instance_path(self) -> str:
+        if self._requestor is None or self.id is None:
+            raise ValueError(
+                "%s has no identifier or requestor. Only objects retrieved "
+                "from the API can be saved or refreshed." % (type(self).__name__,)
+            )
+        return "%s/%s" % (self._requestor.base_path, self.id)
+
+    def _refresh_with(self, response):
+        if inspect.isawaitable(response):
+            # Requests of the `AsyncClient` are awaited by the caller.
+            async def refresh_async():
+                self._refresh_with(await response)
+                return self
+            return refresh_async()
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        self.refresh_from(response)
+        return self
+
+    def save(self, additional_headers: dict = {}, timeout: int = 5000):
+        """
+        Sends the changes made to the object since it was fetched or saved,
+        as a PATCH of the changed keys only, and updates the object in place
+        with the response. Sends nothing when nothing changed.
+        Returns the object, or a coroutine of it with the `AsyncClient`.
+        """
+        path = self._instance_path()
+        diff = self.serialize()
+        client = self._requestor._client
+        if not diff:
+            if inspect.iscoroutinefunction(client.request):
+                async def unchanged():
+                    return self
+                return unchanged()
+            return self
+        response = client.request(
+            "PATCH", path, data=diff,
+            additional_headers=additional_headers, timeout=timeout, compress=True
+        )
+        return self._refresh_with(response)
+
+    def refresh(self, additional_headers: dict = {}):
+        """
+        Fetches the object again and updates it in place, dropping unsaved
+        changes. Returns the object, or a coroutine of it with the `AsyncClient`.
+        """
+        path = self._instance_path()
+        response = self._requestor._client.request(
+            "GET", path, params=self._retrieve_params,
+            additional_headers=additional_headers
+        )
+        return self._refresh_with(response)
+
     # This class overrides __setitem__ to throw exceptions on inputs that it
     # doesn't like. This can cause problems when we try to copy an object
     # wholesale because some data that's returned from the API may not be valid
@@ -253,26 +375,263 @@ class AbsurdiaObject(dict):
 
         return copied
     
-class AbsurdiaObjectsList(list):
+class AbsurdiaObjectsList(Sequence):
+    """
+    Sequence of the objects of a list response. Rows are kept as tuples of
+    values sharing a tuple of keys, and an `AbsurdiaObject` is built for a
+    row when it is first accessed, then kept, so that changes made to it
+    last. Slices share the rows and objects of the list they are taken from.
+    :param list objects: Dicts of the values of the objects
+    :param APIResponse response: Response the objects were read from
+    :param requestor: Requestor of the resource, with which the objects
+                      can be saved and refreshed
+    :param type object_class: Class of the objects, `AbsurdiaObject` by default
+    """
     def __init__(
         self,
         objects: list,
         response: APIResponse = None,
+        requestor=None,
+        object_class: type = None,
         **params
     ):
         super().__init__()
 
         self._response = response
+        self._requestor = requestor
+        self._object_class = object_class or AbsurdiaObject
         self._retrieve_params = params
+        self._indexes = {}
+        self._sorted_indexes = {}
+        # Positions and values of the rows left out of the hash index of a
+        # field because their value is unhashable, such as a dict.
+        self._unindexed = {}
+
+        # Keys shared by the rows. Rows whose keys differ from the first
+        # row's are stored with the index of their keys in `_row_keys`.
+        self._keys = []
+        self._rows = []
+        self._row_keys = None
+
+        index = {}
+        last_keys, last_id = None, None
+        for i, object in enumerate(objects):
+            keys = tuple(object)
+            if keys != last_keys:
+                last_id = index.get(keys)
+                if last_id is None:
+                    last_id = index[keys] = len(self._keys)
+                    self._keys.append(keys)
+                last_keys = keys
+            if last_id and self._row_keys is None:
+                self._row_keys = array("I", [0]) * i
+            if self._row_keys is not None:
+                self._row_keys.append(last_id)
+            self._rows.append(tuple(object.values()))
+
+        # Rows of `_rows` in this list, which a slice narrows down.
+        self._range = range(len(self._rows))
+        # Objects built so far, by row, shared with slices.
+        self._views = {}
+        # Lists sharing these objects, whose indexes a change invalidates.
+        self._family = WeakSet([self])
+
+    @property
+    def response(self):
+        return self._response
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._slice(i)
+        if i < 0:
+            i += len(self._range)
+        if not 0 <= i < len(self._range):
+            raise IndexError("list index out of range")
+        row = self._range[i]
+        view = self._views.get(row)
+        if view is None:
+            view = self._object_class(
+                values=dict(zip(self._keys_of(row), self._rows[row])),
+                requestor=self._requestor
+            )
+            view._on_change = self._changed
+            self._views[row] = view
+        return view
+
+    def __iter__(self):
+        for i in range(len(self._range)):
+            yield self[i]
+
+    def __repr__(self):
+        return "<%s at %s> %d objects" % (
+            type(self).__name__, hex(id(self)), len(self._range)
+        )
+
+    def _keys_of(self, row: int) -> tuple:
+        if self._row_keys is None:
+            return self._keys[0]
+        return self._keys[self._row_keys[row]]
+
+    def _changed(self, field):
+        # Called by an object of the list when `field`, or every field if
+        # None, changes.
+        for objects in self._family:
+            if field is None:
+                objects._indexes.clear()
+                objects._sorted_indexes.clear()
+                objects._unindexed.clear()
+            else:
+                objects._indexes.pop(field, None)
+                objects._sorted_indexes.pop(field, None)
+                objects._unindexed.pop(field, None)
+
+    def _slice(self, s: slice):
+        sliced = AbsurdiaObjectsList(
+            [], self._response, self._requestor, self._object_class,
+            **self._retrieve_params
+        )
+        sliced._keys = self._keys
+        sliced._rows = self._rows
+        sliced._row_keys = self._row_keys
+        sliced._range = self._range[s]
+        sliced._views = self._views
+        sliced._family = self._family
+        self._family.add(sliced)
+        return sliced
+
+    def to_dicts(self) -> list:
+        """ Returns the objects as a list of plain dicts. """
+        dicts = []
+        for row in self._range:
+            view = self._views.get(row)
+            if view is None:
+                dicts.append(dict(zip(self._keys_of(row), self._rows[row])))
+            else:
+                dicts.append(dict(view))
+        return dicts
+
+    def _positions(self, field: str) -> list:
+        """ Returns the position of `field` in each tuple of keys, or None. """
+        return [keys.index(field) if field in keys else None for keys in self._keys]
+
+    def _values(self, field: str):
+        """
+        Yields the position in the list and the value of `field` of each
+        object having it, reading objects already built, which may have
+        changed, instead of their row.
+        """
+        positions = self._positions(field)
+        rows, row_keys, views = self._rows, self._row_keys, self._views
+        for i, row in enumerate(self._range):
+            view = views.get(row) if views else None
+            if view is not None:
+                value = dict.get(view, field, _MISSING)
+                if value is not _MISSING:
+                    yield i, value
+                continue
+            position = positions[row_keys[row] if row_keys is not None else 0]
+            if position is not None:
+                yield i, rows[row][position]
+
+    def _index(self, field: str) -> dict:
+        """ Returns the hash index of `field`, mapping values to row numbers. """
+        index = self._indexes.get(field)
+        if index is None:
+            index = {}
+            unindexed = []
+            for i, value in self._values(field):
+                try:
+                    index.setdefault(value, []).append(i)
+                except TypeError: # Unhashable value, such as a dict
+                    unindexed.append((i, value))
+            self._indexes[field] = index
+            self._unindexed[field] = unindexed
+        return index
+
+    def _matches(self, field: str, value) -> list:
+        """
+        Returns the positions of the objects whose `field` equals `value`,
+        from the hash index, and by comparing the unhashable values the
+        index left out.
+        """
+        index = self._index(field)
+        try:
+            rows = list(index.get(value, ()))
+        except TypeError: # Unhashable value, such as a dict
+            rows = []
+        rows.extend(i for i, other in self._unindexed[field] if other == value)
+        return rows
+
+    def _sorted_index(self, field: str) -> tuple:
+        """ Returns the numeric values of `field` in order, and their row numbers. """
+        index = self._sorted_indexes.get(field)
+        if index is None:
+            pairs = sorted(
+                (value, i) for value, rows in self._index(field).items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                for i in rows
+            )
+            index = ([value for value, _ in pairs], [i for _, i in pairs])
+            self._sorted_indexes[field] = index
+        return index
+
+    def by(self, field: str) -> "_IndexView":
+        """
+        Returns a mapping from each value of `field` to the list of objects
+        having that value. The index behind it is built on first use and
+        kept, so lookups take constant time.
+        """
+        return _IndexView(self, self._index(field))
 
-        self._objects = []
-        for object in objects:
-            self._objects.append(AbsurdiaObject(values=object))
-            
     def find(self, **kwargs):
-        def condition(obj: AbsurdiaObject):
-            for key,value in kwargs.items():
-                if key in obj and obj[key] == value:
-                    return True
-            return False
-        return filter(condition, self._objects)
\ No newline at end of file
+        """
+        Returns an iterator over the objects matching all the given field
+        values, using the hash index of each field. Unhashable values, such
+        as dicts, are compared one by one.
+        """
+        if not kwargs:
+            return iter(self)
+        matches = None
+        for key, value in kwargs.items():
+            rows = self._matches(key, value)
+            matches = set(rows) if matches is None else matches.intersection(rows)
+            if not matches:
+                return iter(())
+        return (self[i] for i in sorted(matches))
+
+    def find_any(self, **kwargs):
+        """ Returns an iterator over the objects matching any of the given field values. """
+        matches = set()
+        for key, value in kwargs.items():
+            matches.update(self._matches(key, value))
+        return (self[i] for i in sorted(matches))
+
+    def between(self, field: str, low=None, high=None):
+        """
+        Returns an iterator over the objects whose numeric `field` is between
+        `low` and `high` included, in increasing order of `field`. Either
+        bound can be None. Uses a sorted index built on first use.
+        """
+        values, rows = self._sorted_index(field)
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return (self[rows[i]] for i in range(start, end))
+
+
+class _IndexView(Mapping):
+    """ Read-only mapping from the values of a field to the objects holding them. """
+    def __init__(self, objects: AbsurdiaObjectsList, index: dict):
+        self._objects = objects
+        self._index = index
+
+    def __getitem__(self, value):
+        return [self._objects[i] for i in self._index[value]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
@@ -1,4 +1,4 @@
-import json
+from absurdia import json_backend
 
 class APIError(Exception):
     def __init__(
@@ -27,13 +27,13 @@ class APIError(Exception):
         if self.headers.get("content-type", None):
             if "application/json" in self.headers["content-type"]:
                 try:
-                    self.json_body = json.loads(self._message)
+                    self.json_body = json_backend.loads(self._message)
                 except BaseException:
                     pass
 
-        self.code = None
+        self._code = None
         if self.json_body:
-            self.code = self.json_body.get("code", None)
+            self._code = self.json_body.get("code", None)
 
     def __str__(self):
         if self.request_id is not None:
@@ -57,7 +57,7 @@ class APIError(Exception):
     
     @property
     def code(self):
-        return self.code
+        return self._code
 
     def __repr__(self):
         return "%s(message=%r, http_status=%r, request_id=%r)" % (
@@ -1,12 +1,23 @@
-import json
+import time
+
+from absurdia import json_backend
+
+# Value of a body not decoded yet, as a body of `null` decodes to None.
+_UNSET = object()
 
 class APIResponse():
-    def __init__(self, status_code: int, text: str, headers=None):
+    def __init__(self, status_code: int, text: str, headers=None, on_decode=None):
+        """
+        :param on_decode: Function called with the time taken to decode the
+                          JSON body, in milliseconds, when it is first accessed
+        """
         self.content = text
         self.headers = headers
         self.cached = False
         self.status_code = status_code
         self.ok = self.status_code < 400
+        self._json = _UNSET
+        self._on_decode = on_decode
 
     @property
     def text(self):
@@ -14,7 +25,15 @@ class APIResponse():
     
     @property
     def json(self):
-        return json.loads(self.content)
+        # Decoded on first access only.
+        if self._json is _UNSET:
+            if self._on_decode is None:
+                self._json = json_backend.loads(self.content)
+            else:
+                start = time.perf_counter()
+                self._json = json_backend.loads(self.content)
+                self._on_decode((time.perf_counter() - start) * 1000)
+        return self._json
     
     @property
     def request_id(self):
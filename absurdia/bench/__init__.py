@@ -0,0 +1,175 @@
+"""
+Benchmarks of the overhead of the SDK itself: the request path, building
+objects from responses, building upload payloads and converting to
+DataFrames. Results are printed as JSON, to compare releases.
+
+    $ python -m absurdia.bench
+    $ python -m absurdia.bench --filter objects --quick
+    $ python -m absurdia.bench --output new.json --compare old.json
+"""
+import importlib
+import itertools
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+# Registered benchmarks, in the order they run.
+BENCHMARKS = []
+
+
+class Skip(Exception):
+    """ Raised by the setup of a benchmark which cannot run here, e.g. for a missing dependency. """
+
+
+class Benchmark():
+    """
+    A benchmark and the values of its parameters. Its setup is a generator
+    function of one value per parameter, which yields a function to time
+    and the number of units (rows, calls, positions...) it processes, then
+    tears down what it set up.
+    """
+
+    def __init__(self, name: str, setup, params: dict):
+        self.name = name
+        self.setup = contextmanager(setup)
+        self.params = params
+
+    def cases(self):
+        """ Yields the parameters of each case, every combination of the values. """
+        names = list(self.params)
+        for values in itertools.product(*(self.params[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+def benchmark(name: str, **params):
+    """
+    Registers a benchmark. Each keyword is a parameter, with the list of
+    its values to benchmark.
+
+        @benchmark("objects.list", rows=[10, 1000])
+        def objects_list(rows):
+            body = make_body(rows)
+            yield (lambda: BacktestsList(APIResponse(200, body))), rows
+    """
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, params))
+        return setup
+    return register
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.1) -> dict:
+    """
+    Times `fn`, calling it in loops of at least `min_time` seconds, and
+    returns the median, min, mean and standard deviation of a call over
+    `repeat` loops, in seconds of wall and CPU time.
+    """
+    fn()  # Warms up caches, connections and lazy imports
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    walls, cpus = [], []
+    for _ in range(repeat):
+        cpu = time.process_time()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        walls.append((time.perf_counter() - start) / number)
+        cpus.append((time.process_time() - cpu) / number)
+    return {
+        "calls": number * repeat,
+        "median_s": statistics.median(walls),
+        "min_s": min(walls),
+        "mean_s": statistics.mean(walls),
+        "stdev_s": statistics.stdev(walls) if repeat > 1 else 0.0,
+        "cpu_median_s": statistics.median(cpus),
+    }
+
+
+def environment() -> dict:
+    from absurdia import json_backend
+    from absurdia.version import VERSION
+    return {
+        "absurdia": VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "json_backend": json_backend.name,
+        "time": int(time.time()),
+    }
+
+
+def run(filter: str = None, repeat: int = 5, min_time: float = 0.1, log=sys.stderr) -> dict:
+    """
+    Runs the benchmarks whose name contains `filter` and returns their
+    results, along with the environment they ran in.
+    """
+    # Imported for its side effect: its `@benchmark` functions register themselves.
+    importlib.import_module("absurdia.bench.suites")
+
+    results = []
+    for bench in BENCHMARKS:
+        if filter and filter not in bench.name:
+            continue
+        for params in bench.cases():
+            result = {"name": bench.name, "params": params}
+            try:
+                with bench.setup(**params) as (fn, units):
+                    result.update(measure(fn, repeat=repeat, min_time=min_time))
+                    result["units_per_s"] = units / result["median_s"]
+            except Skip as e:
+                result["skipped"] = str(e)
+            results.append(result)
+            if log is not None:
+                log.write(format_result(result) + "\n")
+                log.flush()
+    return {"environment": environment(), "results": results}
+
+
+def _key(result: dict) -> tuple:
+    return result["name"], tuple(sorted(result["params"].items()))
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """
+    Returns the results at least `threshold` times slower than in `baseline`,
+    as `(result, ratio)` tuples. Sets `baseline_median_s` and `ratio` on
+    every result found in the baseline.
+    """
+    previous = {
+        _key(result): result for result in baseline["results"] if "median_s" in result
+    }
+    regressions = []
+    for result in results["results"]:
+        before = previous.get(_key(result))
+        if before is None or "median_s" not in result:
+            continue
+        result["baseline_median_s"] = before["median_s"]
+        result["ratio"] = result["median_s"] / before["median_s"]
+        if result["ratio"] >= 1 + threshold:
+            regressions.append((result, result["ratio"]))
+    return regressions
+
+
+def format_result(result: dict) -> str:
+    params = ", ".join("%s=%s" % item for item in result["params"].items())
+    label = "%s(%s)" % (result["name"], params)
+    if "skipped" in result:
+        return "%-48s skipped: %s" % (label, result["skipped"])
+    line = "%-48s %10.1f us/call  %12.0f units/s  (cpu %.1f us)" % (
+        label, result["median_s"] * 1e6, result["units_per_s"], result["cpu_median_s"] * 1e6
+    )
+    if "ratio" in result:
+        line += "  x%.2f" % (result["ratio"],)
+    return line
@@ -0,0 +1,47 @@
+import argparse
+import json
+import logging
+import sys
+
+from absurdia import bench
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m absurdia.bench", description=bench.__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument("--filter", help="Only run the benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Fewer and shorter loops")
+    parser.add_argument("--output", help="Write the results to this file instead of stdout")
+    parser.add_argument("--compare", help="Results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown reported as a regression, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    # Warnings such as the missing `freqtrade` package would be logged on every call.
+    logging.disable(logging.WARNING)
+
+    results = bench.run(
+        filter=args.filter,
+        repeat=3 if args.quick else 5,
+        min_time=0.02 if args.quick else 0.1
+    )
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = bench.compare(results, json.load(f), args.threshold)
+        for result, ratio in regressions:
+            sys.stderr.write("REGRESSION: %s\n" % (bench.format_result(result),))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+import multiprocessing
+import random
+from contextlib import contextmanager
+
+from absurdia import compression, json_backend
+from absurdia.bench import Skip, benchmark
+
+TOKEN = "0" * 64
+
+TRANSPORTS = ("requests", "urllib3", "httpx")
+
+# Host information uploaded with imports, fixed so that it is not measured.
+HOST = {"hostname": "bench", "platform": "Linux", "cpu_count": 8}
+
+
+def make_rows(rows: int) -> list:
+    """ Returns `rows` backtests, as listed by the API. """
+    return [
+        {
+            "id": "bt_%024d" % (i,),
+            "strategy_id": "str_%024d" % (i % 50,),
+            "name": "Backtest %d" % (i,),
+            "status": "finished",
+            "start_date": 1640995200000 + i,
+            "end_date": 1672531200000 + i,
+            "timeframe": "5m",
+            "initial_balance": 1000.0,
+            "configs": {"stake_amount": 100, "max_open_trades": 3},
+        }
+        for i in range(rows)
+    ]
+
+
+def make_positions(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "symbol": "BTC/USDT",
+            "venue": "binance",
+            "side": "buy" if i % 2 else "sell",
+            "price": round(20000 + rng.random() * 1000, 2),
+            "amount": round(rng.random(), 6),
+            "fee": 0.001,
+            "timestamp": 1640995200000000 + i * 60000000,
+        }
+        for i in range(count)
+    ]
+
+
+def make_freqtrade_export(trades: int, seed: int = 0) -> dict:
+    """ Returns a Freqtrade backtest export of one strategy with `trades` trades. """
+    rng = random.Random(seed)
+    return {
+        "strategy": {
+            "Bench": {
+                "trades": [
+                    {
+                        "pair": "BTC/USDT",
+                        "stake_amount": 100.0,
+                        "amount": round(rng.random(), 8),
+                        "open_date": "2022-01-01 00:%02d:00+00:00" % (i % 60,),
+                        "close_date": "2022-01-01 01:%02d:00+00:00" % (i % 60,),
+                        "open_rate": round(20000 + rng.random() * 1000, 2),
+                        "close_rate": round(20000 + rng.random() * 1000, 2),
+                        "fee_open": 0.001,
+                        "fee_close": 0.001,
+                        "profit_ratio": round(rng.uniform(-0.05, 0.05), 6),
+                        "profit_abs": round(rng.uniform(-5, 5), 6),
+                        "exit_reason": "roi",
+                        "is_short": False,
+                    }
+                    for i in range(trades)
+                ],
+                "stake_currency": "USDT",
+                "timeframe": "5m",
+                "backtest_start": "2022-01-01 00:00:00",
+                "backtest_end": "2023-01-01 00:00:00",
+            }
+        },
+        "strategy_comparison": [{"key": "Bench", "trades": trades}],
+    }
+
+
+def _serve(conn, options: dict):
+    from absurdia.testing import LocalServer
+    server = LocalServer(**options).start()
+    conn.send(server.url)
+    conn.recv()  # Until the benchmark is done
+    server.stop()
+
+
+@contextmanager
+def local_server(**options):
+    """
+    Runs a `LocalServer` in another process, so that its work is not
+    measured with the client's. Yields its URL.
+    """
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe()
+    process = context.Process(target=_serve, args=(child, options), daemon=True)
+    process.start()
+    try:
+        yield parent.recv()
+    finally:
+        parent.send(None)
+        process.join(5)
+
+
+def _client(api_base: str, **options):
+    from absurdia.clients import Client
+    return Client(TOKEN, api_base=api_base, enable_telemetry=False, **options)
+
+
+@benchmark("client.request", transport=TRANSPORTS)
+def client_request(transport):
+    """ A small GET through `Client.request`, retries and instrumentation included. """
+    with local_server() as url:
+        try:
+            client = _client(url, transport=transport)
+        except ImportError as e:
+            raise Skip(str(e))
+        params = {"current": "true"}
+        yield (lambda: client.request("GET", "/v1/accounts", params=params)), 1
+        client.http_client.close()
+
+
+@benchmark("objects.list", rows=[10, 1000, 10000])
+def objects_list(rows):
+    """ Decoding a list response and building its `AbsurdiaObjectsList`. """
+    from absurdia.api_response import APIResponse
+    from absurdia.resources.backtests import BacktestsList
+    body = json_backend.dumps({"data": make_rows(rows), "has_more": False}).decode("utf-8")
+    yield (lambda: BacktestsList(APIResponse(200, body, {}))), rows
+
+
+@benchmark("objects.iterate", rows=[10, 1000, 10000])
+def objects_iterate(rows):
+    """ Reading a field of every object of an `AbsurdiaObjectsList`. """
+    from absurdia.absurdia_object import AbsurdiaObjectsList
+    objects = AbsurdiaObjectsList(make_rows(rows))
+    yield (lambda: [obj["id"] for obj in objects]), rows
+
+
+@benchmark("objects.object", rows=[10, 1000, 10000])
+def objects_object(rows):
+    """ Building a single `AbsurdiaObject` holding `rows` positions. """
+    from absurdia.absurdia_object import AbsurdiaObject
+    from absurdia.api_response import APIResponse
+    body = json_backend.dumps({"data": {"id": "bt_1", "positions": make_positions(rows)}})
+    body = body.decode("utf-8")
+    yield (lambda: AbsurdiaObject(response=APIResponse(200, body, {}))), rows
+
+
+@benchmark("freqtrade.payload", trades=[100, 20000], encoding=[None, "gzip"])
+def freqtrade_payload(trades, encoding):
+    """ Building the body of `import_freqtrade`, as it is sent. """
+    from absurdia.resources.backtests import _import_freqtrade_data
+    export = make_freqtrade_export(trades)
+
+    def build():
+        data = _import_freqtrade_data(export, "Bench", "freqtrade backtesting", HOST)
+        body, _ = compression.encode_json(data, encoding, threshold=0)
+        return body if isinstance(body, bytes) else b"".join(body)
+
+    yield build, trades
+
+
+@benchmark("positions.upload", batch=[100, 1000])
+def positions_upload(batch):
+    """ `Backtest.add_positions` throughput, compression included. """
+    with local_server() as url:
+        client = _client(url)
+        backtest = client.backtests.create(
+            1640995200000, 1672531200000, "5m", strategy_name="Bench"
+        )
+        positions = make_positions(batch)
+        yield (lambda: backtest.add_positions(positions)), batch
+        client.http_client.close()
+
+
+@benchmark("columnar.convert", rows=[1000, 100000], format=["numpy", "pandas", "arrow"])
+def columnar_convert(rows, format):
+    """ Decoding a response of positions into columns, as `positions(format=...)` does. """
+    from absurdia import columnar
+    module = "pyarrow" if format == "arrow" else format
+    try:
+        __import__(module)
+    except ImportError:
+        raise Skip("%s is not installed" % (module,))
+    body = json_backend.dumps({"data": make_positions(rows)}).decode("utf-8")
+    yield (lambda: columnar.convert(body, format)), rows
+
+
+@benchmark("util.to_df", rows=[1000, 10000])
+def util_to_df(rows):
+    from absurdia.util import to_df
+    try:
+        __import__("pandas")
+    except ImportError:
+        raise Skip("pandas is not installed")
+    positions = make_positions(rows)
+    yield (lambda: to_df(positions)), rows
@@ -1,10 +1,12 @@
 import os
 import absurdia
+import absurdia.util
 import click
 
 from click import secho
 
 from .importers import _import
+from .spool import spool
 
 os.environ['ABSURDIA_BACKTEST'] = '1'
 
@@ -61,3 +63,4 @@ def login(save, file, token, sig_key):
 
 cli.add_command(login)
 cli.add_command(_import)
+cli.add_command(spool)
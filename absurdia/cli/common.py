@@ -1,4 +1,5 @@
 import absurdia
+import absurdia.util
 from click import echo, secho
 
 def check_login():
@@ -4,19 +4,26 @@ import click
 
 from click import secho, echo
 from absurdia.cli.common import check_login
-from .freqtrade import read_results, transform_cmd
+from .freqtrade import find_export, iter_export, transform_cmd
 
 def upload_freqtrade_results(exportpath: str, 
                              configpath: str, 
                              name: str = None, 
-                             cli_command: str = None):
+                             cli_command: str = None,
+                             fields: list = None,
+                             profile: dict = None):
     """Uploads Freqtrade results to Absurdia"""
 
-    data = read_results(exportpath, configpath)
+    path = find_export(exportpath)
+    if path is None:
+        secho("No Freqtrade export found at %s." % (exportpath,), fg="red", err=True)
+        return
     client = absurdia.Client(agent=absurdia.token)
     
     try:
-        backtest = client.backtests.import_freqtrade(data, name, cli_command)
+        backtest = client.backtests.import_freqtrade_stream(
+            lambda: iter_export(path, fields), name, cli_command, profile=profile
+        )
         secho("Successfully imported!", fg='green')
         bid = backtest["id"]
         sid = backtest["strategy_id"]
@@ -40,26 +47,42 @@ def upload_freqtrade_results(exportpath: str,
               help="Path to parameters/configs file (JSON).")
 @click.option('-d', '--data', type=click.Path(exists=True, dir_okay=False), 
               help="Path to data file (JSON).")
+@click.option('--fields', type=str, 
+              help="""Comma-separated keys of the strategy results to upload.
+              All keys are uploaded if not given.""")
 @click.argument('command', nargs=-1, required=False)
-def _import(name, freqtrade, adapter, params, data, command):
+def _import(name, freqtrade, adapter, params, data, fields, command):
     """
     Backtesting service to automatically upload the results of
     a backtest once it has finished.
     Example: absurdia backtest --freqtrade backtesting
     """
     check_login()
+    if fields:
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
 
     if isinstance(freqtrade, tuple) and command:
         cmd = ("freqtrade",) + command
         secho("[Absurdia] Running Freqtrade command: " + " ".join(cmd), fg='blue')
         fin = transform_cmd(cmd)
+        from absurdia.profiling import ProcessProfiler
         process = subprocess.Popen(fin["command"])
-        process.wait()
+        with ProcessProfiler(process) as profiler:
+            process.wait()
+        profile = profiler.summary()
+        secho(
+            "[Absurdia] Freqtrade ran in %.1fs, using %.1fs of CPU and %.0f MB of memory at most."
+            % (profile["wall_time_s"], profile["cpu_user_s"] + profile["cpu_system_s"],
+               profile["peak_rss_bytes"] / 1e6),
+            fg='blue'
+        )
         upload_freqtrade_results(
             fin["exportpath"], 
             fin["configpath"], 
             name=name, 
-            cli_command=" ".join(cmd)
+            cli_command=" ".join(cmd),
+            fields=fields,
+            profile=profile
         )
     elif adapter == 'freqtrade':
         if not data:
@@ -70,6 +93,6 @@ def _import(name, freqtrade, adapter, params, data, command):
             )
             return
         else:
-            upload_freqtrade_results(data, params)
+            upload_freqtrade_results(data, params, name=name, fields=fields)
     else:
         echo(click.style("Invalid import command.", fg='red'), err=True)
\ No newline at end of file
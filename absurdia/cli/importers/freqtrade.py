@@ -2,6 +2,13 @@ import os
 import time
 import json
 
+try:
+    ijson = __import__("ijson")
+except ImportError:
+    ijson = None
+
+from absurdia.compression import CHUNK_SIZE, iter_json
+
 def transform_cmd(cmd: tuple) -> dict:
     """Returns a dictionary with new command and metadata to import.
     return {
@@ -61,14 +68,107 @@ def bundle_results(exportpath: str, configpath: str) -> dict:
     
     return result
 
-def read_results(exportpath: str, configpath: str) -> dict:
-    result = None
+def find_export(exportpath: str) -> str:
+    """
+    Returns the path of the most recent Freqtrade export matching
+    `exportpath`, without reading any of them. `exportpath` is either the
+    path of the export itself or the prefix of its file name in the current
+    directory.
+    """
+    if os.path.isfile(exportpath):
+        return exportpath
+    found = None
     for file in os.listdir("."):
         if file.startswith(exportpath):
             if file.endswith(".meta.json"):
                 continue
             elif file.endswith(".json"):
-                with open(file, "r") as f:
-                    exported = json.load(f)
-                    result = exported
-    return result
\ No newline at end of file
+                if found is None or os.path.getmtime(file) >= os.path.getmtime(found):
+                    found = file
+    return found
+
+def _read_value(events, event: str, value, keep: bool = True):
+    """
+    Consumes the `ijson` events of a JSON value starting with (`event`,
+    `value`). Returns the value, or None if `keep` is False.
+    """
+    builder = ijson.ObjectBuilder() if keep else None
+    depth = 0
+    while True:
+        if builder:
+            builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return builder.value if builder else None
+        _, event, value = next(events)
+
+def _iter_projected(path: str, fields: list, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields the export as JSON, keeping only `fields` of each strategy
+    result. With `ijson` installed, the export is parsed incrementally and
+    the discarded fields are never built in memory.
+    """
+    if ijson is None:
+        with open(path, "rb") as f:
+            exported = json.load(f)
+        for result in exported.get("strategy", {}).values():
+            for key in set(result) - set(fields):
+                del result[key]
+        yield from iter_json(exported, chunk_size)
+        return
+
+    fields = set(fields)
+    with open(path, "rb") as f:
+        events = ijson.parse(f, use_float=True)
+        next(events) # Top-level start_map
+        yield b'{'
+        for i, (_, _, key) in enumerate(events):
+            if key is None: # Top-level end_map
+                break
+            yield (',' if i else '').encode() + json.dumps(key).encode() + b':'
+            _, event, value = next(events)
+            if key != "strategy" or event != "start_map":
+                yield from iter_json(_read_value(events, event, value), chunk_size)
+                continue
+
+            yield b'{'
+            for j, (_, _, name) in enumerate(events):
+                if name is None: # End of the strategies
+                    break
+                yield (',' if j else '').encode() + json.dumps(name).encode() + b':{'
+                next(events) # start_map of the strategy result
+                k = 0
+                for _, _, field in events:
+                    if field is None: # End of the strategy result
+                        break
+                    _, event, value = next(events)
+                    keep = field in fields
+                    result = _read_value(events, event, value, keep)
+                    if keep:
+                        yield (',' if k else '').encode() + json.dumps(field).encode() + b':'
+                        yield from iter_json(result, chunk_size)
+                        k += 1
+                yield b'}'
+            yield b'}'
+        yield b'}'
+
+def iter_export(path: str, fields: list = None, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields the content of a Freqtrade export as bytes chunks, so it can be
+    uploaded without being loaded in memory.
+    :param str path: Path of the export file
+    :param list fields: Keys of each strategy result to keep. All by default.
+    :param int chunk_size: Approximate size of the chunks, in bytes
+    """
+    if fields:
+        yield from _iter_projected(path, fields, chunk_size)
+        return
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
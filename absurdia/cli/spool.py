@@ -0,0 +1,75 @@
+import absurdia
+import click
+
+from click import echo, secho
+from absurdia.cli.common import check_login
+
+
+def _open(path):
+    from absurdia.spool import Spool
+    return Spool(path=path)
+
+
+@click.group()
+def spool():
+    """
+    Inspect and send the uploads waiting in the local spool.
+    """
+    return
+
+
+@spool.command()
+@click.option('--path', type=click.Path(dir_okay=False),
+              help="Path of the spool file. Defaults to ~/.absurdia/spool.db.")
+def status(path):
+    """
+    Show the number of uploads waiting to be sent.
+    Example: absurdia spool status
+    """
+    queue = _open(path)
+    try:
+        info = queue.status()
+    finally:
+        queue.close()
+    echo("Spool: %s" % (info["path"],))
+    echo("Pending: %d entries, %.1f kB" % (info["pending"], info["bytes"] / 1000))
+    for kind, counts in sorted(info["by_kind"].items()):
+        echo("  %s: %d pending, %d failed" % (kind, counts["pending"], counts["failed"]))
+    if info["oldest_age_s"] is not None:
+        echo("Oldest pending entry: %.0fs ago" % (info["oldest_age_s"],))
+    if info["failed"]:
+        secho("Failed: %d entries rejected by the API." % (info["failed"],), fg='red')
+    if info["last_error"]:
+        echo("Last error: %s" % (info["last_error"],))
+
+
+@spool.command()
+@click.option('--path', type=click.Path(dir_okay=False),
+              help="Path of the spool file. Defaults to ~/.absurdia/spool.db.")
+@click.option('--retry-failed', is_flag=True,
+              help="Also send again the entries previously rejected by the API.")
+@click.option('--timeout', type=float, help="Stop after this many seconds.")
+def flush(path, retry_failed, timeout):
+    """
+    Send the uploads waiting in the spool, in order.
+    Example: absurdia spool flush
+    """
+    check_login()
+    if absurdia.token is None:
+        return
+    queue = _open(path)
+    queue.client = absurdia.Client(agent=absurdia.token)
+    if retry_failed:
+        echo("%d failed entries queued again." % (queue.retry_failed(),))
+    before = queue.status()
+    try:
+        queue.flush(timeout=timeout)
+    except Exception as e:
+        secho("Failed to flush the spool. %s" % (e,), fg="red", err=True)
+    finally:
+        info = queue.status()
+        queue.close()
+    rejected = info["failed"] - before["failed"]
+    secho("Sent %d entries." % (before["pending"] - info["pending"] - rejected,), fg='green')
+    if info["pending"] or info["failed"]:
+        echo("%d entries pending, %d failed." % (info["pending"], info["failed"]))
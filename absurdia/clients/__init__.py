@@ -1,67 +1,120 @@
 import platform
 import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import absurdia
+from absurdia.clients.batch import Batch
+from absurdia.clients.cache import ResponseCache
+from absurdia.clients.capture import RequestCapture
+from absurdia.clients.rate_limiter import RateLimiter
 from absurdia.clients.http_client import HttpClient
+from absurdia.compression import DEFAULT_THRESHOLD
+from absurdia.signing import SIGNATURE_HEADER, Signer, canonical
 from absurdia.util import load_agent
 from absurdia.api_error import AuthenticationError
 from absurdia.version import VERSION
-from absurdia.agent_credentials import token
+
+
+def _resolve_agent(agent: str = None) -> str:
+    if agent is None:
+        load_agent()
+        if absurdia.token is None:
+            raise AuthenticationError(
+                "No agent token provided. You can generate agent keys "
+                "from the Absurdia web interface. "
+                "See https://app.absurdia.markets/agents"
+            )
+        agent = absurdia.token
+    if len(agent) != 64:
+        raise AuthenticationError(
+            "Bad agent token provided. You can generate agent keys "
+            "from the Absurdia web interface. "
+            "See https://app.absurdia.markets/agents"
+        )
+    return agent
+
+def _base_headers(agent: str) -> dict:
+    ua = {
+        "bindings_version": VERSION,
+        "lang": "python",
+        "publisher": "absurdia"
+    }
+    for attr, func in [
+        ["lang_version", platform.python_version],
+        ["platform", platform.platform],
+        ["uname", lambda: " ".join(platform.uname())],
+    ]:
+        try:
+            val = func()
+        except Exception:
+            val = "(disabled)"
+        ua[attr] = val
+
+    return {
+        "Abs-Client-Agent": json.dumps(ua),
+        "User-Agent": "Absurdia/v1 PythonBindings/%s" % (VERSION,),
+        "Authorization": "Bearer %s" % (agent,),
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip"
+    }
+
+def _add_idempotency_key(method: str, headers: dict):
+    # Lets the API deduplicate a POST or PATCH that is retried after a
+    # failure. The key is kept for every retry of the same call.
+    if method.upper() in ("POST", "PATCH") \
+    and not any(key.lower() == "idempotency-key" for key in headers):
+        headers["Idempotency-Key"] = str(uuid.uuid4())
 
 class Client():
-    """ A client for accessing the Absurdia API. """
+    """
+    A client for accessing the Absurdia API. Safe to share between threads,
+    which then reuse the connections of its pool.
+    """
     
     def __init__(self, 
                  agent: str = None, 
                  test: bool = False, 
                  enable_telemetry: bool = True, 
-                 log_level='WARNING'):
-
-        if agent is None:
-            load_agent()
-            if token is None:
-                raise AuthenticationError(
-                    "No agent token provided. You can generate agent keys "
-                    "from the Absurdia web interface. "
-                    "See https://app.absurdia.markets/agents"
-                )
-            agent = token
-        if len(agent) != 64:
-            raise AuthenticationError(
-                "Bad agent token provided. You can generate agent keys "
-                "from the Absurdia web interface. "
-                "See https://app.absurdia.markets/agents"
-            )
-        self.agent = agent
-        
-        ua = {
-            "bindings_version": VERSION,
-            "lang": "python",
-            "publisher": "absurdia"
-        }
-        for attr, func in [
-            ["lang_version", platform.python_version],
-            ["platform", platform.platform],
-            ["uname", lambda: " ".join(platform.uname())],
-        ]:
-            try:
-                val = func()
-            except Exception:
-                val = "(disabled)"
-            ua[attr] = val
-
-        self.base_headers = {
-            "Abs-Client-Agent": json.dumps(ua),
-            "User-Agent": "Absurdia/v1 PythonBindings/%s" % (VERSION,),
-            "Authorization": "Bearer %s" % (self.agent,),
-            "Content-Type": "application/json",
-            "Accept-Encoding": "gzip"
-        }
-        
+                 log_level='WARNING',
+                 compression: str = "gzip",
+                 compression_threshold: int = DEFAULT_THRESHOLD,
+                 max_network_retries: int = None,
+                 retry_policy=None,
+                 cache=None,
+                 rate_limiter=None,
+                 capture=None,
+                 max_connections: int = 10,
+                 signature_key: str = None,
+                 transport=None,
+                 api_base: str = None,
+                 spool=None):
+
+        self.agent = _resolve_agent(agent)
+        self._signature_key = signature_key
+        self._signer = None
+        self.base_headers = MappingProxyType(_base_headers(self.agent))
+
         self._test = test
+        self.api_base = api_base
         self.enable_telemetry = enable_telemetry
+        self.cache = ResponseCache() if cache is True else (cache if cache is not False else None)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+        self.http_client = HttpClient(
+            log_level=log_level,
+            max_retries=max_network_retries,
+            retry_policy=retry_policy,
+            rate_limiter=RateLimiter() if rate_limiter is True else rate_limiter,
+            capture=RequestCapture() if capture is True else capture,
+            max_connections=max_connections,
+            transport=transport
+        )
+        self._local = threading.local()
+        self.spool = self._spool(spool)
 
-        self.http_client = HttpClient(log_level=log_level)
-        self.__last_response = None
-        
         # ResourceRequestors
         self._accounts = None
         self._users = None
@@ -69,22 +122,60 @@ class Client():
         self._strategies = None
         self._backtests = None
                 
+    def _spool(self, spool):
+        if spool is None or spool is False:
+            return None
+        from absurdia.spool import Spool
+        if spool is True:
+            spool = Spool()
+        if spool.client is None:
+            spool.client = self
+        return spool.start()
+
     @property
-    def headers(self):
-        if self.enable_telemetry and self.__last_response:
-            if "x-request-id" in self.__last_response.headers:
-                request_id = self.__last_response.headers["x-request-id"]
+    def signer(self) -> Signer:
+        """
+        Signer of the requests of this client, holding the parsed key of the
+        agent. Defaults to the key in `absurdia.agent_signature_key`.
+        """
+        if self._signer is None:
+            key = self._signature_key or absurdia.agent_signature_key
+            if not key:
+                raise RuntimeError(
+                    "No signature key provided. "
+                    "A signature key is required for endpoints that require signatures."
+                )
+            self._signer = Signer(key)
+        return self._signer
+
+    @property
+    def last_response(self):
+        """ The last response received by the calling thread. """
+        return getattr(self._local, "last_response", None)
+
+    @property
+    def headers(self) -> dict:
+        """ Headers of the next request of the calling thread. """
+        headers = dict(self.base_headers)
+        last_response = self.last_response
+        if self.enable_telemetry and last_response:
+            if "x-request-id" in last_response.headers:
+                request_id = last_response.headers["x-request-id"]
                 telemetry = {
                     "request_metrics": {
                         "request_id": request_id,
                         "duration_ms": self.http_client.last_request_duration_ms or 0
                     }
                 }
-                self.base_headers["Abs-Client-Telemetry"] = json.dumps(telemetry)
-        return self.base_headers
+                headers["Abs-Client-Telemetry"] = json.dumps(telemetry)
+        return headers
     
     @property
     def hostname(self):
+        """ Base URL of the API: `api_base` if given, e.g. a `LocalServer`. """
+        api_base = self.api_base or absurdia.api_base
+        if api_base:
+            return api_base.rstrip("/")
         if self._test:
             return "https://test.api.absurdia.markets"
         return "https://api.absurdia.markets"
@@ -95,7 +186,10 @@ class Client():
                 params: dict = {}, 
                 data: dict = {}, 
                 additional_headers: dict = {},
-                timeout: int = 5000
+                timeout: int = 5000,
+                compress: bool = False,
+                body=None,
+                signed: bool = False
     ):
         """
         Makes a request to the Absurdia API using the configured http client
@@ -106,6 +200,12 @@ class Client():
         :param dict[str, str] data: Request body data
         :param dict[str, str] additional_headers: HTTP Headers
         :param int timeout: Timeout in milliseconds
+        :param bool compress: Compress the body with the encoding of the client
+                              when it is larger than its threshold
+        :param body: Already encoded JSON body, as bytes or an iterable of
+                     bytes chunks, sent instead of `data`
+        :param bool signed: Sign the body with the key of the agent. The body
+                            is encoded once and the signed bytes are sent.
         :returns: Response from the API
         :rtype: absurdia.api_response.APIResponse
         """
@@ -114,8 +214,22 @@ class Client():
         if not bool(data):
             data = None
         
-        headers = self.headers.copy()
+        headers = self.headers
         headers.update(additional_headers)
+        _add_idempotency_key(method, headers)
+
+        if signed:
+            if body is None:
+                body, data = canonical(data), None
+            elif not isinstance(body, bytes):
+                raise ValueError("The body of a signed request must be bytes.")
+            headers[SIGNATURE_HEADER] = self.signer.sign(body)
+
+        if self.cache is not None:
+            cached = self.cache.lookup(method, path, params, headers)
+            if cached is not None:
+                self._local.last_response = cached
+                return cached
         
         response = self.http_client.request(
             method,
@@ -123,11 +237,67 @@ class Client():
             params=params,
             data=data,
             headers=headers,
-            timeout=timeout
+            timeout=timeout,
+            compress=self.compression if compress else None,
+            compress_threshold=self.compression_threshold,
+            body=body
         )
-        self.__last_response = response
+        if self.cache is not None:
+            response = self.cache.store(method, path, params, response)
+        self._local.last_response = response
         return response
-        
+
+    def executor(self, max_workers: int = None) -> ThreadPoolExecutor:
+        """
+        Returns a thread pool to run calls of this client in parallel, to use
+        as a context manager. Defaults to one thread per pooled connection.
+        """
+        return ThreadPoolExecutor(
+            max_workers=max_workers or self.http_client.max_connections,
+            thread_name_prefix="absurdia"
+        )
+
+    def batch(self, max_concurrency: int = None):
+        """
+        Returns a `Batch` collecting calls made through it, e.g.
+        `batch.backtests.retrieve(id)`, and sending them concurrently when
+        its `with` block exits. Each call returns a future of its result.
+        :param int max_concurrency: Maximum number of calls in flight at once.
+                                    Defaults to the size of the connection pool.
+        """
+        return Batch(self, max_concurrency=max_concurrency)
+
+    def map(self, fn, items, max_workers: int = None) -> list:
+        """
+        Calls `fn` on every item in parallel and returns the results in the
+        order of `items`. The first exception raised by a call is re-raised.
+        :param fn: Function of one item, e.g. `client.backtests.retrieve`
+        :param items: Iterable of the arguments of `fn`
+        :param int max_workers: Number of threads.
+                                Defaults to the size of the connection pool.
+        """
+        with self.executor(max_workers) as executor:
+            return list(executor.map(fn, items))
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the statistics of the client: latency
+        percentiles of each phase of the requests, by method and endpoint,
+        and the counters of the cache and rate limiter when enabled.
+        """
+        http_client = self.http_client
+        return {
+            "endpoints": http_client.instrumentation.stats(),
+            "cache": {
+                "entries": len(self.cache),
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "revalidations": self.cache.revalidations,
+            } if self.cache is not None else None,
+            "rate_limiter": http_client.rate_limiter.stats()
+                            if http_client.rate_limiter is not None else None,
+        }
+
     def __repr__(self):
         """
         Provide a friendly representation
@@ -0,0 +1,199 @@
+from types import MappingProxyType
+
+import absurdia
+
+from absurdia.clients import _add_idempotency_key, _base_headers, _resolve_agent
+from absurdia.clients.async_http_client import AsyncHttpClient
+from absurdia.clients.cache import ResponseCache
+from absurdia.clients.capture import RequestCapture
+from absurdia.clients.rate_limiter import RateLimiter
+from absurdia.compression import DEFAULT_THRESHOLD
+
+
+class AsyncClient():
+    """ An asyncio client for accessing the Absurdia API. """
+
+    def __init__(self,
+                 agent: str = None,
+                 test: bool = False,
+                 max_connections: int = 100,
+                 max_concurrency: int = 100,
+                 log_level='WARNING',
+                 compression: str = "gzip",
+                 compression_threshold: int = DEFAULT_THRESHOLD,
+                 max_network_retries: int = None,
+                 retry_policy=None,
+                 cache=None,
+                 rate_limiter=None,
+                 capture=None,
+                 http2: bool = False,
+                 api_base: str = None):
+
+        self.agent = _resolve_agent(agent)
+        self.base_headers = MappingProxyType(_base_headers(self.agent))
+
+        self._test = test
+        self.api_base = api_base
+        self.cache = ResponseCache() if cache is True else (cache if cache is not False else None)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+        self.http_client = AsyncHttpClient(
+            max_connections=max_connections,
+            max_concurrency=max_concurrency,
+            log_level=log_level,
+            max_retries=max_network_retries,
+            retry_policy=retry_policy,
+            rate_limiter=RateLimiter() if rate_limiter is True else rate_limiter,
+            capture=RequestCapture() if capture is True else capture,
+            http2=http2
+        )
+
+        # ResourceRequestors
+        self._accounts = None
+        self._users = None
+        self._agents = None
+        self._strategies = None
+        self._backtests = None
+
+    @property
+    def headers(self):
+        return self.base_headers
+
+    @property
+    def hostname(self):
+        """ Base URL of the API: `api_base` if given, e.g. a `LocalServer`. """
+        api_base = self.api_base or absurdia.api_base
+        if api_base:
+            return api_base.rstrip("/")
+        if self._test:
+            return "https://test.api.absurdia.markets"
+        return "https://api.absurdia.markets"
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      params: dict = {},
+                      data: dict = {},
+                      additional_headers: dict = {},
+                      timeout: int = 5000,
+                      compress: bool = False,
+                      body=None
+    ):
+        """
+        Makes a request to the Absurdia API using the configured http client
+        Authentication information is automatically added.
+        :param str method: HTTP Method
+        :param str uri: Fully qualified url
+        :param dict[str, str] params: Query string parameters
+        :param dict[str, str] data: Request body data
+        :param dict[str, str] additional_headers: HTTP Headers
+        :param int timeout: Timeout in milliseconds
+        :param bool compress: Compress the body with the encoding of the client
+                              when it is larger than its threshold
+        :param body: Already encoded JSON body, as bytes, an iterable of
+                     bytes chunks or a function returning such an iterable,
+                     sent instead of `data`
+        :returns: Response from the API
+        :rtype: absurdia.api_response.APIResponse
+        """
+        if not bool(params):
+            params = None
+        if not bool(data):
+            data = None
+
+        headers = self.headers.copy()
+        headers.update(additional_headers)
+        _add_idempotency_key(method, headers)
+
+        if self.cache is not None:
+            cached = self.cache.lookup(method, path, params, headers)
+            if cached is not None:
+                return cached
+
+        response = await self.http_client.request(
+            method,
+            "%s%s" % (self.hostname, path),
+            params=params,
+            data=data,
+            headers=headers,
+            timeout=timeout,
+            compress=self.compression if compress else None,
+            compress_threshold=self.compression_threshold,
+            body=body
+        )
+        if self.cache is not None:
+            response = self.cache.store(method, path, params, response)
+        return response
+
+    async def close(self):
+        """ Closes the pooled connections of the client. """
+        await self.http_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def __repr__(self):
+        """
+        Provide a friendly representation
+        :returns: Machine friendly representation
+        :rtype: str
+        """
+        return '<Absurdia AsyncClient - Agent {}>'.format(self.agent)
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the statistics of the client: latency
+        percentiles of each phase of the requests, by method and endpoint,
+        and the counters of the cache and rate limiter when enabled.
+        """
+        http_client = self.http_client
+        return {
+            "endpoints": http_client.instrumentation.stats(),
+            "cache": {
+                "entries": len(self.cache),
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "revalidations": self.cache.revalidations,
+            } if self.cache is not None else None,
+            "rate_limiter": http_client.rate_limiter.stats()
+                            if http_client.rate_limiter is not None else None,
+        }
+
+    @property
+    def accounts(self):
+        if self._accounts is None:
+            from absurdia.resources.accounts import AsyncAccountsRequestor
+            self._accounts = AsyncAccountsRequestor(self)
+        return self._accounts
+
+    @property
+    def users(self):
+        if self._users is None:
+            from absurdia.resources.users import AsyncUsersRequestor
+            self._users = AsyncUsersRequestor(self)
+        return self._users
+
+    @property
+    def agents(self):
+        if self._agents is None:
+            from absurdia.resources.agents import AsyncAgentsRequestor
+            self._agents = AsyncAgentsRequestor(self)
+        return self._agents
+
+    @property
+    def strategies(self):
+        if self._strategies is None:
+            from absurdia.resources.strategies import AsyncStrategiesRequestor
+            self._strategies = AsyncStrategiesRequestor(self)
+        return self._strategies
+
+    @property
+    def backtests(self):
+        if self._backtests is None:
+            from absurdia.resources.backtests import AsyncBacktestsRequestor
+            self._backtests = AsyncBacktestsRequestor(self)
+        return self._backtests
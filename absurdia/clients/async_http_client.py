@@ -0,0 +1,218 @@
+import asyncio
+import functools
+import logging
+import time
+
+from absurdia import compression
+from absurdia.api_response import APIResponse
+from absurdia.clients.instrumentation import Instrumentation
+from absurdia.clients.retry import RetryPolicy
+
+try:
+    httpx = __import__("httpx")
+except ImportError:
+    httpx = None
+
+_logger = logging.getLogger('absurdia.http_client')
+
+
+class AsyncHttpClient():
+    """
+    Asyncio HTTP Client for interacting with the Absurdia API
+    """
+
+    def __init__(self,
+                 max_connections=100,
+                 max_concurrency=100,
+                 timeout=None,
+                 logger=_logger,
+                 log_level='WARNING',
+                 proxy=None,
+                 max_retries=None,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 instrumentation=None,
+                 capture=None,
+                 http2=False):
+        """
+        Constructor for the AsyncHttpClient
+        :param int max_connections: Size of the connection pool
+        :param int max_concurrency: Maximum number of requests in flight at once
+        :param int timeout: Timeout for the requests, in milliseconds.
+                            Timeout should never be zero (0) or less.
+        :param logger
+        :param str proxy: Http proxy URL for the requests
+        :param int max_retries: Maximum number of retries each request should attempt.
+                                Defaults to `absurdia.max_network_retries`.
+        :param RetryPolicy retry_policy: When and how to retry failed requests.
+                                         Takes precedence over `max_retries`.
+        :param RateLimiter rate_limiter: Paces the requests, retries included
+        :param Instrumentation instrumentation: Collects the timings of the requests.
+                                                Only the total and decode phases
+                                                are measured.
+        :param RequestCapture capture: Keeps a sample of the last requests and
+                                       responses for debugging
+        :param bool http2: Negotiate HTTP/2, multiplexing the requests over a
+                           single connection. Requires `pip install absurdia[http2]`.
+        """
+        if httpx is None:
+            raise ImportError(
+                "`httpx` is required to use the asyncio client. "
+                "Install with `pip install absurdia[async]`"
+            )
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout should never be zero (0) or less.")
+        if max_concurrency <= 0:
+            raise ValueError("Concurrency limit should be at least one (1).")
+
+        self.logger = logger
+        self.logger.setLevel(log_level)
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation or Instrumentation()
+        self.capture = capture
+        self.session = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            proxy=proxy,
+            # Concurrency is bounded by our own semaphore, so the pool
+            # should never be the reason a request times out.
+            timeout=httpx.Timeout(None)
+        )
+        # Created lazily so that it binds to the running event loop.
+        self._semaphore = None
+
+        self.last_response = None
+        self.last_request_duration_ms = 0
+
+    @property
+    def semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def request(self, method, url, params=None, data=None, headers=None,
+                      timeout=None, allow_redirects=False, compress=None,
+                      compress_threshold=compression.DEFAULT_THRESHOLD, body=None):
+        """
+        Make an HTTP Request with parameters provided.
+        :param str method: The HTTP method to use
+        :param str url: The URL to request
+        :param dict params: Query parameters to append to the URL
+        :param dict data: Dict to go as JSON in the body of the HTTP request
+        :param dict headers: HTTP Headers to send with the request
+        :param int timeout: Timeout for the request, in milliseconds
+        :param boolean allow_redirects: Whether or not to allow redirects
+        :param str compress: Encoding of the body: "gzip", "br" or "zstd"
+        :param int compress_threshold: Minimum size of a body to compress, in bytes
+        :param body: Already encoded JSON body, as bytes, an iterable of bytes
+                     chunks or a function returning such an iterable. Takes the
+                     place of `data`. It is read into memory once, so that
+                     retries send it again.
+        :return: An http response
+        :rtype: A :class:`APIResponse <absurdia.api_response.APIResponse>` object
+        """
+        if timeout is not None and timeout <= 0:
+            raise ValueError(timeout)
+        timeout = timeout if timeout is not None else self.timeout
+
+        self.logger.info('%s Request: %s', method.upper(), url)
+
+        headers = dict(headers or {})
+        if body is not None:
+            if callable(body):
+                body = body()
+            if isinstance(body, bytes):
+                body = (body,)
+            body, encoding = compression.encode_body(body, compress, compress_threshold)
+        elif data is not None:
+            body, encoding = compression.encode_json(data, compress, compress_threshold)
+        if body is not None:
+            if not isinstance(body, bytes):
+                body = b"".join(body)
+            headers.setdefault('Content-Type', 'application/json')
+            if encoding:
+                headers['Content-Encoding'] = encoding
+
+        policy = self.retry_policy
+        policy.on_request()
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                # Waiting for a token does not hold a slot of the semaphore.
+                await self.rate_limiter.acquire_async()
+
+            self.instrumentation.request(method.upper(), url, attempt)
+            response, api_response, error = None, None, None
+            async with self.semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self.session.request(
+                        method.upper(),
+                        url,
+                        params=params,
+                        content=body,
+                        headers=headers,
+                        follow_redirects=allow_redirects,
+                        timeout=timeout / 1000 if timeout is not None else None
+                    )
+                except httpx.TransportError as e:
+                    error = e
+                total_ms = (time.perf_counter() - start) * 1000
+            duration_ms = int(round(total_ms))
+            self.instrumentation.response(
+                method.upper(), url, attempt, {"total": total_ms},
+                response.status_code if response is not None else None, error
+            )
+
+            if self.capture is not None:
+                self.capture.record(
+                    method.upper(), url, self.capture.sampled(), attempt,
+                    params=params,
+                    request_headers=headers,
+                    request_body=body,
+                    status_code=response.status_code if response is not None else None,
+                    response_headers=response.headers if response is not None else None,
+                    response_body=response.content if response is not None else None,
+                    duration_ms=total_ms,
+                    error=error
+                )
+
+            if response is not None:
+                self.logger.info('Response Status Code: %s', response.status_code)
+                api_response = APIResponse(
+                    int(response.status_code), response.text, response.headers,
+                    on_decode=functools.partial(self.instrumentation.decode, method.upper(), url)
+                )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(api_response)
+
+            if not policy.should_retry(method, headers, attempt, api_response, error):
+                break
+
+            delay = policy.delay(attempt, api_response)
+            self.instrumentation.retry(method.upper(), url, attempt, delay)
+            self.logger.info(
+                'Retrying request in %.2fs (retry %d): %s',
+                delay, attempt + 1, error or api_response.status_code
+            )
+            # Waiting happens outside of the semaphore to let other requests through.
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        # Requests of concurrent tasks interleave, so the attributes below
+        # only tell about the last request to complete.
+        self.last_response = api_response
+        self.last_request_duration_ms = duration_ms
+        if error is not None:
+            raise error
+        return api_response
+
+    async def close(self):
+        await self.session.aclose()
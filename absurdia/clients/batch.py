@@ -0,0 +1,101 @@
+from concurrent.futures import Future
+
+
+class _BatchRequestor():
+    """ Queues the calls made to a requestor in a batch instead of sending them. """
+
+    def __init__(self, batch, requestor):
+        self._batch = batch
+        self._requestor = requestor
+
+    def __getattr__(self, name):
+        method = getattr(self._requestor, name)
+        if not callable(method):
+            return method
+
+        def queue(*args, **kwargs) -> Future:
+            return self._batch.submit(method, *args, **kwargs)
+        return queue
+
+
+class Batch():
+    """
+    Collects calls to the API and sends them concurrently when the `with`
+    block exits, so that a batch of calls takes about as long as its
+    slowest call. Calls return a `concurrent.futures.Future`, which holds
+    the result of the call, or the exception it raised, once the batch is
+    sent. A failed call does not affect the others.
+
+        with client.batch() as batch:
+            futures = [batch.backtests.retrieve(id) for id in ids]
+        backtests = [future.result() for future in futures]
+    """
+
+    def __init__(self, client, max_concurrency: int = None):
+        """
+        :param Client client: Client sending the calls
+        :param int max_concurrency: Maximum number of calls in flight at once.
+                                    Defaults to the size of the connection pool.
+        """
+        self._client = client
+        self.max_concurrency = max_concurrency
+        self._calls = []
+        self._requestors = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+        else:
+            self.cancel()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __getattr__(self, name):
+        # Requestors of the client, e.g. `batch.backtests`
+        if name.startswith("_"):
+            raise AttributeError(name)
+        requestor = self._requestors.get(name)
+        if requestor is None:
+            requestor = self._requestors[name] = _BatchRequestor(self, getattr(self._client, name))
+        return requestor
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """ Queues the call of `fn` with the given arguments. """
+        future = Future()
+        self._calls.append((future, fn, args, kwargs))
+        return future
+
+    def send(self) -> list:
+        """ Sends the queued calls. Returns their futures, in the order of the calls. """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+
+        def run(call):
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        max_workers = min(
+            self.max_concurrency or self._client.http_client.max_connections, len(calls)
+        )
+        with self._client.executor(max_workers) as executor:
+            for _ in executor.map(run, calls):
+                pass
+        return [call[0] for call in calls]
+
+    def cancel(self):
+        """ Drops the queued calls, cancelling their futures. """
+        calls, self._calls = self._calls, []
+        for future, _, _, _ in calls:
+            future.cancel()
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+from absurdia.api_response import APIResponse
+
+# Seconds a response stays fresh, by path prefix. The longest prefix wins.
+DEFAULT_TTLS = {
+    "/v1/accounts": 300.0,
+    "/v1/agents": 300.0,
+    "/v1/users": 300.0,
+    "/v1/strategies": 60.0,
+    "/v1/backtests": 5.0,
+}
+
+
+def _resource_prefix(path: str) -> str:
+    """ Returns the collection a path belongs to, e.g. "/v1/backtests". """
+    path = path.split("?", 1)[0]
+    return "/".join(path.split("/")[:3])
+
+
+class _Entry():
+    __slots__ = ("response", "etag", "expires_at", "size")
+
+    def __init__(self, response: APIResponse, etag: str, expires_at: float):
+        self.response = response
+        self.etag = etag
+        self.expires_at = expires_at
+        self.size = len(response.content or "")
+
+
+class ResponseCache():
+    """
+    In-memory LRU cache of the responses to GET requests. Fresh entries are
+    returned without a request; expired entries carrying an ETag are
+    revalidated with `If-None-Match`, and reused if the API answers
+    304 Not Modified. Writes to a resource drop the cached responses of its
+    collection. Safe to share between threads.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_bytes: int = 32 * 1024 * 1024,
+                 ttl: float = 30.0,
+                 ttls: dict = None):
+        """
+        :param int max_entries: Maximum number of responses kept
+        :param int max_bytes: Maximum total size of the bodies kept, in bytes
+        :param float ttl: Seconds a response stays fresh when no prefix of
+                          `ttls` matches its path
+        :param dict ttls: Seconds a response stays fresh, by path prefix.
+                          Defaults to `DEFAULT_TTLS`.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, path: str) -> float:
+        best = None
+        for prefix in self.ttls:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttls[best] if best is not None else self.ttl
+
+    @staticmethod
+    def key(path: str, params: dict = None):
+        """
+        Returns the key of a request, or None when its parameters cannot be
+        hashed. Lists of values, e.g. of a multi-value parameter, are keyed
+        as tuples.
+        """
+        items = []
+        for name, value in (params or {}).items():
+            if isinstance(value, list):
+                value = tuple(value)
+            items.append((name, value))
+        key = (path, tuple(sorted(items, key=lambda item: item[0])))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def lookup(self, method: str, path: str, params: dict, headers: dict):
+        """
+        Called before a request is sent. Returns a cached response to use
+        instead of sending the request, or None. In the latter case, adds
+        `If-None-Match` to `headers` when an expired entry can be revalidated.
+        """
+        if method.upper() != "GET":
+            return None
+        key = self.key(path, params)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                return self._cached(entry.response)
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            self.misses += 1
+            return None
+
+    def store(self, method: str, path: str, params: dict, response: APIResponse):
+        """
+        Called after a request is answered. Returns the response to give
+        back to the caller, which is the cached one on a 304 Not Modified.
+        """
+        method = method.upper()
+        if method != "GET":
+            if method in ("POST", "PUT", "PATCH", "DELETE"):
+                self.invalidate(path)
+            return response
+
+        key = self.key(path, params)
+        if key is None:
+            return response
+        expires_at = time.monotonic() + self.ttl_for(path)
+        with self._lock:
+            if response.status_code == 304:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return response
+                self.revalidations += 1
+                entry.expires_at = expires_at
+                self._entries.move_to_end(key)
+                return self._cached(entry.response)
+            if not response.ok:
+                return response
+
+            entry = _Entry(response, response.headers.get("etag"), expires_at)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return response
+
+    def invalidate(self, path: str):
+        """ Drops every cached response of the collection `path` belongs to. """
+        prefix = _resource_prefix(path)
+        with self._lock:
+            for key in [k for k in self._entries if _resource_prefix(k[0]) == prefix]:
+                self._bytes -= self._entries.pop(key).size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @staticmethod
+    def _cached(response: APIResponse) -> APIResponse:
+        cached = APIResponse(response.status_code, response.content, response.headers)
+        cached.cached = True
+        return cached
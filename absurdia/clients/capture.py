@@ -0,0 +1,129 @@
+import random
+import reprlib
+import threading
+import time
+from collections import deque
+
+# Bounded representation of request data: nested values past these sizes
+# are elided, so capturing a large upload costs about as much as a small one.
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxdict = 10
+_repr.maxlist = 10
+_repr.maxstring = 80
+_repr.maxother = 80
+
+_REDACTED_HEADERS = ("authorization", "abs-signature")
+
+
+def _headers(headers) -> dict:
+    if not headers:
+        return {}
+    return {
+        key: "<redacted>" if key.lower() in _REDACTED_HEADERS else value
+        for key, value in headers.items()
+    }
+
+
+class RequestCapture():
+    """
+    Keeps summaries of the last requests and responses in a ring buffer,
+    for post-mortem debugging. Only a sample of the requests is kept, and
+    bodies are truncated. Failed requests can be kept whatever the sample.
+    Safe to share between threads.
+
+        capture = RequestCapture(size=50, sample_rate=0.1)
+        client = Client(capture=capture)
+        ...
+        print(capture.format())
+    """
+
+    def __init__(self,
+                 size: int = 100,
+                 sample_rate: float = 1.0,
+                 max_body_bytes: int = 2048,
+                 capture_errors: bool = True):
+        """
+        :param int size: Number of requests kept. Older ones are dropped.
+        :param float sample_rate: Fraction of the requests kept, from 0 to 1
+        :param int max_body_bytes: Bodies are truncated to this size
+        :param bool capture_errors: Keep every request failing with a
+                                    connection error or a 4xx/5xx response,
+                                    regardless of `sample_rate`
+        """
+        self.size = size
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+        self.capture_errors = capture_errors
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sampled(self) -> bool:
+        """ Decides whether the next request is kept. """
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _body(self, body) -> str:
+        if body is None:
+            return None
+        if isinstance(body, (bytes, bytearray)):
+            body = bytes(body[:self.max_body_bytes]).decode("utf-8", "replace")
+        elif not isinstance(body, str):
+            # Streams are not read again, other data is summarized.
+            if hasattr(body, "__next__"):
+                return "<stream>"
+            body = _repr.repr(body)
+        return body[:self.max_body_bytes]
+
+    def record(self, method: str, url: str, sampled: bool, attempt: int = 0,
+               params=None, request_headers=None, request_body=None,
+               status_code: int = None, response_headers=None, response_body=None,
+               duration_ms: float = None, error: Exception = None):
+        """ Keeps a summary of an attempt if it was sampled or if it failed. """
+        failed = error is not None or (status_code is not None and status_code >= 400)
+        if not sampled and not (failed and self.capture_errors):
+            return
+        entry = {
+            "time": time.time(),
+            "method": method,
+            "url": url,
+            "params": params,
+            "attempt": attempt,
+            "request_headers": _headers(request_headers),
+            "request_body": self._body(request_body),
+            "status_code": status_code,
+            "response_headers": _headers(response_headers),
+            "response_body": self._body(response_body),
+            "duration_ms": duration_ms,
+            "error": repr(error) if error is not None else None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self) -> list:
+        """ Returns the requests kept, oldest first. """
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def format(self) -> str:
+        """ Returns the requests kept as text, oldest first. """
+        lines = []
+        for entry in self.entries():
+            lines.append("%s %s %s -> %s in %s ms%s" % (
+                time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(entry["time"])),
+                entry["method"], entry["url"],
+                entry["status_code"] if entry["error"] is None else entry["error"],
+                "%.1f" % entry["duration_ms"] if entry["duration_ms"] is not None else "?",
+                " (retry %d)" % entry["attempt"] if entry["attempt"] else ""
+            ))
+            if entry["request_body"]:
+                lines.append("  > %s" % (entry["request_body"],))
+            if entry["response_body"]:
+                lines.append("  < %s" % (entry["response_body"],))
+        return "\n".join(lines)
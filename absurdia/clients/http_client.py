@@ -1,17 +1,25 @@
+import functools
 import logging
-from requests import Request, Session, hooks
-from requests.adapters import HTTPAdapter
+import threading
+import time
 from urllib.parse import urlencode
 
+from absurdia import compression
 from absurdia.api_response import APIResponse
-from absurdia.util import now_ms
+from absurdia.clients import instrumentation as timing
+from absurdia.clients.retry import RetryPolicy
+from absurdia.clients.transports import get_transport
 
 _logger = logging.getLogger('absurdia.http_client')
 
 
 class HttpClient():
     """
-    General purpose HTTP Client for interacting with the Absurdia API
+    General purpose HTTP Client for interacting with the Absurdia API.
+    Retries, rate limiting, instrumentation and logging happen here, and
+    requests are sent by a transport: `requests` by default.
+    Safe to share between threads: the last request, response and duration
+    are kept per thread.
     """
 
     def __init__(self, 
@@ -21,7 +29,13 @@ class HttpClient():
                  logger=_logger, 
                  log_level='WARNING', 
                  proxy=None,
-                 max_retries=None):
+                 max_retries=None,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 max_connections=10,
+                 instrumentation=None,
+                 capture=None,
+                 transport=None):
         """
         Constructor for the HttpClient
         :param bool pool_connections
@@ -30,26 +44,70 @@ class HttpClient():
                             Timeout should never be zero (0) or less.
         :param logger
         :param dict proxy: Http proxy for the requests session
-        :param int max_retries: Maximum number of retries each request should attempt
+        :param int max_retries: Maximum number of retries each request should attempt.
+                                Defaults to `absurdia.max_network_retries`.
+        :param RetryPolicy retry_policy: When and how to retry failed requests.
+                                         Takes precedence over `max_retries`.
+        :param RateLimiter rate_limiter: Paces the requests, retries included
+        :param int max_connections: Connections kept open per host. Threads
+                                    beyond this number open short-lived ones.
+        :param Instrumentation instrumentation: Collects the timings of the requests
+        :param RequestCapture capture: Keeps a sample of the last requests and
+                                       responses for debugging
+        :param transport: `Transport` sending the requests, or the name of one:
+                          "requests", "urllib3", "httpx" or "http2". Defaults
+                          to `absurdia.default_http_client`, then "requests".
         """
-        self.session = Session() if pool_connections else None
-        if self.session and max_retries is not None:
-            self.session.mount('https://', HTTPAdapter(max_retries=max_retries))
-        self.last_request = None
-        self.last_response = None
+        self._local = threading.local()
+        self.max_connections = max_connections
+        self.proxy = proxy if proxy else {}
+        options = {"max_connections": max_connections, "proxy": self.proxy}
+        if transport in (None, "requests"):
+            options.update(pool_connections=pool_connections, request_hooks=request_hooks)
+        self.transport = get_transport(transport, **options)
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.rate_limiter = rate_limiter
+        self.instrumentation = instrumentation or timing.Instrumentation()
+        self.capture = capture
         self.logger = logger
         self.logger.setLevel(log_level)
-        self.request_hooks = request_hooks or hooks.default_hooks()
 
         if timeout is not None and timeout <= 0:
             raise ValueError("Timeout should never be zero (0) or less.")
         self.timeout = timeout
-        self.proxy = proxy if proxy else {}
-        
-        self.last_request_duration_ms = 0
+
+    @property
+    def session(self):
+        """ Session of the `requests` transport, if it is the one in use. """
+        return getattr(self.transport, "session", None)
+
+    @property
+    def last_request(self):
+        return getattr(self._local, "last_request", None)
+
+    @last_request.setter
+    def last_request(self, request):
+        self._local.last_request = request
+
+    @property
+    def last_response(self):
+        return getattr(self._local, "last_response", None)
+
+    @last_response.setter
+    def last_response(self, response):
+        self._local.last_response = response
+
+    @property
+    def last_request_duration_ms(self):
+        return getattr(self._local, "last_request_duration_ms", 0)
+
+    @last_request_duration_ms.setter
+    def last_request_duration_ms(self, duration):
+        self._local.last_request_duration_ms = duration
 
     def request(self, method, url, params=None, data=None, headers=None, timeout=None,
-                allow_redirects=False):
+                allow_redirects=False, compress=None,
+                compress_threshold=compression.DEFAULT_THRESHOLD, body=None):
         """
         Make an HTTP Request with parameters provided.
         :param str method: The HTTP method to use
@@ -58,8 +116,15 @@ class HttpClient():
         :param dict data: Dict to go as JSON in the body of the HTTP request
         :param dict headers: HTTP Headers to send with the request
         :param tuple auth: Basic Auth arguments
-        :param float timeout: Socket/Read timeout for the request
+        :param int timeout: Socket/Read timeout for the request, in milliseconds
         :param boolean allow_redirects: Whether or not to allow redirects
+        :param str compress: Encoding of the body: "gzip", "br" or "zstd".
+                             The body is compressed while it is sent.
+        :param int compress_threshold: Minimum size of a body to compress, in bytes
+        :param body: Already encoded JSON body, as bytes, an iterable of bytes
+                     chunks or a function returning such an iterable. Takes the
+                     place of `data`. Iterables are only sent once, functions
+                     are called again for each retry.
         See the requests documentation for explanation of all these parameters
         :return: An http response
         :rtype: A :class:`APIResponse <absurdia.api_response.APIResponse>` object
@@ -71,58 +136,155 @@ class HttpClient():
             'method': method.upper(),
             'url': url,
             'params': params,
-            'json': data,
-            'headers': headers,
-            'hooks': self.request_hooks
+            'headers': dict(headers or {}),
         }
 
-        self._log_request(kwargs)
+        self._log_request(kwargs, data)
+
+        if data is not None or body is not None:
+            kwargs['headers'].setdefault('Content-Type', 'application/json')
+        # One-shot iterators cannot be sent twice.
+        replayable = body is None or isinstance(body, bytes) or callable(body)
 
-        self.last_response = None
-        session = self.session or Session()
-        request = Request(**kwargs)
-        self.last_request = request
+        transport = self.transport
+        instrumentation = self.instrumentation
+        timeout = timeout if timeout is not None else self.timeout
+        policy = self.retry_policy
+        policy.on_request()
 
-        prepped_request = session.prepare_request(request)
+        attempt = 0
+        while True:
+            self.last_response = None
+            self._prepare_body(kwargs, data, body, compress, compress_threshold)
+            self.last_request = kwargs
 
-        settings = session.merge_environment_settings(
-            prepped_request.url, self.proxy, None, None, None)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
 
-        settings['allow_redirects'] = allow_redirects
-        settings['timeout'] = timeout if timeout is not None else self.timeout
+            instrumentation.request(kwargs['method'], url, attempt)
+            timing.reset_phases()
+            response, error = None, None
+            start = time.perf_counter()
+            try:
+                response = transport.send(
+                    kwargs['method'], url, params, kwargs['headers'], kwargs.get('data'),
+                    timeout / 1000 if timeout is not None else None, allow_redirects
+                )
+            except transport.errors as e:
+                response, error = None, e
+            end = time.perf_counter()
+            self.last_request_duration_ms = int(round((end - start) * 1000))
 
-        request_start_time = now_ms()
-        response = session.send(prepped_request, **settings)
-        self.last_request_duration_ms = request_start_time - now_ms()
-        
-        self._log_response(response)
+            timings = timing.current_phases()
+            if response is not None:
+                connection_ms = sum(timings.get(phase, 0.0) for phase in ("acquire", "connect", "tls"))
+                timings["ttfb"] = (response.headers_received - start) * 1000 - connection_ms
+                timings["download"] = (end - response.headers_received) * 1000
+            timings["total"] = (end - start) * 1000
+            instrumentation.response(
+                kwargs['method'], url, attempt, timings,
+                response.status_code if response is not None else None, error
+            )
+
+            if self.capture is not None:
+                self._capture(kwargs, data, attempt, response, error, timings["total"])
+
+            if response is not None:
+                self._log_response(response)
+                self.last_response = APIResponse(
+                    int(response.status_code), response.text, response.headers,
+                    on_decode=functools.partial(instrumentation.decode, kwargs['method'], url)
+                )
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(self.last_response)
 
-        self.last_response = APIResponse(
-            int(response.status_code), response.text, response.headers)
+            if not replayable or not policy.should_retry(
+                kwargs['method'], kwargs['headers'], attempt, self.last_response, error
+            ):
+                break
+
+            delay = policy.delay(attempt, self.last_response)
+            instrumentation.retry(kwargs['method'], url, attempt, delay)
+            self.logger.info(
+                'Retrying request in %.2fs (retry %d): %s',
+                delay, attempt + 1, error or self.last_response.status_code
+            )
+            time.sleep(delay)
+            attempt += 1
 
+        if error is not None:
+            raise error
         return self.last_response
 
-    def _log_request(self, kwargs):
-        self.logger.info('-- BEGIN Absurdia API Request --')
+    def _prepare_body(self, kwargs, data, body, compress, compress_threshold):
+        """ Encodes the body of an attempt, starting from the original data each time. """
+        kwargs['headers'].pop('Content-Encoding', None)
+        if data is None and body is None:
+            return
+        if body is None:
+            chunks, encoding = compression.encode_json(data, compress, compress_threshold)
+        else:
+            if callable(body):
+                body = body()
+            if isinstance(body, bytes):
+                if not compress:
+                    # Sent as is, without a copy
+                    kwargs['data'] = body
+                    return
+                body = (body,)
+            chunks, encoding = compression.encode_body(body, compress, compress_threshold)
+        kwargs['data'] = chunks
+        if encoding:
+            kwargs['headers']['Content-Encoding'] = encoding
+
+    def close(self):
+        self.transport.close()
+
+    def _capture(self, kwargs, data, attempt, response, error, duration_ms):
+        capture = self.capture
+        sampled = capture.sampled()
+        sent = kwargs.get('data')
+        capture.record(
+            kwargs['method'], kwargs['url'], sampled, attempt,
+            params=kwargs['params'],
+            request_headers=kwargs['headers'],
+            request_body=sent if data is None or isinstance(sent, bytes) else data,
+            status_code=response.status_code if response is not None else None,
+            response_headers=response.headers if response is not None else None,
+            response_body=response.content if response is not None else None,
+            duration_ms=duration_ms,
+            error=error
+        )
+
+    def _log_request(self, kwargs, data):
+        # Messages are only formatted when they are emitted, and nothing is
+        # prepared at all below the INFO level.
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info('-- BEGIN Absurdia API Request --')
 
         if kwargs['params']:
-            self.logger.info('{} Request: {}?{}'.format(
-                kwargs['method'], kwargs['url'], urlencode(kwargs['params']))
-            )
-            self.logger.info('Query Params: {}'.format(kwargs['params']))
+            logger.info('%s Request: %s?%s',
+                        kwargs['method'], kwargs['url'], urlencode(kwargs['params']))
+            logger.info('Query Params: %s', kwargs['params'])
         else:
-            self.logger.info('{} Request: {}'.format(kwargs['method'], kwargs['url']))
+            logger.info('%s Request: %s', kwargs['method'], kwargs['url'])
 
         if kwargs['headers']:
-            self.logger.info('Headers:')
+            logger.info('Headers:')
             for key, value in kwargs['headers'].items():
                 # Do not log authorization headers
                 if 'authorization' not in key.lower():
-                    self.logger.info('{} : {}'.format(key, value))
-        self.logger.debug("Request Body: {}".format(kwargs['json']))
-        self.logger.info('-- END Absurdia API Request --')
+                    logger.info('%s : %s', key, value)
+        logger.debug('Request Body: %s', data)
+        logger.info('-- END Absurdia API Request --')
 
     def _log_response(self, response):
-        self.logger.info('Response Status Code: {}'.format(response.status_code))
-        self.logger.info('Response Headers: {}'.format(response.headers))
-        self.logger.debug('Reponse Body: {}'.format(response.text))
\ No newline at end of file
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info('Response Status Code: %s', response.status_code)
+        logger.info('Response Headers: %s', response.headers)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Response Body: %s', response.text)
@@ -0,0 +1,265 @@
+import math
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Phases of a request, in milliseconds:
+# - acquire: waiting for a connection of the pool
+# - connect: opening a TCP connection, when none could be reused
+# - tls: TLS handshake of a new connection
+# - ttfb: from sending the request to receiving the response headers
+# - download: reading the response body
+# - decode: decoding the JSON body, measured when it is first accessed
+# - total: the whole attempt, decode excluded
+PHASES = ("acquire", "connect", "tls", "ttfb", "download", "decode", "total")
+
+# Path segments holding an identifier, replaced by "{id}" in endpoint templates.
+_ID_SEGMENT = re.compile(r".*\d|.{21,}")
+
+_local = threading.local()
+
+
+def reset_phases():
+    """ Starts collecting the phase timings of a request made by this thread. """
+    _local.phases = {}
+
+
+def current_phases() -> dict:
+    return getattr(_local, "phases", None) or {}
+
+
+def record_phase(name: str, ms: float):
+    phases = getattr(_local, "phases", None)
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + ms
+
+
+def endpoint_template(url: str) -> str:
+    """ Returns the path of `url` with its identifiers replaced, e.g. "/v1/backtests/{id}". """
+    path = urlsplit(url).path
+    return "/".join(
+        "{id}" if i > 2 and _ID_SEGMENT.match(segment) else segment
+        for i, segment in enumerate(path.split("/"))
+    )
+
+
+class Histogram():
+    """
+    Histogram of durations in logarithmic buckets, each 5% wider than the
+    previous one. Percentiles are within 5% of the exact value and memory
+    does not grow with the number of durations recorded.
+    """
+    GROWTH = 1.05
+    MIN_MS = 0.01
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, ms: float):
+        if ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = int(math.log(ms / self.MIN_MS, self.GROWTH)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+
+    def percentile(self, p: float) -> float:
+        """ Returns the duration under which `p` percent of the durations are. """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = self.MIN_MS * self.GROWTH ** index
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else None,
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class _EndpointStats():
+    __slots__ = ("phases", "statuses", "errors", "retries")
+
+    def __init__(self):
+        self.phases = {}
+        self.statuses = {}
+        self.errors = 0
+        self.retries = 0
+
+
+class Instrumentation():
+    """
+    Collects the timings of the requests of a client into histograms per
+    method and endpoint, and emits them to listeners. Events are:
+    - "request": before an attempt is sent
+    - "response": after an attempt, with its status, error and timings
+    - "retry": before sleeping to retry, with the delay in seconds
+    - "decode": after the JSON body of a response is decoded
+    Listeners are called from the thread making the request with a dict
+    describing the event. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._listeners = {}
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def on(self, event: str, callback):
+        """ Calls `callback(payload)` on every `event`. """
+        with self._lock:
+            self._listeners.setdefault(event, []).append(callback)
+
+    def off(self, event: str, callback):
+        with self._lock:
+            self._listeners.get(event, []).remove(callback)
+
+    def emit(self, event: str, payload: dict):
+        for callback in self._listeners.get(event, ()):
+            callback(payload)
+
+    def _endpoint(self, method: str, url: str) -> _EndpointStats:
+        key = "%s %s" % (method.upper(), endpoint_template(url))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    def _add(self, stats: _EndpointStats, phase: str, ms: float):
+        histogram = stats.phases.get(phase)
+        if histogram is None:
+            histogram = stats.phases[phase] = Histogram()
+        histogram.add(ms)
+
+    def request(self, method: str, url: str, attempt: int):
+        if "request" in self._listeners:
+            self.emit("request", {"method": method, "url": url, "attempt": attempt})
+
+    def response(self, method: str, url: str, attempt: int, timings: dict,
+                 status_code: int = None, error: Exception = None):
+        """ Records the timings of an attempt. """
+        with self._lock:
+            stats = self._endpoint(method, url)
+            for phase, ms in timings.items():
+                self._add(stats, phase, ms)
+            if error is not None:
+                stats.errors += 1
+            else:
+                stats.statuses[status_code] = stats.statuses.get(status_code, 0) + 1
+        if "response" in self._listeners:
+            self.emit("response", {
+                "method": method, "url": url, "attempt": attempt,
+                "status_code": status_code, "error": error, "timings": timings
+            })
+
+    def retry(self, method: str, url: str, attempt: int, delay: float):
+        with self._lock:
+            self._endpoint(method, url).retries += 1
+        if "retry" in self._listeners:
+            self.emit("retry", {"method": method, "url": url, "attempt": attempt, "delay": delay})
+
+    def decode(self, method: str, url: str, ms: float):
+        with self._lock:
+            self._add(self._endpoint(method, url), "decode", ms)
+        if "decode" in self._listeners:
+            self.emit("decode", {"method": method, "url": url, "timings": {"decode": ms}})
+
+    def stats(self) -> dict:
+        """ Returns a snapshot of the statistics, by "<METHOD> <endpoint template>". """
+        with self._lock:
+            return {
+                key: {
+                    "count": stats.phases["total"].count if "total" in stats.phases else 0,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "statuses": dict(stats.statuses),
+                    "phases": {
+                        phase: stats.phases[phase].snapshot()
+                        for phase in PHASES if phase in stats.phases
+                    },
+                }
+                for key, stats in self._endpoints.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+class _TimedConnectionMixin():
+    _tcp_ms = 0.0
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            self._tcp_ms = (time.perf_counter() - start) * 1000
+            record_phase("connect", self._tcp_ms)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        self._tcp_ms = 0.0
+        super().connect()
+        # `connect` opens the TCP connection then makes the TLS handshake.
+        record_phase("tls", (time.perf_counter() - start) * 1000 - self._tcp_ms)
+
+
+class _TimedPoolMixin():
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            record_phase("acquire", (time.perf_counter() - start) * 1000)
+
+
+class _TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+# Pool classes of a `urllib3.PoolManager` recording the connection phases.
+TIMED_POOL_CLASSES = {
+    "http": _TimedHTTPConnectionPool,
+    "https": _TimedHTTPSConnectionPool,
+}
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """ `requests` adapter recording the connection phases of its requests. """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
@@ -0,0 +1,257 @@
+import math
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from absurdia.clients.retry import parse_retry_after
+
+try:
+    fcntl = __import__("fcntl")
+except ImportError:
+    fcntl = None
+
+# Header names, in order of preference, of the IETF draft and of the
+# `X-RateLimit-*` convention.
+LIMIT_HEADERS = ("ratelimit-limit", "x-ratelimit-limit")
+REMAINING_HEADERS = ("ratelimit-remaining", "x-ratelimit-remaining")
+RESET_HEADERS = ("ratelimit-reset", "x-ratelimit-reset")
+POLICY_HEADERS = ("ratelimit-policy", "x-ratelimit-policy")
+
+# Resets larger than this are timestamps rather than a number of seconds.
+_EPOCH_THRESHOLD = 1e9
+
+
+def _header(headers, names):
+    """ Returns the leading number of the first header of `names` found, or None. """
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            # The IETF draft allows lists such as "100, 100;w=60".
+            return float(str(value).split(",")[0].split(";")[0].strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _window(headers):
+    """ Returns the window of a `RateLimit-Policy` header such as "100;w=60", or None. """
+    for name in POLICY_HEADERS:
+        value = headers.get(name)
+        if value is None:
+            continue
+        for param in str(value).split(",")[0].split(";")[1:]:
+            key, _, number = param.strip().partition("=")
+            if key == "w":
+                try:
+                    return float(number)
+                except ValueError:
+                    return None
+    return None
+
+
+class _State():
+    """ State of a token bucket. `rate` and `burst` are None until known. """
+    __slots__ = ("tokens", "updated", "blocked_until", "rate", "burst")
+    _format = struct.Struct("5d")
+
+    def __init__(self, tokens=0.0, updated=0.0, blocked_until=0.0, rate=None, burst=None):
+        self.tokens = tokens
+        self.updated = updated
+        self.blocked_until = blocked_until
+        self.rate = rate
+        self.burst = burst
+
+    def pack(self) -> bytes:
+        return self._format.pack(
+            self.tokens, self.updated, self.blocked_until,
+            math.nan if self.rate is None else self.rate,
+            math.nan if self.burst is None else self.burst
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        values = cls._format.unpack(data)
+        return cls(*values[:3], *(None if math.isnan(v) else v for v in values[3:]))
+
+
+class LocalBackend():
+    """ Keeps the bucket in memory, shared by the threads of the process. """
+
+    def __init__(self):
+        self._state = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self, initial: _State):
+        with self._lock:
+            if self._state is None:
+                self._state = initial
+            yield self._state
+
+
+class FileBackend():
+    """
+    Keeps the bucket in a small file locked with `flock`, shared by every
+    process using the same path. Only available on POSIX systems.
+    """
+
+    def __init__(self, path: str = None):
+        if fcntl is None:
+            raise ImportError("`fcntl` is required to share a rate limit between processes.")
+        self.path = path or os.path.join(os.path.expanduser("~"), ".absurdia", "ratelimit")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # `flock` only serializes processes, threads take this lock first.
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self, initial: _State):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                data = os.read(fd, _State._format.size)
+                state = _State.unpack(data) if len(data) == _State._format.size else initial
+                yield state
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, state.pack())
+            finally:
+                os.close(fd)
+
+
+class RateLimiter():
+    """
+    Token bucket pacing the requests sent to the API. Requests wait for a
+    token instead of being sent to be rejected with a 429. The rate and
+    burst are learnt from the `RateLimit-*` and `X-RateLimit-*` headers of
+    the responses unless they are given. Safe to share between threads,
+    and between processes with a `FileBackend`.
+    """
+
+    def __init__(self, rate: float = None, burst: float = None, backend=None, adaptive: bool = True):
+        """
+        :param float rate: Requests allowed per second. None sends requests
+                           freely until the API announces its limit.
+        :param float burst: Requests allowed at once. Defaults to one second
+                            worth of requests, and at least one.
+        :param backend: Where the bucket is kept: a `LocalBackend` (default)
+                        or a `FileBackend` to share it between processes.
+        :param bool adaptive: Tune the rate and burst from the rate-limit
+                              headers of the responses
+        """
+        self.backend = backend or LocalBackend()
+        self.adaptive = adaptive
+        self._initial = _State(rate=rate, burst=burst)
+        if burst is not None:
+            self._initial.tokens = float(burst)
+        elif rate is not None:
+            self._initial.tokens = max(float(rate), 1.0)
+
+        # Counters of this process
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self._counters_lock = threading.Lock()
+
+    def stats(self) -> dict:
+        """ Returns the counters of the requests paced by this limiter. """
+        with self._counters_lock:
+            return {
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "wait_time": self.wait_time,
+                "max_wait": self.max_wait,
+                "mean_wait": self.wait_time / self.acquired if self.acquired else 0.0,
+            }
+
+    def _try_acquire(self) -> float:
+        """ Takes a token and returns 0, or returns how long to wait for one, in seconds. """
+        with self.backend.transaction(self._initial) as state:
+            now = time.time()
+            if state.blocked_until > now:
+                return state.blocked_until - now
+            if state.rate is None:
+                return 0.0
+            burst = state.burst if state.burst is not None else max(state.rate, 1.0)
+            if state.updated:
+                state.tokens = min(burst, state.tokens + (now - state.updated) * state.rate)
+            state.updated = now
+            if state.tokens >= 1:
+                state.tokens -= 1
+                return 0.0
+            return (1 - state.tokens) / state.rate if state.rate > 0 else 1.0
+
+    def _count(self, waited: float):
+        with self._counters_lock:
+            self.acquired += 1
+            if waited > 0:
+                self.waited += 1
+                self.wait_time += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self) -> float:
+        """ Blocks until a request may be sent. Returns the time waited, in seconds. """
+        start = time.monotonic()
+        delay = self._try_acquire()
+        waited = 0.0
+        while delay > 0:
+            time.sleep(delay)
+            delay = self._try_acquire()
+            waited = time.monotonic() - start
+        self._count(waited)
+        return waited
+
+    async def acquire_async(self) -> float:
+        """ Same as `acquire`, waiting without blocking the event loop. """
+        import asyncio
+        start = time.monotonic()
+        delay = self._try_acquire()
+        waited = 0.0
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._try_acquire()
+            waited = time.monotonic() - start
+        self._count(waited)
+        return waited
+
+    def update(self, response):
+        """ Tunes the bucket from the rate-limit headers of a response. """
+        headers = response.headers
+        limit = _header(headers, LIMIT_HEADERS)
+        remaining = _header(headers, REMAINING_HEADERS)
+        reset = _header(headers, RESET_HEADERS)
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if limit is None and remaining is None and retry_after is None \
+        and response.status_code != 429:
+            return
+
+        now = time.time()
+        if reset is not None and reset > _EPOCH_THRESHOLD:
+            reset = max(reset - now, 0.0)
+        window = _window(headers)
+
+        with self.backend.transaction(self._initial) as state:
+            if self.adaptive and limit:
+                state.burst = limit
+                if window:
+                    state.rate = limit / window
+                elif reset and remaining is not None:
+                    # Spread what is left evenly until the window resets.
+                    state.rate = max(remaining, 1.0) / reset
+                if not state.updated:
+                    state.tokens = limit
+                    state.updated = now
+            if remaining is not None:
+                state.tokens = min(state.tokens, remaining)
+                if remaining < 1 and reset:
+                    state.blocked_until = max(state.blocked_until, now + reset)
+            if response.status_code == 429:
+                state.tokens = 0.0
+                state.updated = now
+                wait = retry_after if retry_after is not None else reset
+                if wait:
+                    state.blocked_until = max(state.blocked_until, now + wait)
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import absurdia
+
+# Methods that can be sent twice without side effects. POST and PATCH are
+# only retried when they carry an `Idempotency-Key` header.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryBudget():
+    """
+    Caps retries to a fraction of the requests sent, so that an outage does
+    not multiply the load on the API. Every request deposits `ratio` of a
+    token and every retry withdraws one, with at most `max_tokens` saved.
+    Safe to share between threads and clients.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Shared by every client that does not bring its own budget.
+default_budget = RetryBudget()
+
+
+def parse_retry_after(value) -> float:
+    """ Returns the delay of a `Retry-After` header in seconds, or None. """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(date.timestamp() - time.time(), 0.0)
+
+
+class RetryPolicy():
+    """
+    Decides whether and when a failed request is sent again: on connection
+    errors and on 429 and 5xx responses, with exponential backoff and
+    jitter, honouring the `Retry-After` header of the API.
+    """
+
+    def __init__(self,
+                 max_retries: int = None,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 20.0,
+                 jitter: bool = True,
+                 max_retry_after: float = 60.0,
+                 statuses=RETRY_STATUSES,
+                 budget: RetryBudget = None):
+        """
+        :param int max_retries: Maximum number of retries of a request.
+                                Defaults to `absurdia.max_network_retries`.
+        :param float backoff_base: Delay before the first retry, in seconds
+        :param float backoff_max: Maximum delay between two attempts, in seconds
+        :param bool jitter: Pick delays at random between 0 and the backoff
+                            ("full jitter") to spread out retrying clients
+        :param float max_retry_after: Longest `Retry-After` honoured, in seconds.
+                                      Requests asked to wait longer are not retried.
+        :param statuses: HTTP status codes worth a retry
+        :param RetryBudget budget: Budget shared by the requests.
+                                   Defaults to a budget global to the process.
+        """
+        self._max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self.budget = budget if budget is not None else default_budget
+
+    @property
+    def max_retries(self) -> int:
+        if self._max_retries is not None:
+            return self._max_retries
+        return absurdia.max_network_retries or 0
+
+    def on_request(self):
+        self.budget.deposit()
+
+    def should_retry(self, method: str, headers: dict, attempt: int,
+                     response=None, error: Exception = None) -> bool:
+        """
+        :param str method: HTTP method of the request
+        :param dict headers: Headers of the request
+        :param int attempt: Number of retries already made
+        :param response: The response received, if any
+        :param Exception error: The connection error raised, if any
+        """
+        if attempt >= self.max_retries:
+            return False
+        if method.upper() not in IDEMPOTENT_METHODS \
+        and not any(key.lower() == "idempotency-key" for key in (headers or {})):
+            return False
+        if error is None:
+            if response is None or response.status_code not in self.statuses:
+                return False
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None and retry_after > self.max_retry_after:
+                return False
+        return self.budget.withdraw()
+
+    def delay(self, attempt: int, response=None) -> float:
+        """ Returns how long to wait before retry number `attempt + 1`, in seconds. """
+        backoff = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                return max(retry_after, backoff)
+        return backoff
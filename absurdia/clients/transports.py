@@ -0,0 +1,304 @@
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import urllib3
+from requests import Request, Session, hooks
+from requests.exceptions import ConnectionError, Timeout
+from urllib3.exceptions import HTTPError
+
+from absurdia.clients import instrumentation as timing
+
+# httpx is imported on first use, see `_require_httpx`.
+httpx = None
+
+TRANSPORTS = ("requests", "urllib3", "httpx")
+
+
+class TransportResponse():
+    """ Response of a transport, with its body fully read. """
+    __slots__ = ("status_code", "headers", "content", "encoding", "headers_received")
+
+    def __init__(self, status_code: int, headers, content: bytes,
+                 encoding: str = None, headers_received: float = None):
+        """
+        :param int status_code: HTTP status code
+        :param headers: Case-insensitive mapping of the response headers
+        :param bytes content: Body of the response
+        :param str encoding: Charset of the body. Defaults to UTF-8.
+        :param float headers_received: `time.perf_counter()` when the headers
+                                       were received, to time the download
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.headers_received = headers_received
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", "replace")
+
+
+class Transport():
+    """
+    Sends HTTP requests for an `HttpClient`, which keeps the retry, rate
+    limiting, instrumentation and logging around it. Transports must be
+    safe to share between threads, and may record the phases of a request
+    with `absurdia.clients.instrumentation.record_phase`.
+    """
+
+    name = None
+
+    # Exceptions raised on connection errors and timeouts, which are retried.
+    errors = ()
+
+    def send(self, method: str, url: str, params: dict, headers: dict, body,
+             timeout: float = None, allow_redirects: bool = False) -> TransportResponse:
+        """
+        :param str method: HTTP method
+        :param str url: URL of the request, without the query string
+        :param dict params: Query parameters
+        :param dict headers: Headers of the request
+        :param body: None, bytes or an iterator of bytes chunks
+        :param float timeout: Timeout, in seconds
+        :param bool allow_redirects: Whether to follow redirects
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def _proxy_for(proxy: dict, url: str) -> str:
+    if not proxy:
+        return None
+    return proxy.get(urlsplit(url).scheme) or proxy.get("all")
+
+
+class RequestsTransport(Transport):
+    """ Transport over a `requests.Session`, honouring its environment settings. """
+
+    name = "requests"
+
+    def __init__(self, pool_connections: bool = True, max_connections: int = 10,
+                 request_hooks=None, proxy: dict = None):
+        """
+        :param bool pool_connections: Reuse connections between requests
+        :param int max_connections: Connections kept open per host
+        :param request_hooks: Hooks of the `requests` requests
+        :param dict proxy: Proxies by URL scheme
+        """
+        self.errors = (ConnectionError, Timeout)
+        self.max_connections = max_connections
+        self.request_hooks = request_hooks or hooks.default_hooks()
+        self.proxy = proxy or {}
+        self.session = self._new_session() if pool_connections else None
+
+    def _new_session(self):
+        session = Session()
+        adapter = timing.TimedHTTPAdapter(pool_maxsize=self.max_connections)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def send(self, method, url, params, headers, body, timeout=None, allow_redirects=False):
+        session = self.session or self._new_session()
+        request = Request(
+            method=method, url=url, params=params, headers=headers, data=body,
+            hooks=self.request_hooks
+        )
+        prepped_request = session.prepare_request(request)
+        settings = session.merge_environment_settings(
+            prepped_request.url, self.proxy, None, None, None)
+        settings['allow_redirects'] = allow_redirects
+        settings['timeout'] = timeout
+        # Headers and body are read separately to time them.
+        settings['stream'] = True
+
+        response = session.send(prepped_request, **settings)
+        headers_received = time.perf_counter()
+        content = response.content
+        return TransportResponse(
+            response.status_code, response.headers, content,
+            response.encoding, headers_received
+        )
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport straight over a `urllib3.PoolManager`. It skips the request
+    preparation and environment lookups of `requests`, which take a good
+    share of the CPU time of small requests. Proxies and CA bundles from the
+    environment are not used.
+    """
+
+    name = "urllib3"
+
+    def __init__(self, max_connections: int = 10, proxy: dict = None, ca_certs: str = None):
+        """
+        :param int max_connections: Connections kept open per host
+        :param dict proxy: Proxies by URL scheme
+        :param str ca_certs: Path of a CA bundle. Defaults to `certifi`'s.
+        """
+        self.errors = (HTTPError,)
+        if ca_certs is None:
+            try:
+                ca_certs = __import__("certifi").where()
+            except ImportError:
+                pass
+        options = {
+            "maxsize": max_connections,
+            "cert_reqs": "CERT_REQUIRED",
+            "ca_certs": ca_certs,
+            "retries": False,
+        }
+        proxy_url = _proxy_for(proxy, "https://") or _proxy_for(proxy, "http://")
+        if proxy_url:
+            self.pool = urllib3.ProxyManager(proxy_url, **options)
+        else:
+            self.pool = urllib3.PoolManager(**options)
+            self.pool.pool_classes_by_scheme = timing.TIMED_POOL_CLASSES
+
+    def send(self, method, url, params, headers, body, timeout=None, allow_redirects=False):
+        if params:
+            url = "%s?%s" % (url, urlencode(params, doseq=True))
+        response = self.pool.urlopen(
+            method, url,
+            body=body,
+            headers=headers,
+            # Iterators have no length and are sent chunked
+            chunked=body is not None and not isinstance(body, bytes),
+            redirect=allow_redirects,
+            timeout=timeout,
+            preload_content=False,
+            decode_content=True,
+        )
+        headers_received = time.perf_counter()
+        try:
+            content = response.read()
+        finally:
+            response.release_conn()
+        return TransportResponse(
+            response.status, response.headers, content, None, headers_received
+        )
+
+    def close(self):
+        self.pool.clear()
+
+
+# Phases recorded from the trace events of httpcore.
+_TRACED_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+}
+_trace_starts = threading.local()
+
+
+def _require_httpx():
+    global httpx
+    if httpx is not None:
+        return
+    try:
+        httpx = __import__("httpx")
+    except ImportError:
+        raise ImportError(
+            "`httpx` is required to use the httpx transport. "
+            "Install with `pip install absurdia[http2]`"
+        )
+
+
+class HttpxTransport(Transport):
+    """
+    Transport over an `httpx.Client`. With `http2=True`, concurrent requests
+    from many threads are multiplexed over a single connection per host,
+    which suits many parallel uploads. Requires `pip install absurdia[http2]`.
+    """
+
+    name = "httpx"
+
+    def __init__(self, http2: bool = True, max_connections: int = 10, proxy: dict = None):
+        """
+        :param bool http2: Negotiate HTTP/2 with the server
+        :param int max_connections: Maximum number of connections
+        :param dict proxy: Proxies by URL scheme
+        """
+        _require_httpx()
+        self.errors = (httpx.TransportError,)
+        self.http2 = http2
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            proxy=_proxy_for(proxy, "https://") or _proxy_for(proxy, "http://"),
+            timeout=httpx.Timeout(None)
+        )
+
+    @staticmethod
+    def _trace(event: str, info: dict):
+        # Called by httpcore, in the thread sending the request, around the
+        # steps of the request.
+        name, _, stage = event.rpartition(".")
+        phase = _TRACED_PHASES.get(name)
+        if phase is None:
+            return
+        if stage == "started":
+            setattr(_trace_starts, phase, time.perf_counter())
+        elif stage == "complete":
+            start = getattr(_trace_starts, phase, None)
+            if start is not None:
+                timing.record_phase(phase, (time.perf_counter() - start) * 1000)
+
+    def send(self, method, url, params, headers, body, timeout=None, allow_redirects=False):
+        request = self.client.build_request(
+            method, url,
+            params=params,
+            headers=headers,
+            content=body,
+            timeout=httpx.Timeout(timeout),
+            extensions={"trace": self._trace}
+        )
+        response = self.client.send(request, stream=True, follow_redirects=allow_redirects)
+        headers_received = time.perf_counter()
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        return TransportResponse(
+            response.status_code, response.headers, content,
+            response.charset_encoding, headers_received
+        )
+
+    def close(self):
+        self.client.close()
+
+
+def get_transport(transport=None, **options) -> Transport:
+    """
+    Returns a transport from a `Transport` or a name among `TRANSPORTS`.
+    Without argument, uses `absurdia.default_http_client`, then `requests`.
+    :param options: Options of the transport created from a name
+    """
+    if transport is None:
+        import absurdia
+        transport = absurdia.default_http_client or "requests"
+    if isinstance(transport, Transport):
+        return transport
+    if transport == "requests":
+        return RequestsTransport(**options)
+    options.pop("pool_connections", None)
+    options.pop("request_hooks", None)
+    if transport == "urllib3":
+        return Urllib3Transport(**options)
+    if transport in ("httpx", "http2"):
+        return HttpxTransport(http2=transport == "http2", **options)
+    raise ValueError(
+        "Unknown transport %r. Expected a Transport or one of: %s."
+        % (transport, ", ".join(TRANSPORTS + ("http2",)))
+    )
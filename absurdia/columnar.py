@@ -0,0 +1,183 @@
+from absurdia import json_backend
+
+# numpy is imported on first use, see `_require_numpy`.
+np = None
+
+FORMATS = ("numpy", "pandas", "arrow")
+
+_TIMESTAMP_NAMES = ("timestamp", "time", "date")
+_TIMESTAMP_SUFFIXES = ("_at", "_time", "_date", "_timestamp", "_ts")
+
+
+def _is_timestamp(name: str) -> bool:
+    return name in _TIMESTAMP_NAMES or name.endswith(_TIMESTAMP_SUFFIXES)
+
+
+def decode_columns(text: str, key: str = "data"):
+    """
+    Decodes the array of records found under `key` in a JSON document into
+    columns. The document is decoded at once with the JSON backend, then
+    each column is read from the records in a single pass.
+    :param str text: The JSON document
+    :param str key: Top-level key holding the records
+    :returns: A tuple with a dict of column name to list of values, and the
+              number of records. Missing values are None.
+    """
+    document = json_backend.loads(text)
+    if not isinstance(document, dict):
+        raise ValueError("Expected a JSON object.")
+    records = document.get(key)
+    if not isinstance(records, list):
+        return {}, 0
+
+    # Names of the columns, in the order they are first seen. Records of
+    # a response usually share their keys, which are then checked once.
+    names = {}
+    last_keys = None
+    complete = True
+    for record in records:
+        keys = record.keys()
+        if keys != last_keys:
+            if last_keys is not None:
+                complete = False
+            names.update(dict.fromkeys(keys))
+            last_keys = keys
+
+    if complete:
+        columns = {name: [record[name] for record in records] for name in names}
+    else:
+        columns = {name: [record.get(name) for record in records] for name in names}
+    return columns, len(records)
+
+
+def _kind(name: str, values: list) -> str:
+    """ Infers the type of a column: int, float, bool, category or object. """
+    # The types are collected in C, then looked at once each.
+    types = set(map(type, values))
+    has_null = type(None) in types
+    types.discard(type(None))
+    kinds = set()
+    for cls in types:
+        if issubclass(cls, bool):
+            kinds.add("bool")
+        elif issubclass(cls, int):
+            kinds.add("int")
+        elif issubclass(cls, float):
+            kinds.add("float")
+        elif issubclass(cls, str):
+            kinds.add("category")
+        else:
+            return "object"
+
+    if kinds == {"int"}:
+        # Missing values have no int64 representation; fall back to NaN.
+        return "float" if has_null else "int"
+    if kinds == {"int", "float"}:
+        # Timestamps sent as decimals are still truncated to int64.
+        return "int" if _is_timestamp(name) and not has_null else "float"
+    if len(kinds) == 1 and not (has_null and kinds == {"bool"}):
+        return kinds.pop()
+    return "object"
+
+
+def _categories(values: list):
+    categories = dict.fromkeys(values)
+    categories.pop(None, None)
+    codes = {value: i for i, value in enumerate(categories)}
+    codes[None] = -1
+    return list(map(codes.__getitem__, values)), list(categories)
+
+
+def _numpy_array(values: list, kind: str):
+    # numpy truncates decimals to int64, and makes None NaN in float64.
+    if kind == "int":
+        return np.array(values, dtype=np.int64)
+    elif kind == "float":
+        return np.array(values, dtype=np.float64)
+    elif kind == "bool":
+        return np.array(values, dtype=np.bool_)
+    return np.array(values, dtype=object)
+
+
+def _require_numpy():
+    global np
+    if np is not None:
+        return
+    try:
+        np = __import__("numpy")
+    except ImportError:
+        raise ImportError(
+            "`numpy` is required for columnar results. "
+            "Install with `pip install numpy`"
+        )
+
+
+def to_numpy(columns: dict, length: int) -> dict:
+    """
+    Converts decoded columns to a dict of numpy arrays. Timestamps and
+    integers are int64, prices and other decimals float64. String columns
+    are object arrays.
+    """
+    _require_numpy()
+    return {
+        name: _numpy_array(values, _kind(name, values))
+        for name, values in columns.items()
+    }
+
+
+def to_pandas(columns: dict, length: int):
+    """
+    Converts decoded columns to a `pandas.DataFrame`. String columns are
+    categoricals.
+    """
+    _require_numpy()
+    pd = __import__("pandas")
+    data = {}
+    for name, values in columns.items():
+        kind = _kind(name, values)
+        if kind == "category":
+            codes, categories = _categories(values)
+            data[name] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            data[name] = _numpy_array(values, kind)
+    return pd.DataFrame(data, index=pd.RangeIndex(length))
+
+
+def to_arrow(columns: dict, length: int):
+    """
+    Converts decoded columns to a `pyarrow.Table`. String columns are
+    dictionary encoded.
+    """
+    _require_numpy()
+    pa = __import__("pyarrow")
+    arrays = []
+    for name, values in columns.items():
+        kind = _kind(name, values)
+        if kind == "category":
+            codes, categories = _categories(values)
+            codes = np.array(codes, dtype=np.int32)
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0), pa.array(categories, type=pa.string())
+            ))
+        elif kind == "object":
+            arrays.append(pa.array(values))
+        else:
+            arrays.append(pa.array(_numpy_array(values, kind)))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def convert(text: str, format: str, key: str = "data"):
+    """
+    Decodes the records under `key` of a JSON document into the given
+    columnar `format`: "numpy", "pandas" or "arrow".
+    """
+    if format not in FORMATS:
+        raise ValueError(
+            "Unknown format %r. Expected one of: %s." % (format, ", ".join(FORMATS))
+        )
+    columns, length = decode_columns(text, key)
+    if format == "numpy":
+        return to_numpy(columns, length)
+    elif format == "pandas":
+        return to_pandas(columns, length)
+    return to_arrow(columns, length)
@@ -0,0 +1,167 @@
+import json
+import zlib
+
+from absurdia import json_backend
+
+try:
+    brotli = __import__("brotli")
+except ImportError:
+    brotli = None
+
+try:
+    zstandard = __import__("zstandard")
+except ImportError:
+    zstandard = None
+
+ENCODINGS = ("gzip", "br", "zstd")
+
+# Bodies smaller than this are not worth the CPU time of compressing.
+DEFAULT_THRESHOLD = 16 * 1024
+
+# Size of the chunks fed to the compressor and sent over the wire.
+CHUNK_SIZE = 64 * 1024
+
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+class _Compressor():
+    """ Common `compress`/`finish` interface over the streaming compressors. """
+
+    def __init__(self, encoding: str, level: int = None):
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(
+                level if level is not None else 6, zlib.DEFLATED, 31
+            )
+            self._compress = self._obj.compress
+            self._finish = self._obj.flush
+        elif encoding == "br":
+            if brotli is None:
+                raise ImportError(
+                    "`brotlipy` is required for brotli compression. "
+                    "Install with `pip install brotlipy`"
+                )
+            if level is not None:
+                self._obj = brotli.Compressor(quality=level)
+            else:
+                self._obj = brotli.Compressor()
+            # brotlipy names it `compress`, Google's `brotli` names it `process`.
+            self._compress = getattr(self._obj, "process", None) or self._obj.compress
+            self._finish = self._obj.finish
+        elif encoding == "zstd":
+            if zstandard is None:
+                raise ImportError(
+                    "`zstandard` is required for zstd compression. "
+                    "Install with `pip install zstandard`"
+                )
+            params = {"level": level} if level is not None else {}
+            self._obj = zstandard.ZstdCompressor(**params).compressobj()
+            self._compress = self._obj.compress
+            self._finish = self._obj.flush
+        else:
+            raise ValueError(
+                "Unknown encoding %r. Expected one of: %s."
+                % (encoding, ", ".join(ENCODINGS))
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def iter_json(data, chunk_size: int = CHUNK_SIZE):
+    """ Encodes `data` as compact JSON, yielding UTF-8 chunks of about `chunk_size` bytes. """
+    if json_backend.name != "json":
+        # Third-party backends cannot encode incrementally, but encoding
+        # everything at once with them is still faster.
+        encoded = json_backend.dumps(data)
+        for i in range(0, len(encoded), chunk_size):
+            yield encoded[i:i + chunk_size]
+        return
+
+    parts = []
+    size = 0
+    for part in _encoder.iterencode(data):
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def compress_chunks(chunks, encoding: str, level: int = None):
+    """ Compresses an iterable of bytes chunks as a stream. """
+    compressor = _Compressor(encoding, level)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    out = compressor.finish()
+    if out:
+        yield out
+
+
+def encode_body(chunks, encoding: str = None, threshold: int = DEFAULT_THRESHOLD):
+    """
+    Prepares a request body from an iterable of bytes chunks.
+    Bodies smaller than `threshold` are sent as plain bytes. Larger ones are
+    streamed, and compressed with `encoding` while they are sent.
+    :param chunks: Iterable of bytes chunks of the body
+    :param str encoding: One of "gzip", "br" or "zstd". None disables compression.
+    :param int threshold: Minimum size of a body to stream and compress, in bytes
+    :returns: A tuple with the body, either bytes or an iterator of bytes,
+              and the value of its `Content-Encoding` header or None.
+    """
+    chunks = iter(chunks)
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= threshold:
+            break
+    else:
+        return b"".join(head), None
+
+    def stream():
+        yield from head
+        yield from chunks
+
+    if encoding is None:
+        return stream(), None
+    return compress_chunks(stream(), encoding), encoding
+
+
+def encode_json(data, encoding: str = None, threshold: int = DEFAULT_THRESHOLD):
+    """ Same as `encode_body` for a JSON-serializable `data`. """
+    return encode_body(iter_json(data), encoding, threshold)
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """ Decompresses a whole body encoded with `encoding`, e.g. on a test server. """
+    if not encoding or encoding == "identity":
+        return data
+    if encoding == "gzip":
+        return zlib.decompress(data, 31)
+    if encoding == "br":
+        if brotli is None:
+            raise ImportError(
+                "`brotlipy` is required for brotli compression. "
+                "Install with `pip install brotlipy`"
+            )
+        return brotli.decompress(data)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "`zstandard` is required for zstd compression. "
+                "Install with `pip install zstandard`"
+            )
+        # Streamed frames do not record their size, which `decompress` requires.
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(
+        "Unknown encoding %r. Expected one of: %s." % (encoding, ", ".join(ENCODINGS))
+    )
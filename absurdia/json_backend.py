@@ -0,0 +1,81 @@
+import json
+
+try:
+    orjson = __import__("orjson")
+except ImportError:
+    orjson = None
+
+try:
+    ujson = __import__("ujson")
+except ImportError:
+    ujson = None
+
+BACKENDS = ("orjson", "ujson", "json")
+
+# Name of the backend in use. Picked at import as the fastest one installed.
+name = None
+
+loads = None
+_dumps = None
+
+
+def _default(obj):
+    # Numpy scalars and arrays, without importing numpy.
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError("Object of type %s is not JSON serializable" % (type(obj).__name__,))
+
+
+def _json_dumps(obj) -> bytes:
+    return json.dumps(
+        obj, separators=(',', ':'), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+def set_backend(backend: str = None):
+    """
+    Selects the library encoding and decoding JSON: "orjson", "ujson" or
+    "json" (the standard library). Without argument, picks the fastest one
+    installed.
+    """
+    global name, loads, _dumps
+    if backend is None:
+        backend = "orjson" if orjson else ("ujson" if ujson else "json")
+
+    if backend == "orjson":
+        if orjson is None:
+            raise ImportError("`orjson` is not installed. Install with `pip install orjson`")
+        loads = orjson.loads
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        _dumps = lambda obj: orjson.dumps(obj, default=_default, option=options)
+    elif backend == "ujson":
+        if ujson is None:
+            raise ImportError("`ujson` is not installed. Install with `pip install ujson`")
+        loads = ujson.loads
+        _dumps = lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+    elif backend == "json":
+        loads = json.loads
+        _dumps = _json_dumps
+    else:
+        raise ValueError(
+            "Unknown JSON backend %r. Expected one of: %s." % (backend, ", ".join(BACKENDS))
+        )
+    name = backend
+
+
+def dumps(obj) -> bytes:
+    """
+    Encodes `obj` as compact UTF-8 JSON. Numpy scalars and arrays are
+    encoded as numbers and lists, and keys which are not strings as strings.
+    """
+    try:
+        return _dumps(obj)
+    except (TypeError, OverflowError):
+        if _dumps is _json_dumps:
+            raise
+        # Values the backend cannot encode, such as integers beyond 64 bits,
+        # are left to the standard library.
+        return _json_dumps(obj)
+
+
+set_backend()
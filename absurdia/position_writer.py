@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from absurdia.util import dump
+
+_logger = logging.getLogger('absurdia.position_writer')
+
+# Control messages sent to the worker through the positions queue.
+_FLUSH = object()
+_STOP = object()
+
+# Interval at which waits on the worker check that it is still alive, in seconds.
+_POLL_INTERVAL = 0.1
+
+
+def _is_control(item) -> bool:
+    return type(item) is tuple and (item[0] is _FLUSH or item[0] is _STOP)
+
+
+class PositionWriter():
+    """
+    Buffers positions of a backtest and uploads them in batches from a
+    background thread, so that the caller never waits on the network.
+
+    A batch is sent as soon as it holds `max_batch_size` positions or
+    `max_batch_bytes` bytes of JSON, or `flush_interval` seconds after its
+    first position was buffered. When `max_buffered` positions are waiting
+    to be sent, `add_position` blocks until the worker catches up.
+
+    Positions are encoded as they are added, so that one which cannot be
+    encoded to JSON raises in the caller. Once the worker has stopped,
+    writes and flushes raise instead of waiting on it.
+    """
+
+    def __init__(self,
+                 backtest,
+                 max_batch_size: int = 1000,
+                 max_batch_bytes: int = 1000000,
+                 flush_interval: float = 1.0,
+                 max_buffered: int = 10000):
+        """
+        :param Backtest backtest: The backtest the positions belong to
+        :param int max_batch_size: Maximum number of positions per request
+        :param int max_batch_bytes: Maximum size of a request body, in bytes
+        :param float flush_interval: Maximum time a position stays buffered, in seconds
+        :param int max_buffered: Number of buffered positions after which
+                                 writes block
+        """
+        if asyncio.iscoroutinefunction(backtest.add_positions):
+            raise TypeError("PositionWriter requires a backtest of the synchronous Client.")
+        if max_batch_size <= 0 or max_batch_bytes <= 0:
+            raise ValueError("Batch limits should be greater than zero (0).")
+        if flush_interval <= 0:
+            raise ValueError("Flush interval should be greater than zero (0).")
+
+        self.backtest = backtest
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.flush_interval = flush_interval
+
+        self.errors = []
+        self.positions_sent = 0
+        self.batches_sent = 0
+
+        self._queue = queue.Queue(maxsize=max_buffered)
+        self._finished = False
+        self._worker = threading.Thread(
+            target=self._run, name="absurdia-position-writer", daemon=True
+        )
+        self._worker.start()
+
+    def add_position(self, position: dict, timeout: float = None):
+        """
+        Buffers a position. Blocks while the buffer is full.
+        :param dict position: The position to upload
+        :param float timeout: Maximum time to wait for room in the buffer, in seconds.
+                              Raises `queue.Full` when it expires.
+        """
+        if self._finished:
+            raise RuntimeError("Cannot add positions to a finished writer.")
+        # Raises `TypeError` for a position which cannot be encoded.
+        size = len(dump(position)) + 1
+        self._put((position, size), timeout=timeout)
+
+    def add_positions(self, positions: list, timeout: float = None):
+        for position in positions:
+            self.add_position(position, timeout=timeout)
+
+    def flush(self):
+        """ Sends every buffered position and waits until they are uploaded. """
+        if self._finished:
+            raise RuntimeError("Cannot flush a finished writer.")
+        done = threading.Event()
+        self._put((_FLUSH, done))
+        while not done.wait(_POLL_INTERVAL):
+            self._check_worker()
+
+    def finish(self):
+        """
+        Sends the remaining positions and stops the background worker.
+        Raises the first error met while uploading, if any.
+        """
+        if not self._finished:
+            self._finished = True
+            if self._worker.is_alive():
+                self._queue.put((_STOP, None))
+            self._worker.join()
+        if self.errors:
+            raise self.errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+
+    def _check_worker(self):
+        if not self._worker.is_alive():
+            raise RuntimeError(
+                "The worker of the writer stopped: %s" % (self.errors[-1] if self.errors else "",)
+            )
+
+    def _put(self, item, timeout: float = None):
+        # Waits for room in the buffer while the worker is alive to make some.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._check_worker()
+            wait = _POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0))
+            try:
+                self._queue.put(item, timeout=wait)
+                return
+            except queue.Full:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def _run(self):
+        try:
+            self._loop()
+        except Exception as e:
+            _logger.exception("The position writer of backtest %s stopped", self.backtest.id)
+            self.errors.append(e)
+
+    def _loop(self):
+        batch = []
+        batch_bytes = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or _is_control(item):
+                self._send(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                if item is not None:
+                    control, done = item
+                    if control is _STOP:
+                        return
+                    done.set()
+                continue
+
+            item, size = item
+            if batch and batch_bytes + size > self.max_batch_bytes:
+                self._send(batch)
+                batch, batch_bytes, deadline = [], 0, None
+            batch.append(item)
+            batch_bytes += size
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.max_batch_size:
+                self._send(batch)
+                batch, batch_bytes, deadline = [], 0, None
+
+    def _send(self, batch: list):
+        if not batch:
+            return
+        try:
+            self.backtest.add_positions(batch)
+            self.positions_sent += len(batch)
+            self.batches_sent += 1
+        except Exception as e:
+            _logger.warning(
+                "Failed to upload %d positions of backtest %s: %s",
+                len(batch), self.backtest.id, e
+            )
+            self.errors.append(e)
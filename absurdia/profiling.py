@@ -0,0 +1,154 @@
+import threading
+import time
+
+import psutil
+
+
+class _Usage():
+    """ Last counters seen of a process, kept after it exits. """
+    __slots__ = ("user", "system", "read_bytes", "write_bytes")
+
+    def __init__(self):
+        self.user = 0.0
+        self.system = 0.0
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+
+class ProcessProfiler():
+    """
+    Samples the resource usage of a process and of all its descendants
+    from a background thread while they run:
+    wall time, CPU user and system time, peak RSS, I/O bytes and the
+    utilisation of each core.
+
+        process = subprocess.Popen(command)
+        with ProcessProfiler(process) as profiler:
+            process.wait()
+        profile = profiler.summary()
+
+    Counters are cumulative per process and read at every sample, so the
+    work a short-lived process does after the last sample of it is missed.
+    Per-core utilisation is system-wide, as `psutil` cannot attribute it to
+    a process.
+    """
+
+    def __init__(self, process, interval: float = 0.25):
+        """
+        :param process: Process to profile: a pid, a `psutil.Process` or a
+                        `subprocess.Popen`
+        :param float interval: Time between two samples, in seconds
+        """
+        if isinstance(process, int):
+            process = psutil.Process(process)
+        elif not isinstance(process, psutil.Process):
+            process = psutil.Process(process.pid)
+        self.process = process
+        self.interval = interval
+
+        self._usages = {}
+        self._peak_rss = 0
+        self._core_totals = None
+        self._core_peaks = None
+        self._samples = 0
+        self._started_at = None
+        self._stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self._started_at = time.monotonic()
+        # The first call only sets the reference point of the next ones.
+        psutil.cpu_percent(percpu=True)
+        self._sample()
+        self._thread = threading.Thread(
+            target=self._run, name="absurdia-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> dict:
+        """ Stops sampling and returns the summary. """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._stopped_at = time.monotonic()
+        return self.summary()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _tree(self) -> list:
+        try:
+            return [self.process] + self.process.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def _sample(self):
+        rss = 0
+        for process in self._tree():
+            try:
+                with process.oneshot():
+                    # Pids are reused, the creation time tells processes apart.
+                    key = (process.pid, process.create_time())
+                    cpu = process.cpu_times()
+                    rss += process.memory_info().rss
+                    try:
+                        io = process.io_counters()
+                    except (AttributeError, psutil.AccessDenied):
+                        # Not available on macOS
+                        io = None
+            except psutil.Error:
+                # Exited since the tree was listed
+                continue
+            usage = self._usages.get(key)
+            if usage is None:
+                usage = self._usages[key] = _Usage()
+            usage.user = cpu.user
+            usage.system = cpu.system
+            if io is not None:
+                usage.read_bytes = io.read_bytes
+                usage.write_bytes = io.write_bytes
+        self._peak_rss = max(self._peak_rss, rss)
+
+        cores = psutil.cpu_percent(percpu=True)
+        if self._core_totals is None:
+            self._core_totals = [0.0] * len(cores)
+            self._core_peaks = [0.0] * len(cores)
+        for i, percent in enumerate(cores):
+            self._core_totals[i] += percent
+            self._core_peaks[i] = max(self._core_peaks[i], percent)
+        self._samples += 1
+
+    def summary(self) -> dict:
+        """ Returns the resource usage measured so far. """
+        end = self._stopped_at if self._stopped_at is not None else time.monotonic()
+        wall_time = end - self._started_at if self._started_at is not None else 0.0
+        usages = self._usages.values()
+        user = sum(usage.user for usage in usages)
+        system = sum(usage.system for usage in usages)
+        samples = max(self._samples, 1)
+        return {
+            "wall_time_s": round(wall_time, 3),
+            "cpu_user_s": round(user, 3),
+            "cpu_system_s": round(system, 3),
+            "cpu_cores_used": round((user + system) / wall_time, 3) if wall_time else 0.0,
+            "peak_rss_bytes": self._peak_rss,
+            "io_read_bytes": sum(usage.read_bytes for usage in usages),
+            "io_write_bytes": sum(usage.write_bytes for usage in usages),
+            "per_core_percent": {
+                "mean": [round(total / samples, 1) for total in self._core_totals or []],
+                "max": list(self._core_peaks or []),
+            },
+            "processes": len(self._usages),
+            "samples": self._samples,
+            "interval_s": self.interval,
+        }
@@ -1,10 +1,48 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from absurdia import json_backend
 from absurdia.api_error import APIError
+from absurdia.api_response import APIResponse
 from absurdia.clients import Client
 
+# Statuses answered to the bulk endpoint of a resource which has none.
+_NO_BULK_STATUSES = (404, 405, 501)
+
+
+def _next_page_params(params: dict, page) -> dict:
+    """
+    Returns the query parameters of the page following `page`, or None if
+    `page` is the last one.
+    """
+    if not len(page):
+        return None
+    has_more = page.response.json.get("has_more") if page.response else None
+    if has_more is False or (has_more is None and len(page) < params["limit"]):
+        return None
+    next_params = params.copy()
+    next_params["starting_after"] = page[-1]["id"]
+    return next_params
+
+def build_payloads(build, items) -> list:
+    """
+    Returns the request body of each item, built by `build(**item)`, or
+    the exception raised building it.
+    """
+    payloads = []
+    for item in items:
+        try:
+            payloads.append(build(**item))
+        except (TypeError, ValueError) as e:
+            payloads.append(e)
+    return payloads
+
 class ResourceRequestor:
     
     def __init__(self, client: Client):
         self._client = client
+        # Whether the API has a bulk endpoint for the resource, once known.
+        self._bulk = None
     
     def from_response(self, response, is_list=False):
         raise NotImplementedError("Method not implemented.")
@@ -30,15 +68,142 @@ class ResourceRequestor:
             raise APIError(response.text, response.status_code, response.headers)
         return self.from_response(response, is_list=True)
 
+    def iter_all(self, 
+                 params: dict = {}, 
+                 page_size: int = 100, 
+                 prefetch: bool = True, 
+                 additional_headers: dict = {}):
+        """
+        Iterates over every object of the resource, fetching pages by cursor
+        as they are needed. At most two pages are held in memory at once.
+        :param dict params: Query string parameters, applied to every page
+        :param int page_size: Number of objects fetched per request
+        :param bool prefetch: Fetch the next page in the background while
+                              the current one is consumed
+        """
+        params = dict(params, limit=page_size)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = self.list(params, additional_headers=additional_headers)
+            while True:
+                next_params = _next_page_params(params, page)
+                future = None
+                if next_params is not None and executor:
+                    future = executor.submit(self.list, next_params, additional_headers)
+                for obj in page:
+                    yield obj
+                if next_params is None:
+                    break
+                if future:
+                    page = future.result()
+                else:
+                    page = self.list(next_params, additional_headers=additional_headers)
+                params = next_params
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    auto_paging_iter = iter_all
+
     def create(self, data: dict = {}, additional_headers: dict = {}, timeout=5000):
         response = self._client.request(
             "POST", self.base_path, data=data, 
-            additional_headers=additional_headers, timeout=timeout
+            additional_headers=additional_headers, timeout=timeout, compress=True
         )
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
         return self.from_response(response)
     
+    def _bulk_item(self, item: dict, response):
+        """ Returns the object or the error of an item of a bulk response. """
+        if not isinstance(item, dict) or "error" in item:
+            status = item.get("status", 400) if isinstance(item, dict) else 500
+            return APIError(
+                json_backend.dumps(item).decode("utf-8"), status, response.headers
+            )
+        # Each object gets a response of its own, which `save()` diffs against.
+        return self.from_response(APIResponse(
+            response.status_code, json_backend.dumps({"data": item}).decode("utf-8"),
+            response.headers
+        ))
+
+    def _send_bulk(self, chunk: list, results: list, timeout: int) -> bool:
+        """
+        Creates the `(index, payload)` items of `chunk` with one request to
+        the bulk endpoint. Returns False if the API has no bulk endpoint.
+        """
+        try:
+            response = self._client.request(
+                "POST", "%s/bulk" % (self.base_path,),
+                data={"data": [payload for _, payload in chunk]},
+                timeout=timeout, compress=True
+            )
+            if response.status_code in _NO_BULK_STATUSES and not self._bulk:
+                self._bulk = False
+                return False
+            if not response.ok:
+                raise APIError(response.text, response.status_code, response.headers)
+            self._bulk = True
+            items = response.json["data"]
+            if len(items) != len(chunk):
+                raise APIError(
+                    "The bulk response has %d items for %d sent." % (len(items), len(chunk)),
+                    response.status_code, response.headers
+                )
+            for (i, _), item in zip(chunk, items):
+                results[i] = self._bulk_item(item, response)
+        except Exception as e:
+            for i, _ in chunk:
+                results[i] = e
+        return True
+
+    def _send_one(self, index: int, payload: dict, results: list, timeout: int):
+        try:
+            response = self._client.request(
+                "POST", self.base_path, data=payload, timeout=timeout, compress=True
+            )
+            results[index] = self.from_response(response)
+        except Exception as e:
+            results[index] = e
+
+    def _create_many(self, 
+                     payloads: list, 
+                     chunk_size: int = 100, 
+                     max_concurrency: int = None, 
+                     timeout: int = 60000) -> list:
+        """
+        Creates an object per payload, with the bulk endpoint of the resource
+        if the API has one, or else with one request per payload. Requests
+        run concurrently on the pool of the client.
+        :param list payloads: Request bodies, or the exception raised building them
+        :param int chunk_size: Number of objects per request to the bulk endpoint
+        :param int max_concurrency: Maximum number of requests in flight at once.
+                                    Defaults to the size of the connection pool.
+        :returns: The created objects, or the exception raised creating them,
+                  in the order of `payloads`
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size should be at least one (1).")
+        results = list(payloads)
+        pending = [(i, payload) for i, payload in enumerate(payloads)
+                   if not isinstance(payload, Exception)]
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        while chunks and self._bulk is None:
+            # Chunks are sent one at a time until one finds out whether the
+            # bulk endpoint exists.
+            if self._send_bulk(chunks[0], results, timeout):
+                chunks = chunks[1:]
+        with self._client.executor(max_concurrency) as executor:
+            if self._bulk:
+                calls = [executor.submit(self._send_bulk, chunk, results, timeout)
+                         for chunk in chunks]
+            else:
+                calls = [executor.submit(self._send_one, i, payload, results, timeout)
+                         for chunk in chunks for i, payload in chunk]
+            for call in calls:
+                call.result()
+        return results
+
     def update(self, 
                id:str, 
                data: dict = {}, 
@@ -58,4 +223,152 @@ class ResourceRequestor:
         path = "%s/%s" % (self.base_path, id)
         response = self._client.request("DELETE", path)
         if not response.ok:
-            raise APIError(response.text, response.status_code, response.headers)
\ No newline at end of file
+            raise APIError(response.text, response.status_code, response.headers)
+
+class AsyncResourceRequestor(ResourceRequestor):
+    """ Awaitable counterpart of `ResourceRequestor`, used by `AsyncClient`. """
+
+    async def retrieve(self, id: str, params: dict = {}, additional_headers: dict = {}):
+        path = "%s/%s" % (self.base_path, id)
+        response = await self._client.request(
+            "GET", path, params=params, additional_headers=additional_headers
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        return self.from_response(response)
+    
+    async def list(self, params: dict = { "limit": 100 }, additional_headers: dict = {}):
+        if params.get("limit"):
+            if params["limit"] > 10000:
+                raise ValueError("Limit is too large. Its maximum value is 10000.")
+
+        response = await self._client.request(
+            "GET", self.base_path, params=params, additional_headers=additional_headers
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        return self.from_response(response, is_list=True)
+
+    async def iter_all(self, 
+                       params: dict = {}, 
+                       page_size: int = 100, 
+                       prefetch: bool = True, 
+                       additional_headers: dict = {}):
+        params = dict(params, limit=page_size)
+        future = None
+        try:
+            page = await self.list(params, additional_headers=additional_headers)
+            while True:
+                next_params = _next_page_params(params, page)
+                if next_params is not None and prefetch:
+                    future = asyncio.ensure_future(
+                        self.list(next_params, additional_headers=additional_headers)
+                    )
+                for obj in page:
+                    yield obj
+                if next_params is None:
+                    break
+                if future:
+                    page = await future
+                    future = None
+                else:
+                    page = await self.list(next_params, additional_headers=additional_headers)
+                params = next_params
+        finally:
+            if future:
+                future.cancel()
+
+    auto_paging_iter = iter_all
+
+    async def create(self, data: dict = {}, additional_headers: dict = {}, timeout=5000):
+        response = await self._client.request(
+            "POST", self.base_path, data=data, 
+            additional_headers=additional_headers, timeout=timeout, compress=True
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        return self.from_response(response)
+    
+    async def _send_bulk(self, chunk: list, results: list, timeout: int) -> bool:
+        try:
+            response = await self._client.request(
+                "POST", "%s/bulk" % (self.base_path,),
+                data={"data": [payload for _, payload in chunk]},
+                timeout=timeout, compress=True
+            )
+            if response.status_code in _NO_BULK_STATUSES and not self._bulk:
+                self._bulk = False
+                return False
+            if not response.ok:
+                raise APIError(response.text, response.status_code, response.headers)
+            self._bulk = True
+            items = response.json["data"]
+            if len(items) != len(chunk):
+                raise APIError(
+                    "The bulk response has %d items for %d sent." % (len(items), len(chunk)),
+                    response.status_code, response.headers
+                )
+            for (i, _), item in zip(chunk, items):
+                results[i] = self._bulk_item(item, response)
+        except Exception as e:
+            for i, _ in chunk:
+                results[i] = e
+        return True
+
+    async def _send_one(self, index: int, payload: dict, results: list, timeout: int):
+        try:
+            response = await self._client.request(
+                "POST", self.base_path, data=payload, timeout=timeout, compress=True
+            )
+            results[index] = self.from_response(response)
+        except Exception as e:
+            results[index] = e
+
+    async def _create_many(self, 
+                           payloads: list, 
+                           chunk_size: int = 100, 
+                           max_concurrency: int = None, 
+                           timeout: int = 60000) -> list:
+        if chunk_size <= 0:
+            raise ValueError("Chunk size should be at least one (1).")
+        results = list(payloads)
+        pending = [(i, payload) for i, payload in enumerate(payloads)
+                   if not isinstance(payload, Exception)]
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        while chunks and self._bulk is None:
+            if await self._send_bulk(chunks[0], results, timeout):
+                chunks = chunks[1:]
+        # The client bounds the concurrency of its requests as well.
+        semaphore = asyncio.Semaphore(max_concurrency or self._client.http_client.max_concurrency)
+
+        async def bounded(call):
+            async with semaphore:
+                await call
+
+        if self._bulk:
+            calls = [self._send_bulk(chunk, results, timeout) for chunk in chunks]
+        else:
+            calls = [self._send_one(i, payload, results, timeout)
+                     for chunk in chunks for i, payload in chunk]
+        await asyncio.gather(*(bounded(call) for call in calls))
+        return results
+
+    async def update(self, 
+                     id:str, 
+                     data: dict = {}, 
+                     additional_headers: dict = {}, 
+                     timeout=5000):
+        path = "%s/%s" % (self.base_path, id)
+        response = await self._client.request(
+            "PATCH", path, data=data, 
+            additional_headers=additional_headers, timeout=timeout
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        return self.from_response(response)
+
+    async def delete(self, id: str):
+        path = "%s/%s" % (self.base_path, id)
+        response = await self._client.request("DELETE", path)
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
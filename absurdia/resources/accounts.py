@@ -1,15 +1,18 @@
 from absurdia.absurdia_object import AbsurdiaObject, AbsurdiaObjectsList
 from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
-from absurdia.resources import ResourceRequestor
+from absurdia.resources import AsyncResourceRequestor, ResourceRequestor
 
 class AccountsList(AbsurdiaObjectsList):
-    def __init__(self, response: APIResponse):
-        super().__init__(objects=response.json["data"], response=response)
+    def __init__(self, response: APIResponse, requestor=None, object_class: type = None):
+        super().__init__(
+            objects=response.json["data"], response=response,
+            requestor=requestor, object_class=object_class or Account
+        )
         
 class Account(AbsurdiaObject):
-    def __init__(self, response: APIResponse):
-        super().__init__(response=response)
+    def __init__(self, response: APIResponse = None, requestor=None, values: dict = None):
+        super().__init__(values=values or {}, response=response, requestor=requestor)
 
 class AccountsRequestor(ResourceRequestor):
     @property
@@ -20,11 +23,17 @@ class AccountsRequestor(ResourceRequestor):
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
         if is_list:
-            return AccountsList(response=response)
+            return AccountsList(response, requestor=self)
         else:
-            return Account(response)
+            return Account(response, requestor=self)
     
     def current(self) -> Account:
         path = "%s?current=true" % (self.base_path,)
         response = self._client.request("GET", path)
-        return self.from_response(response)
\ No newline at end of file
+        return self.from_response(response)
+
+class AsyncAccountsRequestor(AsyncResourceRequestor, AccountsRequestor):
+    async def current(self) -> Account:
+        path = "%s?current=true" % (self.base_path,)
+        response = await self._client.request("GET", path)
+        return self.from_response(response)
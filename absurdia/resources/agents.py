@@ -1,15 +1,18 @@
 from absurdia.absurdia_object import AbsurdiaObject, AbsurdiaObjectsList
 from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
-from absurdia.resources import ResourceRequestor
+from absurdia.resources import AsyncResourceRequestor, ResourceRequestor
 
 class AgentsList(AbsurdiaObjectsList):
-    def __init__(self, response: APIResponse):
-        super().__init__(objects=response.json["data"], response=response)
+    def __init__(self, response: APIResponse, requestor=None, object_class: type = None):
+        super().__init__(
+            objects=response.json["data"], response=response,
+            requestor=requestor, object_class=object_class or Agent
+        )
         
 class Agent(AbsurdiaObject):
-    def __init__(self, response: APIResponse):
-        super().__init__(response=response)
+    def __init__(self, response: APIResponse = None, requestor=None, values: dict = None):
+        super().__init__(values=values or {}, response=response, requestor=requestor)
 
 class AgentsRequestor(ResourceRequestor):
     
@@ -21,11 +24,18 @@ class AgentsRequestor(ResourceRequestor):
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
         if is_list:
-            return AgentsList(response)
+            return AgentsList(response, requestor=self)
         else:
-            return Agent(response)
+            return Agent(response, requestor=self)
     
     def current(self) -> Agent: 
         path = "%s/%s" % (self.base_path,self._client.agent)
         response = self._client.request("GET", path)
-        return self.from_response(response)   
+        return self.from_response(response)
+
+
+class AsyncAgentsRequestor(AsyncResourceRequestor, AgentsRequestor):
+    async def current(self) -> Agent:
+        path = "%s/%s" % (self.base_path,self._client.agent)
+        response = await self._client.request("GET", path)
+        return self.from_response(response)
@@ -1,9 +1,124 @@
 from logging import warning
+from absurdia import columnar, json_backend
 from absurdia.absurdia_object import AbsurdiaObject, AbsurdiaObjectsList
 from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
-from absurdia.resources import ResourceRequestor
-from absurdia.util import get_host_info
+from absurdia.resources import AsyncResourceRequestor, ResourceRequestor, build_payloads
+from absurdia.util import dump, get_host_info
+
+def _create_data(
+        start_date: int,
+        end_date: int,
+        timeframe: str,
+        strategy_id: str = None,
+        strategy_name: str = None,
+        name: str = None,
+        description: str = None, 
+        metadata: dict = None,
+        is_public: bool = False,
+        initial_balance: float = 1000.0,
+        quote_currency: str = "USD",
+        symbols: list = None,
+        venues: list = None,
+        stop_loss_ratio: float = None,
+        epsilon: float = 0.01,
+        markets_change: float = None,
+        configs: dict = None,
+        framework_name: str = None,
+        framework_version: str = None
+    ) -> dict:
+    data = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "timeframe": timeframe,
+        "initial_balance": initial_balance,
+        "is_public": is_public,
+        "host": get_host_info()
+    }
+    if strategy_id is None and strategy_name is None:
+        raise ValueError("Either `strategy_id` or `strategy_name` must be provided.")
+    if strategy_id:
+        data["strategy_id"] = strategy_id
+    if strategy_name:
+        data["strategy_name"] = strategy_name
+    if name: data["name"] = name
+    if description: data["description"] = description
+    if metadata: data["metadata"] = metadata
+    if quote_currency: data["quote_currency"] = quote_currency
+    if symbols: data["symbols"] = symbols
+    if venues: data["venues"] = venues
+    if stop_loss_ratio: data["stop_loss_ratio"] = stop_loss_ratio
+    if epsilon: data["epsilon"] = epsilon
+    if markets_change: data["markets_change"] = markets_change
+    if configs: data["configs"] = configs
+    if framework_name: 
+        data["framework"] = { 
+            "name": framework_name,
+            "version": framework_version
+        }
+    return data
+
+def _import_freqtrade_data(
+        result: any,
+        name: str = None,
+        cli_command: str = None,
+        host: dict = None,
+        profile: dict = None
+    ) -> dict:
+    data = {
+        "adapter": "freqtrade",
+        "data": result
+    }
+    try:
+        from freqtrade import __version__
+        data["framework"] = {
+            "name" : "freqtrade",
+            "version": __version__
+        }
+    except ImportError:
+        warning(
+            "Cannot import `freqtrade`. "
+            "The version of the library will be set at 0.0.0."
+        )
+        data["framework"] = {
+            "name": "freqtrade",
+            "version": "0.0.0"
+        }
+    
+    if host:
+        data["host"] = host
+    else:
+        data["host"] = get_host_info()
+    if profile:
+        data["profile"] = profile
+    if name:
+        data["name"] = name
+    if cli_command:
+        data["cli_command"] = cli_command
+    return data
+
+def _import_freqtrade_body(
+        chunks,
+        name: str = None,
+        cli_command: str = None,
+        host: dict = None,
+        profile: dict = None
+    ):
+    """
+    Returns the request body of `import_freqtrade_stream`: a function
+    returning the JSON bytes chunks of the import, `chunks` included, if
+    `chunks` is a function, or else the chunks themselves.
+    """
+    data = _import_freqtrade_data(None, name, cli_command, host, profile)
+    del data["data"]
+    envelope = dump(data)
+
+    def body():
+        yield envelope[:-1].encode("utf-8") + b',"data":'
+        yield from (chunks() if callable(chunks) else chunks)
+        yield b'}'
+
+    return body if callable(chunks) else body()
 
 class BacktestsRequestor(ResourceRequestor): 
     @property
@@ -14,9 +129,9 @@ class BacktestsRequestor(ResourceRequestor):
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
         if is_list:
-            return BacktestsList(response)
+            return BacktestsList(response, requestor=self)
         else:
-            return Backtest(response)
+            return Backtest(response, requestor=self)
     
     def create(
             self, 
@@ -40,39 +155,46 @@ class BacktestsRequestor(ResourceRequestor):
             framework_name: str = None,
             framework_version: str = None
         ):
-        data = {
-            "start_date": start_date,
-            "end_date": end_date,
-            "timeframe": timeframe,
-            "initial_balance": initial_balance,
-            "is_public": is_public,
-            "host": get_host_info()
-        }
-        if strategy_id is None and strategy_name is None:
-            raise ValueError("Either `strategy_id` or `strategy_name` must be provided.")
-        if strategy_id:
-            data["strategy_id"] = strategy_id
-        if strategy_name:
-            data["strategy_name"] = strategy_name
-        if name: data["name"] = name
-        if description: data["description"] = description
-        if metadata: data["metadata"] = metadata
-        if quote_currency: data["quote_currency"] = quote_currency
-        if symbols: data["symbols"] = symbols
-        if venues: data["venues"] = venues
-        if stop_loss_ratio: data["stop_loss_ratio"] = stop_loss_ratio
-        if epsilon: data["epsilon"] = epsilon
-        if markets_change: data["markets_change"] = markets_change
-        if configs: data["configs"] = configs
-        if framework_name: 
-            data["framework"] = { 
-                "name": framework_name,
-                "version": framework_version
-            }
-
+        data = _create_data(
+            start_date, end_date, timeframe,
+            strategy_id=strategy_id, strategy_name=strategy_name,
+            name=name, description=description, metadata=metadata,
+            is_public=is_public, initial_balance=initial_balance,
+            quote_currency=quote_currency, symbols=symbols, venues=venues,
+            stop_loss_ratio=stop_loss_ratio, epsilon=epsilon,
+            markets_change=markets_change, configs=configs,
+            framework_name=framework_name, framework_version=framework_version
+        )
+        spool = getattr(self._client, "spool", None)
+        if spool is not None:
+            # Returns a backtest with a temporary identifier.
+            return spool.create_backtest_data(data)
         response = self._client.request(
-            "POST", self.base_path, data=data)
+            "POST", self.base_path, data=data, compress=True)
         return self.from_response(response)
+
+    def create_many(self, 
+                    items: list, 
+                    chunk_size: int = 100, 
+                    max_concurrency: int = None):
+        """
+        Creates many backtests, e.g. for a sweep of hyperparameters, with
+        the bulk endpoint of the API when it has one, or else with concurrent
+        requests on the pool of the client.
+        :param list items: Dicts of the arguments of `create`
+        :param int chunk_size: Number of backtests per bulk request
+        :param int max_concurrency: Maximum number of requests in flight at once
+        :returns: The created `Backtest`, or the exception raised creating it,
+                  for each item in order. With the `AsyncClient`, a coroutine of it.
+        """
+        payloads = build_payloads(_create_data, items)
+        spool = getattr(self._client, "spool", None)
+        if spool is not None:
+            return [
+                payload if isinstance(payload, Exception) else spool.create_backtest_data(payload)
+                for payload in payloads
+            ]
+        return self._create_many(payloads, chunk_size, max_concurrency)
     
     def import_freqtrade(
         self, 
@@ -80,72 +202,226 @@ class BacktestsRequestor(ResourceRequestor):
         name: str = None,
         cli_command: str = None,
         host: dict = None, 
+        profile: dict = None,
     ):
-        data = {
-            "adapter": "freqtrade",
-            "data": result
-        }
-        try:
-            from freqtrade import __version__
-            data["framework"] = {
-                "name" : "freqtrade",
-                "version": __version__
-            }
-        except ImportError:
-            warning(
-                "Cannot import `freqtrade`. "
-                "The version of the library will be set at 0.0.0."
-            )
-            data["framework"] = {
-                "name": "freqtrade",
-                "version": "0.0.0"
-            }
-        
-        if host:
-            data["host"] = host
-        else:
-            data["host"] = get_host_info()
-        if name:
-            data["name"] = name
-        if cli_command:
-            data["cli_command"] = cli_command
-        
+        """
+        :param profile: Resource usage of the backtest run, as returned by
+                        `absurdia.profiling.ProcessProfiler.summary()`
+        """
+        data = _import_freqtrade_data(result, name, cli_command, host, profile)
+        spool = getattr(self._client, "spool", None)
+        if spool is not None:
+            ref = spool.import_body(json_backend.dumps(data))
+            return Backtest(values={"id": ref, "status": "spooled"}, requestor=self)
+        path = "%s/import" % (self.base_path,)
+        response = self._client.request(
+            "POST", path, data=data, timeout=60000, compress=True
+        )
+        return self.from_response(response)
+    
+    def import_freqtrade_stream(
+        self, 
+        chunks,
+        name: str = None,
+        cli_command: str = None,
+        host: dict = None, 
+        profile: dict = None,
+    ):
+        """
+        Same as `import_freqtrade` for an export given as an iterable of
+        JSON bytes chunks, such as the content of the export file. The
+        chunks are streamed to the API as they are read. Pass a function
+        returning the chunks instead to allow the upload to be retried.
+        With a spool, the chunks are written to it instead.
+        """
+        body = _import_freqtrade_body(chunks, name, cli_command, host, profile)
+        spool = getattr(self._client, "spool", None)
+        if spool is not None:
+            ref = spool.import_body(b"".join(body() if callable(body) else body))
+            return Backtest(values={"id": ref, "status": "spooled"}, requestor=self)
         path = "%s/import" % (self.base_path,)
         response = self._client.request(
-            "POST", path, data=data, timeout=60000
+            "POST", path, body=body, timeout=60000, compress=True
         )
         return self.from_response(response)
     
 class BacktestsList(AbsurdiaObjectsList):
-    def __init__(self, response: APIResponse):
-        super().__init__(objects=response.json["data"], response=response)
+    def __init__(self, response: APIResponse, requestor=None, object_class: type = None):
+        super().__init__(
+            objects=response.json["data"], response=response,
+            requestor=requestor, object_class=object_class or Backtest
+        )
         
 class Backtest(AbsurdiaObject):
-    def __init__(self, response: APIResponse):
-        super().__init__(response=response)
+    def __init__(self, response: APIResponse = None, requestor=None, values: dict = None):
+        super().__init__(values=values or {}, response=response, requestor=requestor)
         
     def add_positions(self, positions: list):
+        spool = getattr(self._requestor._client, "spool", None)
+        if spool is not None:
+            # Returns as soon as the positions are on disk.
+            spool.add_positions(self.id, positions)
+            return
         data = { "positions": positions }
-        url = "%s/%s/positions" % (self.base_path, self.id)
-        response = self._client.request("POST", url, data=data)
+        url = "%s/%s/positions" % (self._requestor.base_path, self.id)
+        response = self._requestor._client.request(
+            "POST", url, data=data, compress=True
+        )
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
     
     def add_position(self, position: dict):
         return self.add_positions([position])
     
+    def writer(self, **kwargs):
+        """
+        Returns a `PositionWriter` uploading positions of this backtest in
+        batches from a background thread. Use it as a context manager to
+        flush the remaining positions on exit.
+        """
+        from absurdia.position_writer import PositionWriter
+        return PositionWriter(self, **kwargs)
+    
     def finish(self):
-        url = "%s/%s" % (self.base_path, self.id)
+        spool = getattr(self._requestor._client, "spool", None)
+        if spool is not None:
+            # Sent after the positions spooled before.
+            spool.finish_backtest(self.id)
+            return
+        url = "%s/%s" % (self._requestor.base_path, self.id)
+        data = { "status": "finished" }
+        response = self._requestor._client.request("PATCH", url, data=data)
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        self.__init__(response, self._requestor)
+        
+    def positions(self, format: str = None):
+        """
+        Returns the positions of the backtest, as a list of dicts by default.
+        :param str format: Return columns instead, as "numpy" (dict of arrays),
+                           "pandas" (DataFrame) or "arrow" (Table). Rows are
+                           decoded straight into typed columns.
+        """
+        url = "%s/%s/positions" % (self._requestor.base_path, self.id)
+        response = self._requestor._client.request("GET", url)
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        if format:
+            return columnar.convert(response.text, format)
+        return response.json["data"]
+
+
+class AsyncBacktestsRequestor(AsyncResourceRequestor, BacktestsRequestor):
+    def from_response(self, response: APIResponse, is_list: bool = False):
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        if is_list:
+            return BacktestsList(response, requestor=self, object_class=AsyncBacktest)
+        else:
+            return AsyncBacktest(response, requestor=self)
+
+    async def create(
+            self, 
+            start_date: int,
+            end_date: int,
+            timeframe: str,
+            strategy_id: str = None,
+            strategy_name: str = None,
+            name: str = None,
+            description: str = None, 
+            metadata: dict = None,
+            is_public: bool = False,
+            initial_balance: float = 1000.0,
+            quote_currency: str = "USD",
+            symbols: list = None,
+            venues: list = None,
+            stop_loss_ratio: float = None,
+            epsilon: float = 0.01,
+            markets_change: float = None,
+            configs: dict = None,
+            framework_name: str = None,
+            framework_version: str = None
+        ):
+        data = _create_data(
+            start_date, end_date, timeframe,
+            strategy_id=strategy_id, strategy_name=strategy_name,
+            name=name, description=description, metadata=metadata,
+            is_public=is_public, initial_balance=initial_balance,
+            quote_currency=quote_currency, symbols=symbols, venues=venues,
+            stop_loss_ratio=stop_loss_ratio, epsilon=epsilon,
+            markets_change=markets_change, configs=configs,
+            framework_name=framework_name, framework_version=framework_version
+        )
+        response = await self._client.request(
+            "POST", self.base_path, data=data, compress=True)
+        return self.from_response(response)
+
+    async def import_freqtrade(
+        self, 
+        result: any,
+        name: str = None,
+        cli_command: str = None,
+        host: dict = None, 
+        profile: dict = None,
+    ):
+        """
+        :param profile: Resource usage of the backtest run, as returned by
+                        `absurdia.profiling.ProcessProfiler.summary()`
+        """
+        data = _import_freqtrade_data(result, name, cli_command, host, profile)
+        path = "%s/import" % (self.base_path,)
+        response = await self._client.request(
+            "POST", path, data=data, timeout=60000, compress=True
+        )
+        return self.from_response(response)
+
+    async def import_freqtrade_stream(
+        self, 
+        chunks,
+        name: str = None,
+        cli_command: str = None,
+        host: dict = None, 
+        profile: dict = None,
+    ):
+        """
+        Same as `import_freqtrade` for an export given as an iterable of
+        JSON bytes chunks. The chunks are read into memory before the
+        upload so that it can be retried.
+        """
+        body = _import_freqtrade_body(chunks, name, cli_command, host, profile)
+        path = "%s/import" % (self.base_path,)
+        response = await self._client.request(
+            "POST", path, body=body, timeout=60000, compress=True
+        )
+        return self.from_response(response)
+
+
+class AsyncBacktest(Backtest):
+    async def add_positions(self, positions: list):
+        data = { "positions": positions }
+        url = "%s/%s/positions" % (self._requestor.base_path, self.id)
+        response = await self._requestor._client.request(
+            "POST", url, data=data, compress=True
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+    
+    async def add_position(self, position: dict):
+        return await self.add_positions([position])
+    
+    async def finish(self):
+        url = "%s/%s" % (self._requestor.base_path, self.id)
         data = { "status": "finished" }
-        response = self._client.request("PATCH", url, data=data)
+        response = await self._requestor._client.request("PATCH", url, data=data)
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
-        self.__init__(self, response)
+        self.__init__(response, self._requestor)
         
-    def positions(self):
-        url = "%s/%s/positions" % (self.base_path, self.id)
-        response = self._client.request("GET", url)
+    async def positions(self, format: str = None):
+        url = "%s/%s/positions" % (self._requestor.base_path, self.id)
+        response = await self._requestor._client.request("GET", url)
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
+        if format:
+            return columnar.convert(response.text, format)
         return response.json["data"]
-    
\ No newline at end of file
@@ -1,7 +1,13 @@
 from absurdia.absurdia_object import AbsurdiaObject, AbsurdiaObjectsList
 from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
-from absurdia.resources import ResourceRequestor
+from absurdia.resources import AsyncResourceRequestor, ResourceRequestor, build_payloads
+
+def _create_data(name: str, description: str = None, metadata: dict = None) -> dict:
+    data = { "name": name }
+    if description: data["description"] = description
+    if metadata: data["metadata"] = metadata
+    return data
 
 class StrategiesRequestor(ResourceRequestor): 
     @property
@@ -12,23 +18,50 @@ class StrategiesRequestor(ResourceRequestor):
         if not response.ok:
             raise APIError(response.text, response.status_code, response.headers)
         if is_list:
-            return StrategiesList(response)
+            return StrategiesList(response, requestor=self)
         else:
-            return Strategy(response)
+            return Strategy(response, requestor=self)
         
     def create(self, name: str, description: str = None, metadata: dict = None):
-        data = { "name": name }
-        if description: data["description"] = description
-        if metadata: data["metadata"] = metadata
-
-        response = self._client.request("POST", self.base_path, data=data)
+        data = _create_data(name, description, metadata)
+        response = self._client.request(
+            "POST", self.base_path, data=data, compress=True
+        )
         return self.from_response(response)
+
+    def create_many(self, 
+                    items: list, 
+                    chunk_size: int = 100, 
+                    max_concurrency: int = None):
+        """
+        Creates many strategies, with the bulk endpoint of the API when it
+        has one, or else with concurrent requests on the pool of the client.
+        :param list items: Dicts of the arguments of `create`
+        :param int chunk_size: Number of strategies per bulk request
+        :param int max_concurrency: Maximum number of requests in flight at once
+        :returns: The created `Strategy`, or the exception raised creating it,
+                  for each item in order. With the `AsyncClient`, a coroutine of it.
+        """
+        return self._create_many(
+            build_payloads(_create_data, items), chunk_size, max_concurrency
+        )
         
 class StrategiesList(AbsurdiaObjectsList):
-    def __init__(self, response: APIResponse):
-        super().__init__(objects=response.json["data"], response=response)
+    def __init__(self, response: APIResponse, requestor=None, object_class: type = None):
+        super().__init__(
+            objects=response.json["data"], response=response,
+            requestor=requestor, object_class=object_class or Strategy
+        )
         
 class Strategy(AbsurdiaObject):
-    def __init__(self, response: APIResponse):
-        super().__init__(response=response)
-    
\ No newline at end of file
+    def __init__(self, response: APIResponse = None, requestor=None, values: dict = None):
+        super().__init__(values=values or {}, response=response, requestor=requestor)
+
+
+class AsyncStrategiesRequestor(AsyncResourceRequestor, StrategiesRequestor):
+    async def create(self, name: str, description: str = None, metadata: dict = None):
+        data = _create_data(name, description, metadata)
+        response = await self._client.request(
+            "POST", self.base_path, data=data, compress=True
+        )
+        return self.from_response(response)
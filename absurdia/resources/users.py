@@ -1,12 +1,12 @@
 from absurdia.absurdia_object import AbsurdiaObject
 from absurdia.api_error import APIError
 from absurdia.api_response import APIResponse
-from absurdia.resources import ResourceRequestor
+from absurdia.resources import AsyncResourceRequestor, ResourceRequestor
 
 
 class User(AbsurdiaObject):
-    def __init__(self, response: APIResponse):
-        super().__init__(response=response)
+    def __init__(self, response: APIResponse, requestor=None):
+        super().__init__(response=response, requestor=requestor)
 
 class UsersRequestor(ResourceRequestor):
     
@@ -19,14 +19,24 @@ class UsersRequestor(ResourceRequestor):
             raise APIError(response.text, response.status_code, response.headers)
         
         if is_list:
-            return NotImplementedError("Users lists are not supported yet.")
+            raise NotImplementedError("Users lists are not supported yet.")
         else:
-            return User(response)
+            return User(response, requestor=self)
         
     def list(self, params: dict = { "limit": 100 }, additional_headers: dict = {}):
-        return NotImplementedError("This method is not allowed for the resource Users.")
+        raise NotImplementedError("This method is not allowed for the resource Users.")
     
     def current(self) -> User:
         path = "%s" % (self.base_path,)
         response = self._client.request("GET", path)
         return self.from_response(response)
+
+
+class AsyncUsersRequestor(AsyncResourceRequestor, UsersRequestor):
+    async def list(self, params: dict = { "limit": 100 }, additional_headers: dict = {}):
+        raise NotImplementedError("This method is not allowed for the resource Users.")
+    
+    async def current(self) -> User:
+        path = "%s" % (self.base_path,)
+        response = await self._client.request("GET", path)
+        return self.from_response(response)
@@ -0,0 +1,107 @@
+import base64
+import time
+
+from absurdia import json_backend
+
+# Header carrying the signature of a request body.
+SIGNATURE_HEADER = "Abs-Signature"
+
+
+def load_key(signature_key: str):
+    """ Returns the Ed25519 private key encoded in base64 in `signature_key`. """
+    try:
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    except ImportError:
+        raise ImportError(
+            "`cryptography` is required to sign requests. "
+            "Install with `pip install cryptography`"
+        )
+    return Ed25519PrivateKey.from_private_bytes(base64.b64decode(signature_key))
+
+
+def canonical(payload) -> bytes:
+    """ Returns the bytes of `payload` that are both signed and sent: compact UTF-8 JSON. """
+    if payload is None:
+        return b""
+    return json_backend.dumps(payload)
+
+
+class Signer():
+    """
+    Signs request bodies with the Ed25519 key of an agent. The signature
+    covers "<timestamp>.<body>", with the timestamp in microseconds, and is
+    sent as `Abs-Signature: t=<timestamp>,s=<signature>`. The key is parsed
+    once, when the signer is created.
+    """
+
+    def __init__(self, key):
+        """
+        :param key: Signature key of the agent, in base64, or an already
+                    loaded `Ed25519PrivateKey`
+        """
+        self.key = load_key(key) if isinstance(key, str) else key
+
+    def sign(self, body: bytes, timestamp: int = None) -> str:
+        """ Returns the value of the signature header of `body`. """
+        if timestamp is None:
+            timestamp = time.time_ns() // 1000
+        signature = self.key.sign(b"%d.%s" % (timestamp, body))
+        encoded = base64.urlsafe_b64encode(signature).rstrip(b"=").decode()
+        return "t=%d,s=%s" % (timestamp, encoded)
+
+
+class BatchSigner():
+    """
+    Gathers many payloads into one body, a JSON array, signed once. The
+    signature and timestamp are then paid for once per batch instead of
+    once per payload. Each payload is encoded when it is added, and the
+    body is made by joining the encoded payloads.
+
+        batch = BatchSigner(client.signer)
+        for payload in payloads:
+            if batch.add(payload):
+                client.request("POST", path, body=batch.body(),
+                               additional_headers=batch.headers())
+                batch.clear()
+    """
+
+    def __init__(self, signer: Signer, max_payloads: int = 1000, max_bytes: int = 1000000):
+        """
+        :param Signer signer: Signer of the batches
+        :param int max_payloads: Number of payloads making a full batch
+        :param int max_bytes: Size of the encoded payloads making a full batch
+        """
+        self.signer = signer
+        self.max_payloads = max_payloads
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def __len__(self):
+        return len(self._parts)
+
+    def add(self, payload) -> bool:
+        """ Adds a payload to the batch. Returns True once the batch is full. """
+        part = canonical(payload)
+        self._parts.append(part)
+        self._size += len(part) + 1
+        self._body = None
+        return self.full
+
+    @property
+    def full(self) -> bool:
+        return len(self._parts) >= self.max_payloads or self._size >= self.max_bytes
+
+    def body(self) -> bytes:
+        """ Returns the body of the batch, a JSON array of the payloads. """
+        if self._body is None:
+            self._body = b"[" + b",".join(self._parts) + b"]"
+        return self._body
+
+    def headers(self) -> dict:
+        """ Returns the signature header of the body of the batch. """
+        return {SIGNATURE_HEADER: self.signer.sign(self.body())}
+
+    def clear(self):
+        self._parts = []
+        self._size = 1
+        self._body = None
@@ -0,0 +1,456 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from absurdia import json_backend
+from absurdia.api_error import APIError
+from absurdia.util import saved_agent_path
+
+_logger = logging.getLogger('absurdia.spool')
+
+# Next to the saved agent credentials.
+DEFAULT_PATH = os.path.join(os.path.dirname(saved_agent_path), "spool.db")
+
+# Prefix of the identifiers given to backtests before they reach the API.
+REF_PREFIX = "spooled_"
+
+# A flusher holds the lease of a spool for this long, in seconds, and
+# renews it on every round. Another process takes over once it expires.
+LEASE_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    ref TEXT,
+    target TEXT,
+    body BLOB NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL,
+    batch TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS refs (
+    ref TEXT PRIMARY KEY,
+    id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    # The write-ahead log makes a write one append. Without a sync per write,
+    # a committed write survives the crash of its process, not of the host.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def _retryable(error: Exception) -> bool:
+    """ Whether sending an entry again may succeed: network errors, 429s and 5xx. """
+    if isinstance(error, APIError):
+        return error.http_status is None or error.http_status == 429 or error.http_status >= 500
+    return True
+
+
+class Spool():
+    """
+    Write-ahead spool of uploads, in an SQLite file. Writes are appended to
+    the file and return within microseconds, whether the API is slow or
+    unreachable, and survive the crash or restart of the process. A
+    background flusher sends them to the API in the order they were written,
+    merging consecutive positions of a backtest into one request.
+
+        client = Client(spool=True)
+        backtest = client.spool.create_backtest(start, end, "5m", strategy_name="MR")
+        backtest.add_positions(positions)  # Spooled as well
+
+    An upload is retried with the same idempotency key until the API accepts
+    it, so a crash after a request was sent does not duplicate it. Uploads
+    rejected by the API are kept aside as failed, and the next ones go on.
+    Backtests created through the spool get a temporary identifier, replaced
+    by the identifier of the API when their positions are sent or they are
+    finished.
+    """
+
+    def __init__(self,
+                 client=None,
+                 path: str = None,
+                 max_batch_size: int = 1000,
+                 flush_interval: float = 1.0,
+                 max_backoff: float = 60.0):
+        """
+        :param Client client: Client sending the uploads. Only needed to flush.
+        :param str path: Path of the spool file. Defaults to `~/.absurdia/spool.db`.
+        :param int max_batch_size: Maximum number of positions per request
+        :param float flush_interval: Time between two flushes of the background
+                                     flusher, in seconds
+        :param float max_backoff: Maximum time to wait before retrying after a
+                                  failed flush, in seconds
+        """
+        self.client = client
+        self.path = path or DEFAULT_PATH
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self.owner = "%d-%s" % (os.getpid(), uuid.uuid4().hex[:8])
+
+        self._connection = _connect(self.path)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher = None
+        self._flush_lock = threading.Lock()
+
+    # Writes
+
+    def _append(self, kind: str, body: bytes, ref: str = None, target: str = None,
+                count: int = 1) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO entries (kind, ref, target, body, count, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, ref, target, body, count, time.time())
+            )
+        return cursor.lastrowid
+
+    def add_positions(self, backtest, positions: list) -> int:
+        """
+        Spools positions of a backtest. Returns the sequence number of the entry.
+        :param backtest: The backtest, or its identifier, spooled or not
+        """
+        target = backtest if isinstance(backtest, str) else backtest.id
+        return self._append(
+            "positions", json_backend.dumps(positions), target=target, count=len(positions)
+        )
+
+    def finish_backtest(self, backtest) -> int:
+        """
+        Spools the end of a backtest, sent once the entries spooled before
+        it, e.g. its positions, are sent. Returns the sequence number of the entry.
+        :param backtest: The backtest, or its identifier, spooled or not
+        """
+        target = backtest if isinstance(backtest, str) else backtest.id
+        return self._append("finish", json_backend.dumps({"status": "finished"}), target=target)
+
+    def create_backtest(self, *args, **kwargs):
+        """
+        Spools the creation of a backtest, with the arguments of
+        `client.backtests.create`. Returns a `Backtest` with a temporary
+        identifier, whose positions are spooled as well.
+        """
+        from absurdia.resources.backtests import _create_data
+        return self.create_backtest_data(_create_data(*args, **kwargs))
+
+    def create_backtest_data(self, data: dict):
+        """ Spools the creation of a backtest from its request body. Returns the `Backtest`. """
+        from absurdia.resources.backtests import Backtest
+        ref = REF_PREFIX + uuid.uuid4().hex
+        self._append("backtest", json_backend.dumps(data), ref=ref)
+        return Backtest(
+            values=dict(data, id=ref, status="spooled"),
+            requestor=self.client.backtests if self.client is not None else None
+        )
+
+    def import_freqtrade(self, result, name: str = None, cli_command: str = None,
+                         host: dict = None, profile: dict = None) -> str:
+        """
+        Spools the import of a Freqtrade backtest, with the arguments of
+        `client.backtests.import_freqtrade`. Returns the temporary identifier
+        of the backtest.
+        """
+        from absurdia.resources.backtests import _import_freqtrade_data
+        data = _import_freqtrade_data(result, name, cli_command, host, profile)
+        return self.import_body(json_backend.dumps(data))
+
+    def import_body(self, body: bytes) -> str:
+        """ Spools an import from its encoded JSON body. Returns the temporary identifier. """
+        ref = REF_PREFIX + uuid.uuid4().hex
+        self._append("import", body, ref=ref)
+        return ref
+
+    def resolve(self, id: str) -> str:
+        """ Returns the identifier given by the API to a spooled backtest, or None if not sent yet. """
+        if not id.startswith(REF_PREFIX):
+            return id
+        with self._lock:
+            row = self._connection.execute("SELECT id FROM refs WHERE ref = ?", (id,)).fetchone()
+        return row[0] if row else None
+
+    # Flushing
+
+    def _acquire_lease(self, connection: sqlite3.Connection) -> bool:
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT owner, expires FROM lease WHERE name = 'flusher'"
+            ).fetchone()
+            if row is not None and row[0] != self.owner and row[1] > now:
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO lease (name, owner, expires) VALUES ('flusher', ?, ?)",
+                (self.owner, now + LEASE_SECONDS)
+            )
+            return True
+        finally:
+            connection.execute("COMMIT")
+
+    def _release_lease(self, connection: sqlite3.Connection):
+        connection.execute(
+            "DELETE FROM lease WHERE name = 'flusher' AND owner = ?", (self.owner,)
+        )
+
+    def _next_batch(self, connection: sqlite3.Connection) -> list:
+        """
+        Returns the entries of the next request: those claimed by a previous
+        attempt, or else the oldest entry and the positions following it.
+        """
+        columns = "SELECT seq, kind, ref, target, body, batch, count FROM entries "
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            head = connection.execute(
+                columns + "WHERE failed = 0 ORDER BY seq LIMIT 1"
+            ).fetchone()
+            if head is None:
+                return []
+            if head[5] is not None:
+                return [row[:6] for row in connection.execute(
+                    columns + "WHERE batch = ? AND failed = 0 ORDER BY seq", (head[5],)
+                )]
+
+            batch = [head]
+            if head[1] == "positions":
+                count = head[6]
+                for row in connection.execute(
+                    columns + "WHERE seq > ? AND failed = 0 ORDER BY seq LIMIT ?",
+                    (head[0], self.max_batch_size)
+                ):
+                    if row[1] != "positions" or row[3] != head[3] \
+                    or count + row[6] > self.max_batch_size:
+                        break
+                    batch.append(row)
+                    count += row[6]
+            key = uuid.uuid4().hex
+            seqs = [row[0] for row in batch]
+            connection.execute(
+                "UPDATE entries SET batch = ? WHERE seq IN (%s)" % (",".join("?" * len(seqs)),),
+                [key] + seqs
+            )
+            return [row[:5] + (key,) for row in batch]
+        finally:
+            connection.execute("COMMIT")
+
+    def _target(self, connection: sqlite3.Connection, target: str) -> str:
+        if not target.startswith(REF_PREFIX):
+            return target
+        row = connection.execute("SELECT id FROM refs WHERE ref = ?", (target,)).fetchone()
+        if row is None:
+            raise APIError("Unknown spooled backtest %s, whose creation failed." % (target,), 404)
+        return row[0]
+
+    def _send(self, connection: sqlite3.Connection, batch: list):
+        """ Sends the entries of a batch in one request. Returns the identifier created, if any. """
+        seq, kind, ref, target, body, key = batch[0]
+        headers = {"Idempotency-Key": "spool-%s" % (key,)}
+        method = "POST"
+        if kind == "positions":
+            path = "/v1/backtests/%s/positions" % (self._target(connection, target),)
+            # Concatenates the JSON arrays of the entries without decoding them.
+            body = b'{"positions":[' + b",".join(
+                row[4][1:-1] for row in batch if len(row[4]) > 2
+            ) + b']}'
+        elif kind == "backtest":
+            path = "/v1/backtests"
+        elif kind == "import":
+            path = "/v1/backtests/import"
+        elif kind == "finish":
+            method = "PATCH"
+            path = "/v1/backtests/%s" % (self._target(connection, target),)
+        else:
+            raise APIError("Unknown kind of spooled entry: %s." % (kind,), 400)
+
+        response = self.client.request(
+            method, path, body=body, additional_headers=headers,
+            timeout=60000, compress=True
+        )
+        if not response.ok:
+            raise APIError(response.text, response.status_code, response.headers)
+        return response.json.get("data", {}).get("id") if ref else None
+
+    def flush_once(self) -> int:
+        """
+        Sends the next batch of entries. Returns the number of entries sent
+        or set aside as failed, 0 once the spool is empty. Raises the error
+        of a batch to retry later.
+        """
+        if self.client is None:
+            raise RuntimeError("A client is required to flush a spool.")
+        connection = self._flush_connection()
+        if not self._acquire_lease(connection):
+            return 0
+        batch = self._next_batch(connection)
+        if not batch:
+            return 0
+        seqs = [row[0] for row in batch]
+        marks = ",".join("?" * len(seqs))
+        try:
+            id = self._send(connection, batch)
+        except Exception as e:
+            failed = 0 if _retryable(e) else 1
+            connection.execute(
+                "UPDATE entries SET attempts = attempts + 1, error = ?, failed = ? "
+                "WHERE seq IN (%s)" % (marks,), [str(e)[:1000], failed] + seqs
+            )
+            if failed:
+                _logger.warning("Spooled %s upload rejected by the API: %s", batch[0][1], e)
+                return len(seqs)
+            raise
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if id is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO refs (ref, id) VALUES (?, ?)", (batch[0][2], id)
+                )
+            connection.execute("DELETE FROM entries WHERE seq IN (%s)" % (marks,), seqs)
+        finally:
+            connection.execute("COMMIT")
+        return len(seqs)
+
+    def flush(self, timeout: float = None) -> int:
+        """
+        Sends every entry in the spool, in order, from the calling thread.
+        Returns the number of entries sent or set aside as failed. Raises the error of the first
+        batch failing, or `TimeoutError` if `timeout` seconds pass.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sent = 0
+        with self._flush_lock:
+            try:
+                while True:
+                    count = self.flush_once()
+                    if not count:
+                        return sent
+                    sent += count
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise TimeoutError("%d entries sent, others are still spooled." % (sent,))
+            finally:
+                if self._flusher is None:
+                    # Lets the flusher of another process take over right away.
+                    self._release_lease(self._flush_connection())
+
+    def _flush_connection(self) -> sqlite3.Connection:
+        # Each thread flushing has its own connection.
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = _connect(self.path)
+        return connection
+
+    def start(self):
+        """ Starts the background flusher. """
+        if self._flusher is None:
+            self._stopped.clear()
+            self._flusher = threading.Thread(
+                target=self._run, name="absurdia-spool-flusher", daemon=True
+            )
+            self._flusher.start()
+        return self
+
+    def stop(self, flush: bool = True, timeout: float = None):
+        """
+        Stops the background flusher, after sending the entries spooled so
+        far if `flush`. Entries not sent stay in the spool for the next run.
+        """
+        if self._flusher is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._flusher.join()
+            self._flusher = None
+        if flush and self.client is not None:
+            try:
+                self.flush(timeout=timeout)
+            except Exception as e:
+                _logger.warning("Uploads left in the spool %s: %s", self.path, e)
+        self._release_lease(self._flush_connection())
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run(self):
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                with self._flush_lock:
+                    while not self._stopped.is_set() and self.flush_once():
+                        pass
+                failures = 0
+                delay = self.flush_interval
+            except Exception as e:
+                failures += 1
+                delay = min(self.flush_interval * 2 ** failures, self.max_backoff)
+                _logger.info("Spool flush failed, retrying in %.1fs: %s", delay, e)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    # Inspection
+
+    def status(self) -> dict:
+        """ Returns the number of pending and failed entries, by kind, and the oldest one's age. """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT kind, failed, COUNT(*), SUM(LENGTH(body)), MIN(created_at) "
+                "FROM entries GROUP BY kind, failed"
+            ).fetchall()
+            error = self._connection.execute(
+                "SELECT error FROM entries WHERE error IS NOT NULL ORDER BY seq DESC LIMIT 1"
+            ).fetchone()
+        status = {
+            "path": self.path,
+            "pending": 0,
+            "failed": 0,
+            "bytes": 0,
+            "by_kind": {},
+            "oldest_age_s": None,
+            "last_error": error[0] if error else None,
+        }
+        oldest = None
+        for kind, failed, count, size, created_at in rows:
+            status["failed" if failed else "pending"] += count
+            status["bytes"] += size or 0
+            counts = status["by_kind"].setdefault(kind, {"pending": 0, "failed": 0})
+            counts["failed" if failed else "pending"] += count
+            if not failed:
+                oldest = created_at if oldest is None else min(oldest, created_at)
+        if oldest is not None:
+            status["oldest_age_s"] = time.time() - oldest
+        return status
+
+    def retry_failed(self) -> int:
+        """ Puts the failed entries back in the queue. Returns their number. """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE entries SET failed = 0, batch = NULL WHERE failed = 1"
+            )
+        return cursor.rowcount
+
+    def close(self):
+        self.stop(flush=False)
+        self._connection.close()
@@ -0,0 +1,490 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from absurdia import compression, json_backend
+from absurdia.clients.instrumentation import endpoint_template
+
+# Prefixes of the identifiers of the objects created by the server.
+_ID_PREFIXES = {
+    "accounts": "acc",
+    "agents": "agt",
+    "strategies": "str",
+    "backtests": "bt",
+}
+
+# Number of idempotency keys whose response is kept, the most recently used.
+MAX_IDEMPOTENCY_KEYS = 10000
+
+# Headers of a recorded response which do not apply once it is replayed.
+_HOP_HEADERS = ("connection", "content-encoding", "content-length",
+                "keep-alive", "transfer-encoding")
+
+
+def _new_id(resource: str) -> str:
+    return "%s_%s" % (_ID_PREFIXES[resource], uuid.uuid4().hex[:24])
+
+
+def _merge(target: dict, patch: dict):
+    """ Merges `patch` into `target` in place. Nested dicts are merged and "" unsets a key. """
+    for key, value in patch.items():
+        if value == "":
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class _Response():
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(self, status: int, body: bytes, headers: dict = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def _json(status: int, payload, headers: dict = None) -> _Response:
+    return _Response(status, json_backend.dumps(payload), headers)
+
+
+def _error(status: int, type: str, message: str, headers: dict = None) -> _Response:
+    return _json(status, {"error": {"type": type, "message": message}}, headers)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keeps connections alive, as the API does.
+    protocol_version = "HTTP/1.1"
+    # Responses are written at once, flushed after each request, and sent
+    # without waiting on the ACK of the previous segment.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    # Trailers, up to the empty line.
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        return compression.decompress(body, self.headers.get("Content-Encoding"))
+
+    def _handle(self):
+        response = self.server.stand_in.handle(
+            self.command, self.path, self.headers, self._body()
+        )
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response.body)))
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients connect at once in benchmarks.
+    request_queue_size = 128
+
+
+class LocalServer():
+    """
+    Stand-in for the Absurdia API, served from a background thread, to run
+    code using the SDK offline: tests, throughput benchmarks and retry
+    behaviour under errors. It keeps accounts, agents, strategies and
+    backtests in memory, positions and Freqtrade imports included, and can
+    delay, fail or throttle requests on demand.
+
+        with LocalServer(latency=0.005, error_rate=0.01) as server:
+            client = Client(token, api_base=server.url)
+            strategy = client.strategies.create("Mean reversion")
+
+    With `record` and `upstream`, requests are forwarded to a real API and
+    its responses saved. With `replay`, saved responses are served again,
+    in the order they were recorded, before falling back to the in-memory
+    resources.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency=0.0,
+                 error_rate: float = 0.0,
+                 throttle_rate: float = 0.0,
+                 rate_limit: float = None,
+                 retry_after: float = 1.0,
+                 seed: int = None,
+                 record: str = None,
+                 upstream: str = None,
+                 replay: str = None,
+                 bulk: bool = False):
+        """
+        :param str host: Interface to listen on
+        :param int port: Port to listen on. Defaults to a free port.
+        :param latency: Delay added to every response, in seconds, or a
+                        `(min, max)` tuple for a uniformly random delay
+        :param float error_rate: Fraction of the requests failing with a 503
+        :param float throttle_rate: Fraction of the requests throttled with a 429
+        :param float rate_limit: Requests per second allowed, with a burst of one
+                                 second. Requests beyond are throttled with a 429
+                                 and every response carries `RateLimit-*` headers.
+        :param float retry_after: `Retry-After` of randomly throttled requests, in seconds
+        :param int seed: Seed of the random latency, errors and throttling
+        :param str record: Path of a JSON lines file saving the responses of `upstream`
+        :param str upstream: URL of the API the requests are forwarded to when recording
+        :param str replay: Path of a JSON lines file of recorded responses to serve
+        :param bool bulk: Serve the bulk creation endpoints of strategies and
+                          backtests, `POST /v1/<resource>/bulk`
+        """
+        if record and not upstream:
+            raise ValueError("Recording requires the `upstream` URL of an API.")
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.record = record
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.bulk = bulk
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._refilled = time.monotonic()
+        self._server = None
+        self._thread = None
+        self._session = None
+        self._recordings = self._load(replay) if replay else {}
+        self._idempotent = OrderedDict()
+        self._stats = {"requests": 0, "errors": 0, "throttled": 0, "replayed": 0, "endpoints": {}}
+
+        # In-memory resources, by identifier, in the order they were created.
+        self.resources = {resource: {} for resource in _ID_PREFIXES}
+        self.positions = {}
+        self._agents = {}
+        self.user = {"id": "usr_%s" % uuid.uuid4().hex[:24], "object": "user"}
+        self.account = self._create("accounts", {"name": "Local account"})
+
+    @property
+    def url(self) -> str:
+        """ Base URL of the server, to pass as `api_base` to a client. """
+        if self._server is None:
+            raise RuntimeError("The server is not started.")
+        return "http://%s:%d" % (self.host, self._server.server_port)
+
+    def start(self):
+        if self._server is None:
+            self._server = _Server((self.host, self.port), _Handler)
+            self._server.stand_in = self
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="absurdia-local-server", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        """
+        Returns the number of requests received, of injected errors, of
+        throttled and replayed requests, and the requests per endpoint.
+        """
+        with self._lock:
+            return dict(self._stats, endpoints=dict(self._stats["endpoints"]))
+
+    def handle(self, method: str, target: str, headers, body: bytes) -> _Response:
+        """ Answers a request. Called from the thread of its connection. """
+        url = urlsplit(target)
+        endpoint = "%s %s" % (method, endpoint_template(url.path))
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["endpoints"][endpoint] = self._stats["endpoints"].get(endpoint, 0) + 1
+            roll_error = self._random.random()
+            roll_throttle = self._random.random()
+            delay = self._delay()
+
+        if delay:
+            time.sleep(delay)
+
+        limit_headers, wait = self._rate_limit()
+        if wait is not None:
+            return self._throttled(wait, limit_headers)
+        if roll_throttle < self.throttle_rate:
+            return self._throttled(self.retry_after, limit_headers)
+        if roll_error < self.error_rate:
+            with self._lock:
+                self._stats["errors"] += 1
+            return _error(503, "api_error", "Injected error.", limit_headers)
+
+        if self.record:
+            response = self._forward(method, target, headers, body)
+        else:
+            response = self._replay(method, target)
+            if response is None:
+                response = self._idempotent_route(method, url, headers, body)
+        response.headers.update(limit_headers)
+        response.headers.setdefault("x-request-id", "req_%s" % uuid.uuid4().hex[:24])
+        return response
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, (tuple, list)):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def _rate_limit(self):
+        """ Takes a token of the bucket. Returns the rate limit headers and the wait, if throttled. """
+        if self.rate_limit is None:
+            return {}, None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit
+            )
+            self._refilled = now
+            wait = None
+            if self._tokens >= 1:
+                self._tokens -= 1
+            else:
+                wait = (1 - self._tokens) / self.rate_limit
+            headers = {
+                "RateLimit-Limit": "%d" % self.rate_limit,
+                "RateLimit-Remaining": "%d" % max(self._tokens, 0),
+                "RateLimit-Reset": "%d" % math.ceil((self.rate_limit - self._tokens) / self.rate_limit),
+                "RateLimit-Policy": "%d;w=1" % self.rate_limit,
+            }
+        return headers, wait
+
+    def _throttled(self, wait: float, headers: dict) -> _Response:
+        with self._lock:
+            self._stats["throttled"] += 1
+        return _error(
+            429, "rate_limit_error", "Too many requests.",
+            dict(headers, **{"Retry-After": "%.3f" % wait})
+        )
+
+    # Record and replay
+
+    def _load(self, path: str) -> dict:
+        recordings = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    recordings.setdefault((entry["method"], entry["path"]), []).append(entry)
+        return recordings
+
+    def _replay(self, method: str, target: str) -> _Response:
+        with self._lock:
+            entries = self._recordings.get((method, target))
+            if not entries:
+                return None
+            # The last response of a request is served again once the others are.
+            entry = entries.pop(0) if len(entries) > 1 else entries[0]
+            self._stats["replayed"] += 1
+        return _Response(entry["status"], entry["body"].encode("utf-8"), dict(entry["headers"]))
+
+    def _forward(self, method: str, target: str, headers, body: bytes) -> _Response:
+        import requests
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+        forwarded = {
+            key: value for key, value in headers.items()
+            if key.lower() not in _HOP_HEADERS + ("host",)
+        }
+        upstream = self._session.request(
+            method, self.upstream + target, headers=forwarded, data=body or None,
+            allow_redirects=False
+        )
+        response_headers = {
+            key: value for key, value in upstream.headers.items()
+            if key.lower() not in _HOP_HEADERS + ("content-type",)
+        }
+        entry = {
+            "method": method,
+            "path": target,
+            "status": upstream.status_code,
+            "headers": response_headers,
+            "body": upstream.text,
+        }
+        with self._lock:
+            with open(self.record, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return _Response(upstream.status_code, upstream.content, dict(response_headers))
+
+    # In-memory API
+
+    def _idempotent_route(self, method: str, url, headers, body: bytes) -> _Response:
+        # A retried POST or PATCH gets the response of its first attempt.
+        key = headers.get("Idempotency-Key")
+        if key is None or method not in ("POST", "PATCH"):
+            return self._route(method, url, headers, body)
+        with self._lock:
+            response = self._idempotent.get(key)
+            if response is not None:
+                self._idempotent.move_to_end(key)
+        if response is None:
+            response = self._route(method, url, headers, body)
+            with self._lock:
+                self._idempotent[key] = response
+                while len(self._idempotent) > MAX_IDEMPOTENCY_KEYS:
+                    self._idempotent.popitem(last=False)
+        return _Response(response.status, response.body, dict(response.headers))
+
+    def _route(self, method: str, url, headers, body: bytes) -> _Response:
+        segments = url.path.strip("/").split("/")
+        if len(segments) < 2 or segments[0] != "v1":
+            return _error(404, "invalid_request_error", "Unknown endpoint %s." % url.path)
+        authorization = headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return _error(401, "authentication_error", "No agent token provided.")
+        token = authorization[len("Bearer "):]
+
+        try:
+            data = json_backend.loads(body) if body else {}
+        except ValueError:
+            return _error(400, "invalid_request_error", "The body is not valid JSON.")
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        resource, rest = segments[1], segments[2:]
+
+        if resource == "users" and not rest and method == "GET":
+            return _json(200, {"data": self.user})
+        if resource not in self.resources:
+            return _error(404, "invalid_request_error", "Unknown endpoint %s." % url.path)
+        if resource == "accounts" and params.get("current") == "true":
+            return _json(200, {"data": self.account})
+        if resource == "agents" and rest == [token]:
+            return _json(200, {"data": self._agent(token)})
+        if resource == "backtests" and rest == ["import"] and method == "POST":
+            return _json(200, {"data": self._import(data)})
+        if resource == "backtests" and len(rest) == 2 and rest[1] == "positions":
+            return self._positions(method, rest[0], data)
+        if self.bulk and resource in ("strategies", "backtests") and rest == ["bulk"] \
+        and method == "POST":
+            return _json(200, {"data": [self._bulk_item(resource, item) for item in data["data"]]})
+
+        if not rest:
+            if method == "GET":
+                return self._list(resource, params)
+            if method == "POST":
+                return _json(200, {"data": self._create(resource, data)})
+        elif len(rest) == 1:
+            with self._lock:
+                obj = self.resources[resource].get(rest[0])
+                if obj is not None:
+                    if method == "PATCH":
+                        _merge(obj, data)
+                    elif method == "DELETE":
+                        del self.resources[resource][rest[0]]
+                    obj = json_backend.dumps({"data": obj})
+            if obj is None:
+                return _error(404, "invalid_request_error", "No such object: %s." % rest[0])
+            if method in ("GET", "PATCH", "DELETE"):
+                return _Response(200, obj)
+        return _error(405, "invalid_request_error", "Method %s not allowed." % method)
+
+    def _create(self, resource: str, data: dict) -> dict:
+        obj = dict(data, id=_new_id(resource), created_at=int(time.time() * 1000))
+        if resource == "backtests":
+            obj.setdefault("status", "running")
+            if "strategy_id" not in obj and obj.get("strategy_name"):
+                obj["strategy_id"] = self._strategy(obj["strategy_name"])["id"]
+        with self._lock:
+            self.resources[resource][obj["id"]] = obj
+        return obj
+
+    def _bulk_item(self, resource: str, data) -> dict:
+        required = "name" if resource == "strategies" else "timeframe"
+        if not isinstance(data, dict) or required not in data:
+            return {
+                "status": 400,
+                "error": {"type": "invalid_request_error", "message": "Missing %s." % required}
+            }
+        return self._create(resource, data)
+
+    def _strategy(self, name: str) -> dict:
+        with self._lock:
+            for strategy in self.resources["strategies"].values():
+                if strategy.get("name") == name:
+                    return strategy
+        return self._create("strategies", {"name": name})
+
+    def _agent(self, token: str) -> dict:
+        """ Returns the agent of `token`, created the first time it is seen. """
+        with self._lock:
+            id = self._agents.get(token)
+        if id is None:
+            id = self._create("agents", {"account_id": self.account["id"]})["id"]
+            with self._lock:
+                id = self._agents.setdefault(token, id)
+        return self.resources["agents"][id]
+
+    def _list(self, resource: str, params: dict) -> _Response:
+        limit = int(params.get("limit", 100))
+        after = params.get("starting_after")
+        with self._lock:
+            objects = list(self.resources[resource].values())
+        if after is not None:
+            ids = [obj["id"] for obj in objects]
+            objects = objects[ids.index(after) + 1:] if after in ids else []
+        return _json(200, {"data": objects[:limit], "has_more": len(objects) > limit})
+
+    def _import(self, data: dict) -> dict:
+        result = data.get("data") or {}
+        backtest = {
+            key: data[key] for key in ("name", "framework", "host", "profile", "cli_command")
+            if key in data
+        }
+        backtest.update(adapter=data.get("adapter"), status="finished")
+        if isinstance(result, dict) and isinstance(result.get("strategy"), dict):
+            backtest["strategies"] = sorted(result["strategy"])
+        return self._create("backtests", backtest)
+
+    def _positions(self, method: str, id: str, data: dict) -> _Response:
+        with self._lock:
+            if id not in self.resources["backtests"]:
+                return _error(404, "invalid_request_error", "No such backtest: %s." % id)
+            positions = self.positions.setdefault(id, [])
+            if method == "POST":
+                positions.extend(data.get("positions") or ())
+                return _json(200, {"data": {"id": id, "count": len(positions)}})
+            if method == "GET":
+                return _json(200, {"data": list(positions)})
+        return _error(405, "invalid_request_error", "Method %s not allowed." % method)
@@ -2,21 +2,14 @@ import io
 import logging
 import sys
 import os
-import psutil
-import platform
 import datetime
 import calendar
-import time, json, base64
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+import time
 from pathlib import Path
 from collections import OrderedDict
 
-try:
-    pd = __import__("pandas")
-except ImportError:
-    pd = None
-
 import absurdia
+from absurdia import json_backend
 
 dirname = os.path.dirname(__file__)
 homedir = str(Path.home())
@@ -49,13 +42,16 @@ def now_ms():
 
 
 def to_df(obj):
-    if pd is None:
+    # pandas takes hundreds of milliseconds to import, so it is only
+    # imported on first use.
+    try:
+        pd = __import__("pandas")
+    except ImportError:
         raise ImportError(
             "`pandas` is required to convert to a DataFrame. "
             "Install with `pip install pandas`"
         )
-    else:
-        return pd.DataFrame(obj, columns=obj[0].keys())
+    return pd.DataFrame(obj, columns=obj[0].keys())
 
 def utf8(value):
     return value.encode("utf-8")
@@ -177,26 +173,28 @@ def _api_encode(data):
             yield (key, utf8(value))
 
 def dump(payload):
-    return (json.dumps(payload, separators=(',', ':')) if len(payload) else '')
+    return (json_backend.dumps(payload).decode("utf-8") if len(payload) else '')
+
+# Key of `absurdia.agent_signature_key`, parsed on first use by `sign`.
+PRIVATE_KEY = None
 
 def sign(payload: dict = {}) -> str:
+    """
+    Returns the `Abs-Signature` header of `payload` encoded with `dump`.
+    The body sent must be those exact bytes: `Client.request(signed=True)`
+    takes care of it.
+    """
+    from absurdia.signing import Signer, load_key
     global PRIVATE_KEY
     if PRIVATE_KEY is None:
         if absurdia.agent_signature_key:
-            PRIVATE_KEY = Ed25519PrivateKey.from_private_bytes(
-                base64.b64decode(absurdia.agent_signature_key)
-            )
+            PRIVATE_KEY = load_key(absurdia.agent_signature_key)
         else:
             raise RuntimeError(
                 "No signature key provided. "
                 "A signature key is required for endpoints that require signatures."
                 )
-    timestamp = int(time.time_ns() / 1000)
-    payload_bytes = f"{timestamp}.{dump(payload)}".encode()
-    print(payload_bytes)
-    sig_raw = PRIVATE_KEY.sign(payload_bytes)
-    signature = base64.urlsafe_b64encode(sig_raw).replace(b'=', b'').decode()
-    return f"t={timestamp},s={signature}"
+    return Signer(PRIVATE_KEY).sign(dump(payload).encode("utf-8"))
 
 def convert_to_dict(obj):
     """Converts a AbsurdiaObject back to a regular dict.
@@ -215,6 +213,8 @@ def convert_to_dict(obj):
         return obj
 
 def get_host_info() -> dict:
+    import platform
+    import psutil
     return {
         "absurdia_pkg_version": absurdia.__version__,
         "absurdia_pkg_lang": "python",
@@ -0,0 +1,69 @@
+"""
+Measures the time taken by `import absurdia` with `python -X importtime`,
+in fresh interpreters, and checks it against a budget. Also checks that
+heavy optional dependencies are not imported along. Exits with status 1
+when the budget is exceeded, so that it can gate a CI job.
+
+    $ python benchmarks/import_time.py
+    $ python benchmarks/import_time.py --module "absurdia.clients" --budget 150
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Must not be imported by `import absurdia`.
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "psutil", "cryptography", "requests", "httpx")
+
+
+def import_time_us(module: str) -> int:
+    """ Returns the cumulative import time of `module` in a fresh interpreter, in µs. """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % (module,)],
+        capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise RuntimeError("No import time reported for %s:\n%s" % (module, result.stderr))
+
+
+def imported_heavy_modules(module: str) -> list:
+    code = "import sys, %s; print(' '.join(m for m in %r if m in sys.modules))" % (
+        module, HEAVY_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="absurdia")
+    parser.add_argument("--budget", type=float, default=50.0,
+                        help="Maximum median import time, in milliseconds")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    times = [import_time_us(args.module) / 1000 for _ in range(args.repeat)]
+    median = statistics.median(times)
+    print("import %s: median %.1f ms, min %.1f ms, max %.1f ms (budget %.1f ms)" % (
+        args.module, median, min(times), max(times), args.budget
+    ))
+
+    failed = False
+    if median > args.budget:
+        print("FAIL: import time is over budget")
+        failed = True
+    heavy = imported_heavy_modules(args.module) if args.module == "absurdia" else []
+    if heavy:
+        print("FAIL: `import absurdia` imports %s" % (", ".join(heavy),))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Counts and times the JSON decodes made to build a `BacktestsList` from a
+`list()` response of 10000 backtests, with and without decoding the body
+only once, for every JSON backend installed.
+
+    $ python benchmarks/json_decode.py
+"""
+import json
+import time
+
+from absurdia import json_backend
+from absurdia.api_response import APIResponse
+from absurdia.resources.backtests import BacktestsList
+
+ROWS = 10000
+REPEAT = 5
+
+
+class UnmemoizedResponse(APIResponse):
+    """ Decodes its body on every access, as `APIResponse` used to. """
+
+    @property
+    def json(self):
+        return json_backend.loads(self.content)
+
+
+def make_body(rows: int) -> str:
+    return json.dumps({
+        "data": [
+            {
+                "id": "bt_%d" % (i,),
+                "strategy_id": "st_%d" % (i % 50,),
+                "name": "Backtest %d" % (i,),
+                "start_date": 1640995200000 + i,
+                "end_date": 1672531200000 + i,
+                "timeframe": "5m",
+                "initial_balance": 1000.0,
+                "configs": {"stake_amount": 100, "max_open_trades": 3},
+            }
+            for i in range(rows)
+        ],
+        "has_more": False
+    })
+
+
+def measure(response_class, body: str):
+    calls = [0]
+    loads = json_backend.loads
+
+    def counting_loads(content):
+        calls[0] += 1
+        return loads(content)
+
+    json_backend.loads = counting_loads
+    try:
+        best = None
+        for _ in range(REPEAT):
+            calls[0] = 0
+            start = time.perf_counter()
+            response = response_class(200, body, {})
+            objects = BacktestsList(response)
+            # What iter_all() reads from the page after building it.
+            response.json.get("has_more")
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return calls[0], best, len(objects)
+    finally:
+        json_backend.loads = loads
+
+
+def main():
+    body = make_body(ROWS)
+    print("Body: %d rows, %.1f MB" % (ROWS, len(body) / 1e6))
+    for backend in json_backend.BACKENDS:
+        try:
+            json_backend.set_backend(backend)
+        except ImportError:
+            continue
+        for label, response_class in (
+            ("decode per access", UnmemoizedResponse),
+            ("decode once", APIResponse),
+        ):
+            decodes, elapsed, rows = measure(response_class, body)
+            print("%-8s %-18s decodes=%d  %.1f ms" % (
+                backend, label, decodes, elapsed * 1000
+            ))
+    json_backend.set_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,13 @@ setup(
         "colorama",
         "requests"
     ],
+    extras_require={
+        "async": ["httpx"],
+        "http2": ["httpx[http2]"],
+        "zstd": ["zstandard"],
+        "import": ["ijson"],
+        "speedups": ["orjson"]
+    },
     python_requires=">=3.4",
     entry_points={
         "console_scripts": [
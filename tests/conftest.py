@@ -0,0 +1,33 @@
+import pytest
+
+from absurdia.clients import Client
+from absurdia.testing import LocalServer
+
+TOKEN = "0" * 64
+
+
+@pytest.fixture
+def server():
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = Client(TOKEN, api_base=server.url, enable_telemetry=False)
+    yield client
+    client.http_client.close()
+
+
+@pytest.fixture
+def slow_server():
+    # Slow enough for concurrent calls to take visibly less time than sequential ones.
+    with LocalServer(latency=0.05) as server:
+        yield server
+
+
+@pytest.fixture
+def slow_client(slow_server):
+    client = Client(TOKEN, api_base=slow_server.url, max_connections=10)
+    yield client
+    client.http_client.close()
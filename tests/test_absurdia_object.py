@@ -0,0 +1,135 @@
+import gc
+
+import pytest
+
+from absurdia.absurdia_object import AbsurdiaObjectsList
+
+
+def _objects():
+    return AbsurdiaObjectsList([{"id": "a"}, {"id": "b"}, {"id": "c", "name": "C"}])
+
+
+def test_indexing_matches_a_list():
+    objects = _objects()
+    rows = objects.to_dicts()
+    for i in range(-len(rows), len(rows)):
+        assert objects[i] == rows[i]
+    assert objects[-1] == {"id": "c", "name": "C"}
+
+
+@pytest.mark.parametrize("i", [3, 4, -4, -5])
+def test_index_out_of_range(i):
+    objects = _objects()
+    with pytest.raises(IndexError):
+        objects[i]
+    assert i not in objects._views and i + 3 not in objects._views
+
+
+def test_views_are_cached():
+    objects = _objects()
+    assert objects[1] is objects[-2]
+
+
+def test_slices():
+    sliced = _objects()[1:]
+    assert len(sliced) == 2
+    assert list(sliced) == [{"id": "b"}, {"id": "c", "name": "C"}]
+    with pytest.raises(IndexError):
+        sliced[-3]
+
+
+def test_writes_to_objects_persist():
+    objects = _objects()
+    assert list(objects.find(id="b"))
+    objects[0]["n"] = 7
+    del objects[1]["id"]
+    gc.collect()
+    assert objects[0]["n"] == 7
+    assert objects[1:][0] == {}
+    assert objects.to_dicts()[0] == {"id": "a", "n": 7}
+    assert list(objects.find(n=7)) == [objects[0]]
+    assert list(objects.find(id="b")) == []
+    sliced = objects[2:]
+    sliced[0]["id"] = "d"
+    assert list(objects.find(id="d")) == [objects[2]]
+
+
+def _saved(client):
+    strategy = client.strategies.create("Saved")
+    strategy["metadata"] = {"a": 1, "b": {"c": 2}}
+    strategy.save()
+    return strategy
+
+
+def test_save_sends_the_changed_keys_only(server, client):
+    strategy = _saved(client)
+    strategy["metadata"]["b"]["c"] = 3
+    strategy["description"] = "Changed"
+    assert strategy.serialize() == {"metadata": {"b": {"c": 3}}, "description": "Changed"}
+    strategy.save()
+    assert server.resources["strategies"][strategy.id]["metadata"] == {"a": 1, "b": {"c": 3}}
+    assert strategy.serialize() == {}
+
+
+def test_none_unsets_a_key_which_was_set(client):
+    strategy = _saved(client)
+    strategy["metadata"]["a"] = None
+    del strategy["metadata"]["b"]
+    assert strategy.serialize() == {"metadata": {"a": "", "b": ""}}
+
+
+def test_none_is_not_sent_for_a_key_which_was_absent(server, client):
+    strategy = _saved(client)
+    strategy["notes"] = None
+    strategy["metadata"]["d"] = None
+    assert strategy.serialize() == {}
+    strategy.save()
+    assert "notes" not in server.resources["strategies"][strategy.id]
+
+
+def test_objects_of_a_list_can_be_saved(server, client):
+    strategy = _saved(client)
+    listed = next(client.strategies.list().find(id=strategy.id))
+    assert type(listed).__name__ == "Strategy"
+    listed["metadata"]["b"] = None
+    assert listed.serialize() == {"metadata": {"b": ""}}
+    listed.save()
+    assert server.resources["strategies"][strategy.id]["metadata"] == {"a": 1}
+    assert strategy.refresh()["metadata"] == {"a": 1}
+    assert listed.refresh() is listed
+
+
+def _backtests():
+    return AbsurdiaObjectsList([
+        {"id": "bt_%d" % (i,), "status": "finished" if i % 2 else "running",
+         "timeframe": "5m" if i % 3 else "1h", "profit": float(i - 5)}
+        for i in range(10)
+    ] + [{"id": "bt_odd", "status": "finished", "metadata": {"a": 1}}])
+
+
+def test_by():
+    by_status = _backtests().by("status")
+    assert set(by_status) == {"finished", "running"}
+    assert [obj["id"] for obj in by_status["running"]] == ["bt_0", "bt_2", "bt_4", "bt_6", "bt_8"]
+    assert len(by_status["finished"]) == 6
+
+
+def test_find():
+    objects = _backtests()
+    assert [obj["id"] for obj in objects.find(status="finished", timeframe="1h")] == ["bt_3", "bt_9"]
+    assert list(objects.find(status="cancelled")) == []
+    assert [obj["id"] for obj in objects.find(metadata={"a": 1})] == ["bt_odd"]
+    assert [obj["id"] for obj in objects.find(metadata={"a": 1}, status="finished")] == ["bt_odd"]
+    assert list(objects.find(metadata={"a": 2})) == []
+    assert list(objects.find(metadata={"a": 1}, status="running")) == []
+    assert [obj["id"] for obj in objects.find_any(id="bt_odd", timeframe="1h")] == \
+        ["bt_0", "bt_3", "bt_6", "bt_9", "bt_odd"]
+    assert [obj["id"] for obj in objects.find_any(metadata={"a": 1}, id="bt_1")] == ["bt_1", "bt_odd"]
+    objects[-1]["metadata"]["a"] = 2
+    assert [obj["id"] for obj in objects.find(metadata={"a": 2})] == ["bt_odd"]
+
+
+def test_between():
+    objects = _backtests()
+    assert [obj["profit"] for obj in objects.between("profit", -1, 1)] == [-1.0, 0.0, 1.0]
+    assert [obj["id"] for obj in objects.between("profit", low=3)] == ["bt_8", "bt_9"]
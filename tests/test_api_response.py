@@ -0,0 +1,17 @@
+from absurdia.api_response import APIResponse
+
+
+def test_body_is_decoded_once():
+    decodes = []
+    response = APIResponse(200, '{"data": {"id": "bt_1"}}', {}, on_decode=decodes.append)
+    assert response.json["data"]["id"] == "bt_1"
+    assert response.json is response.json
+    assert len(decodes) == 1
+
+
+def test_null_body_is_decoded_once():
+    decodes = []
+    response = APIResponse(200, "null", {}, on_decode=decodes.append)
+    assert response.json is None
+    assert response.json is None
+    assert len(decodes) == 1
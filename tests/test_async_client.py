@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from absurdia.clients.async_client import AsyncClient
+from tests.conftest import TOKEN
+
+pytest.importorskip("httpx")
+
+
+def _run(server, fn):
+    async def main():
+        async with AsyncClient(TOKEN, api_base=server.url) as client:
+            return await fn(client)
+    return asyncio.run(main())
+
+
+def test_requestors_are_awaitable(server):
+    async def fn(client):
+        strategy = await client.strategies.create("Async")
+        backtest = await client.backtests.create(1, 2, "5m", strategy_id=strategy.id)
+        await backtest.add_positions([{"symbol": "BTC/USDT", "price": 1.0}])
+        await backtest.finish()
+        return await client.backtests.retrieve(backtest.id), await backtest.positions()
+
+    backtest, positions = _run(server, fn)
+    assert backtest["status"] == "finished"
+    assert positions == [{"symbol": "BTC/USDT", "price": 1.0}]
+
+
+def test_concurrent_requests(server):
+    async def fn(client):
+        return await asyncio.gather(*(client.strategies.create("S%d" % (i,)) for i in range(20)))
+
+    strategies = _run(server, fn)
+    assert [strategy["name"] for strategy in strategies] == ["S%d" % (i,) for i in range(20)]
+    assert len(server.resources["strategies"]) == 20
+
+
+def test_iter_all(server):
+    async def fn(client):
+        for i in range(25):
+            await client.strategies.create("S%d" % (i,))
+        return [strategy["name"] async for strategy in client.strategies.iter_all(page_size=10)]
+
+    assert _run(server, fn) == ["S%d" % (i,) for i in range(25)]
+
+
+def test_objects_of_a_list_are_async(server):
+    async def fn(client):
+        strategy = await client.strategies.create("Async")
+        await client.backtests.create(1, 2, "5m", strategy_id=strategy.id)
+        backtest = (await client.backtests.list())[0]
+        await backtest.finish()
+        backtest["name"] = "Listed"
+        return await backtest.save()
+
+    backtest = _run(server, fn)
+    assert type(backtest).__name__ == "AsyncBacktest"
+    assert backtest["status"] == "finished" and backtest["name"] == "Listed"
@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from absurdia.api_error import APIError
+
+
+def test_batch_sends_calls_concurrently(slow_client):
+    start = time.monotonic()
+    with slow_client.batch() as batch:
+        futures = [batch.strategies.create("S%d" % (i,)) for i in range(10)]
+        missing = batch.strategies.retrieve("str_missing")
+        assert not any(future.done() for future in futures)
+    assert time.monotonic() - start < 0.4
+    assert [future.result()["name"] for future in futures] == ["S%d" % (i,) for i in range(10)]
+    # A failed call does not affect the others.
+    assert isinstance(missing.exception(), APIError)
+
+
+def test_batch_is_cancelled_on_error(client):
+    with pytest.raises(RuntimeError):
+        with client.batch() as batch:
+            future = batch.strategies.create("Cancelled")
+            raise RuntimeError()
+    assert future.cancelled()
+    assert len(client.strategies.list()) == 0
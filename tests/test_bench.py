@@ -0,0 +1,17 @@
+from absurdia import bench
+
+
+def test_suites_are_registered():
+    results = bench.run(filter="objects.iterate", repeat=1, min_time=0.001, log=None)
+    names = {result["name"] for result in results["results"]}
+    assert names == {"objects.iterate"}
+    assert all(result["units_per_s"] > 0 for result in results["results"])
+
+
+def test_compare_reports_regressions():
+    def result(median):
+        return {"name": "objects.list", "params": {"rows": 10}, "median_s": median}
+    results = {"results": [result(2.0)]}
+    regressions = bench.compare(results, {"results": [result(1.0)]}, threshold=0.25)
+    assert [ratio for _, ratio in regressions] == [2.0]
+    assert bench.compare(results, {"results": [result(1.9)]}, threshold=0.25) == []
@@ -0,0 +1,81 @@
+import pytest
+
+from absurdia.api_response import APIResponse
+from absurdia.clients import Client
+from absurdia.clients.cache import ResponseCache
+from tests.conftest import TOKEN
+
+
+def test_multi_value_params_are_keyed_as_tuples():
+    key = ResponseCache.key("/v1/backtests", {"ids": ["a", "b"], "limit": 10})
+    assert key == ("/v1/backtests", (("ids", ("a", "b")), ("limit", 10)))
+    assert key == ResponseCache.key("/v1/backtests", {"limit": 10, "ids": ("a", "b")})
+
+
+def test_unhashable_params_are_not_cached():
+    cache = ResponseCache()
+    params = {"filter": {"status": "finished"}}
+    assert ResponseCache.key("/v1/backtests", params) is None
+    assert cache.lookup("GET", "/v1/backtests", params, {}) is None
+    response = APIResponse(200, '{"data": []}', {})
+    assert cache.store("GET", "/v1/backtests", params, response) is response
+    assert len(cache) == 0
+
+
+def test_lookup_and_store():
+    cache = ResponseCache()
+    params = {"ids": ["a", "b"]}
+    assert cache.lookup("GET", "/v1/backtests", params, {}) is None
+    cache.store("GET", "/v1/backtests", params, APIResponse(200, '{"data": []}', {}))
+    cached = cache.lookup("GET", "/v1/backtests", {"ids": ["a", "b"]}, {})
+    assert cached.cached and cached.json == {"data": []}
+    assert cache.lookup("GET", "/v1/backtests", {"ids": ["a"]}, {}) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.store("POST", "/v1/backtests", None, APIResponse(200, "{}", {}))
+    assert len(cache) == 0
+
+
+
+def test_expired_entries_are_revalidated_with_their_etag():
+    # Entries expire as soon as they are stored.
+    cache = ResponseCache(ttls={"/v1": 0})
+    body = '{"data": {"id": "bt_1"}}'
+    cache.store("GET", "/v1/backtests/bt_1", None, APIResponse(200, body, {"etag": '"v1"'}))
+    cache.store("GET", "/v1/backtests/bt_2", None, APIResponse(200, body, {}))
+
+    headers = {}
+    assert cache.lookup("GET", "/v1/backtests/bt_1", None, headers) is None
+    assert headers == {"If-None-Match": '"v1"'}
+    headers = {}
+    assert cache.lookup("GET", "/v1/backtests/bt_2", None, headers) is None
+    assert headers == {}
+
+    not_modified = APIResponse(304, "", {"etag": '"v1"'})
+    response = cache.store("GET", "/v1/backtests/bt_1", None, not_modified)
+    assert response.status_code == 200 and response.cached
+    assert response.json == {"data": {"id": "bt_1"}}
+    assert cache.revalidations == 1
+
+    # Without a cached entry, a 304 is given back as is.
+    assert cache.store("GET", "/v1/backtests/bt_3", None, not_modified) is not_modified
+    assert cache.revalidations == 1
+
+
+@pytest.fixture
+def caching_client(server):
+    client = Client(TOKEN, api_base=server.url, cache=True)
+    yield client
+    client.http_client.close()
+
+
+def test_client_cache_hits(server, caching_client):
+    params = {"ids": ["a", "b"]}
+    first = caching_client.request("GET", "/v1/backtests", params=params)
+    assert first.ok and caching_client.last_response is first
+
+    caching_client.request("GET", "/v1/accounts", params={"current": "true"})
+    second = caching_client.request("GET", "/v1/backtests", params=params)
+    assert second.cached
+    assert caching_client.last_response is second
+    assert server.stats()["requests"] == 2
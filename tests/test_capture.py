@@ -0,0 +1,43 @@
+from absurdia.clients import Client
+from absurdia.clients.capture import RequestCapture
+from tests.conftest import TOKEN
+
+
+def test_ring_buffer_keeps_the_last_requests():
+    capture = RequestCapture(size=3)
+    for i in range(5):
+        capture.record("GET", "/v1/%d" % (i,), sampled=True, status_code=200)
+    assert [entry["url"] for entry in capture.entries()] == ["/v1/2", "/v1/3", "/v1/4"]
+
+
+def test_only_failures_are_kept_outside_the_sample():
+    capture = RequestCapture(sample_rate=0.0)
+    capture.record("GET", "/v1/ok", sampled=capture.sampled(), status_code=200)
+    capture.record("GET", "/v1/failed", sampled=capture.sampled(), status_code=503)
+    capture.record("GET", "/v1/error", sampled=False, error=ConnectionError("reset"))
+    assert [entry["url"] for entry in capture.entries()] == ["/v1/failed", "/v1/error"]
+
+
+def test_bodies_are_truncated_and_secrets_redacted():
+    capture = RequestCapture(max_body_bytes=10)
+    capture.record(
+        "POST", "/v1/backtests", sampled=True,
+        request_headers={"Authorization": "Bearer secret", "Abs-Signature": "t=1,s=x"},
+        request_body=b'{"positions": []}', response_body=iter([b"{}"]), status_code=200
+    )
+    entry = capture.entries()[0]
+    assert entry["request_headers"] == {
+        "Authorization": "<redacted>", "Abs-Signature": "<redacted>"
+    }
+    assert entry["request_body"] == '{"position'
+    assert entry["response_body"] == "<stream>"
+
+
+def test_client_capture(server):
+    client = Client(TOKEN, api_base=server.url, capture=True)
+    client.strategies.create("Captured")
+    entry = client.http_client.capture.entries()[-1]
+    assert (entry["method"], entry["status_code"]) == ("POST", 200)
+    assert "Captured" in entry["response_body"]
+    assert "POST %s/v1/strategies -> 200" % (server.url,) in client.http_client.capture.format()
+    client.http_client.close()
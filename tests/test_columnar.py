@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from absurdia import columnar
+
+TEXT = (
+    '{"data":[{"symbol":"BTC/USDT","price":1.5,"amount":2},'
+    '{"symbol":"ETH/USDT","price":null,"amount":3,"fee":0.1}],"has_more":false}'
+)
+
+
+def test_decode_columns_fills_missing_values():
+    columns, length = columnar.decode_columns(TEXT)
+    assert length == 2
+    assert columns["symbol"] == ["BTC/USDT", "ETH/USDT"]
+    assert columns["fee"] == [None, 0.1]
+
+
+def test_decode_columns_of_varied_records():
+    text = (
+        '{"data":[{"id":1,"meta":{"a":[1,2]},"created_at":1.7},'
+        '{"created_at":2,"id":2,"side":null}]}'
+    )
+    columns, length = columnar.decode_columns(text)
+    assert length == 2
+    assert list(columns) == ["id", "meta", "created_at", "side"]
+    assert columns["meta"] == [{"a": [1, 2]}, None]
+    assert columnar.decode_columns('{"has_more":false}') == ({}, 0)
+    with pytest.raises(ValueError):
+        columnar.decode_columns("[]")
+    pytest.importorskip("numpy")
+    arrays = columnar.to_numpy(columns, length)
+    assert arrays["created_at"].tolist() == [1, 2]
+    assert arrays["id"].dtype.kind == "i" and arrays["meta"].dtype.kind == "O"
+    assert arrays["side"].tolist() == [None, None]
+
+
+def test_numpy():
+    pytest.importorskip("numpy")
+    arrays = columnar.convert(TEXT, "numpy")
+    assert arrays["amount"].tolist() == [2, 3]
+    assert math.isnan(arrays["price"][1])
+
+
+def test_pandas():
+    pytest.importorskip("pandas")
+    df = columnar.convert(TEXT, "pandas")
+    assert list(df["symbol"]) == ["BTC/USDT", "ETH/USDT"]
+    assert str(df["symbol"].dtype) == "category"
+    assert df["price"].isna().tolist() == [False, True]
+
+
+def test_arrow():
+    pytest.importorskip("pyarrow")
+    table = columnar.convert(TEXT, "arrow")
+    assert table.num_rows == 2
+    fee = table.column("fee").to_pylist()
+    assert math.isnan(fee[0]) and fee[1] == 0.1
+    assert table.column("symbol").to_pylist() == ["BTC/USDT", "ETH/USDT"]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        columnar.convert(TEXT, "csv")
+
+
+def test_backtest_positions(client):
+    pytest.importorskip("pandas")
+    backtest = client.backtests.create(1, 2, "5m", strategy_name="Columns")
+    positions = [{"symbol": "BTC/USDT", "price": float(i), "amount": i} for i in range(50)]
+    backtest.add_positions(positions)
+    df = backtest.positions(format="pandas")
+    assert df["price"].tolist() == [p["price"] for p in positions]
+    assert df.to_dict("records") == backtest.positions()
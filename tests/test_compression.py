@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from absurdia import compression
+from absurdia.clients import Client
+from tests.conftest import TOKEN
+
+DATA = {"positions": [{"symbol": "BTC/USDT", "price": float(i)} for i in range(2000)]}
+
+
+def _encoding_available(encoding: str) -> bool:
+    try:
+        compression.decompress(b"".join(compression.compress_chunks([b"{}"], encoding)), encoding)
+    except ImportError:
+        return False
+    return True
+
+
+def test_small_bodies_are_sent_as_is():
+    body, encoding = compression.encode_json({"a": 1}, "gzip", threshold=1024)
+    assert body == b'{"a":1}' and encoding is None
+
+
+@pytest.mark.parametrize("encoding", compression.ENCODINGS)
+def test_large_bodies_are_compressed(encoding):
+    if not _encoding_available(encoding):
+        pytest.skip("%s is not installed" % (encoding,))
+    body, sent_encoding = compression.encode_json(DATA, encoding, threshold=1024)
+    compressed = b"".join(body)
+    assert sent_encoding == encoding
+    assert len(compressed) < len(json.dumps(DATA)) / 2
+    assert json.loads(compression.decompress(compressed, encoding)) == DATA
+
+
+def test_iter_json_chunks():
+    chunks = list(compression.iter_json(DATA, chunk_size=1024))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == DATA
+
+
+def test_unknown_encoding():
+    with pytest.raises(ValueError):
+        b"".join(compression.compress_chunks([b"{}"], "lzma"))
+
+
+def test_client_compresses_large_uploads(server):
+    client = Client(TOKEN, api_base=server.url, compression_threshold=1024)
+    backtest = client.backtests.create(1, 2, "5m", strategy_name="Compressed")
+    backtest.add_positions(DATA["positions"])
+    assert client.http_client.last_request["headers"]["Content-Encoding"] == "gzip"
+    assert backtest.positions() == DATA["positions"]
+    client.http_client.close()
@@ -0,0 +1,24 @@
+import threading
+import time
+
+
+def test_map_keeps_the_order(slow_client):
+    start = time.monotonic()
+    strategies = slow_client.map(slow_client.strategies.create, ["S%d" % (i,) for i in range(10)])
+    assert time.monotonic() - start < 0.4
+    assert [strategy["name"] for strategy in strategies] == ["S%d" % (i,) for i in range(10)]
+
+
+def test_last_response_is_per_thread(client):
+    created = client.strategies.create("Main")
+    seen = {}
+
+    def other():
+        client.request("GET", "/v1/strategies/str_missing")
+        seen["status"] = client.last_response.status_code
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    thread.join()
+    assert seen["status"] == 404
+    assert client.last_response.json["data"]["id"] == created.id
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from absurdia.api_error import APIError
+from absurdia.testing import LocalServer
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+def bulk_server():
+    with LocalServer(bulk=True) as server:
+        yield server
+
+
+def _items(count: int) -> list:
+    return [dict(start_date=1, end_date=2, timeframe="5m", strategy_name="Sweep",
+                 configs={"i": i}) for i in range(count)]
+
+
+def test_falls_back_to_single_requests(server, client):
+    results = client.backtests.create_many(_items(25), chunk_size=10, max_concurrency=4)
+    assert [backtest["configs"]["i"] for backtest in results] == list(range(25))
+    endpoints = server.stats()["endpoints"]
+    # The missing bulk endpoint is probed once.
+    assert endpoints["POST /v1/backtests/bulk"] == 1
+    assert endpoints["POST /v1/backtests"] == 25
+    assert client.backtests._bulk is False
+
+    client.backtests.create_many(_items(2))
+    assert server.stats()["endpoints"]["POST /v1/backtests/bulk"] == 1
+
+
+def test_uses_the_bulk_endpoint(bulk_server):
+    from absurdia.clients import Client
+    client = Client(TOKEN, api_base=bulk_server.url)
+    results = client.backtests.create_many(_items(25), chunk_size=10)
+    assert [backtest["configs"]["i"] for backtest in results] == list(range(25))
+    assert bulk_server.stats()["endpoints"] == {"POST /v1/backtests/bulk": 3}
+    assert len(bulk_server.resources["backtests"]) == 25
+    client.http_client.close()
+
+
+def test_errors_are_returned_at_their_index(bulk_server, server, client):
+    items = [{"name": "A"}, {"description": "No name"}, {"name": "C"}]
+    results = client.strategies.create_many(items)
+    assert isinstance(results[1], TypeError)
+    assert [results[0]["name"], results[2]["name"]] == ["A", "C"]
+
+    from absurdia.clients import Client
+    bulk_client = Client(TOKEN, api_base=bulk_server.url)
+    # Payloads rejected by the server, which the client does not check.
+    results = bulk_client.strategies._create_many(
+        [{"name": "A"}, {"description": "No name"}, {"name": "C"}]
+    )
+    assert isinstance(results[1], APIError) and results[1].http_status == 400
+    assert [results[0]["name"], results[2]["name"]] == ["A", "C"]
+    bulk_client.http_client.close()
+
+
+def test_async_create_many(server):
+    pytest.importorskip("httpx")
+    from absurdia.clients.async_client import AsyncClient
+
+    async def create():
+        async with AsyncClient(TOKEN, api_base=server.url) as client:
+            return await client.strategies.create_many(
+                [{"name": "S%d" % (i,)} for i in range(12)], chunk_size=5, max_concurrency=3
+            )
+
+    results = asyncio.run(create())
+    assert [strategy["name"] for strategy in results] == ["S%d" % (i,) for i in range(12)]
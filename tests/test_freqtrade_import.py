@@ -0,0 +1,65 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from absurdia.bench.suites import make_freqtrade_export
+from absurdia.cli.importers import freqtrade
+from absurdia.clients.async_client import AsyncClient
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "backtest-result.json"
+    path.write_text(json.dumps(make_freqtrade_export(50)))
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    # Logged on every import without the `freqtrade` package.
+    logging.disable(logging.WARNING)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_iter_export_streams_the_file(export_path):
+    chunks = list(freqtrade.iter_export(export_path, chunk_size=1024))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == make_freqtrade_export(50)
+
+
+@pytest.mark.parametrize("with_ijson", [True, False])
+def test_iter_export_keeps_the_fields_given(monkeypatch, export_path, with_ijson):
+    if with_ijson:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(freqtrade, "ijson", None)
+    exported = json.loads(b"".join(freqtrade.iter_export(export_path, ["trades", "timeframe"])))
+    assert set(exported["strategy"]["Bench"]) == {"trades", "timeframe"}
+    assert exported["strategy_comparison"] == make_freqtrade_export(50)["strategy_comparison"]
+
+
+def test_import_freqtrade_stream(server, client, export_path):
+    backtest = client.backtests.import_freqtrade_stream(
+        lambda: freqtrade.iter_export(export_path, chunk_size=1024), name="Streamed"
+    )
+    assert backtest["name"] == "Streamed"
+    # The export was sent whole, inside the envelope of the import.
+    assert backtest["strategies"] == ["Bench"]
+    assert backtest["framework"]["name"] == "freqtrade"
+
+
+def test_import_freqtrade_stream_async(server, export_path):
+    pytest.importorskip("httpx")
+    async def main():
+        async with AsyncClient(TOKEN, api_base=server.url) as client:
+            return await client.backtests.import_freqtrade_stream(
+                freqtrade.iter_export(export_path, chunk_size=1024), name="Streamed"
+            )
+
+    backtest = asyncio.run(main())
+    assert backtest["name"] == "Streamed"
+    assert backtest["strategies"] == ["Bench"]
@@ -0,0 +1,34 @@
+from absurdia.clients.instrumentation import Histogram, endpoint_template
+
+
+def test_endpoint_template():
+    assert endpoint_template("http://h/v1/backtests/bt_%s/positions" % ("0" * 24,)) == \
+        "/v1/backtests/{id}/positions"
+    assert endpoint_template("http://h/v1/accounts?current=true") == "/v1/accounts"
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.add(float(ms))
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert 45 <= histogram.percentile(50) <= 55
+    assert 95 <= histogram.percentile(99) <= 105
+
+
+def test_stats_by_endpoint(client):
+    events = []
+    client.http_client.instrumentation.on("response", events.append)
+    for _ in range(3):
+        strategy = client.strategies.create("Timed")
+        client.strategies.retrieve(strategy.id)
+    client.request("GET", "/v1/strategies/str_%s" % ("0" * 24,))
+
+    stats = client.stats()["endpoints"]
+    retrieve = stats["GET /v1/strategies/{id}"]
+    assert retrieve["count"] == 4
+    assert retrieve["statuses"] == {200: 3, 404: 1}
+    assert retrieve["phases"]["total"]["p99_ms"] > 0
+    assert stats["POST /v1/strategies"]["count"] == 3
+    assert len(events) == 7 and events[0]["status_code"] == 200
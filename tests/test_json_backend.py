@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from absurdia import json_backend
+
+VALUE = {"name": "Stratégie", "values": [1, 2.5, None, True], "nested": {"a": "b"}}
+
+# Values some backends cannot encode on their own, and their encoding
+# decoded by the standard library.
+UNUSUAL = [
+    ({1: "a", 2.5: "b"}, {"1": "a", "2.5": "b"}),
+    (2 ** 70, 2 ** 70),
+    ({"big": [-(2 ** 64)]}, {"big": [-(2 ** 64)]}),
+]
+
+
+@pytest.fixture(params=json_backend.BACKENDS)
+def backend(request):
+    previous = json_backend.name
+    try:
+        json_backend.set_backend(request.param)
+    except ImportError as e:
+        pytest.skip(str(e))
+    yield request.param
+    json_backend.set_backend(previous)
+
+
+def test_backends_agree(backend):
+    encoded = json_backend.dumps(VALUE)
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded.replace("Stratégie".encode(), b"")
+    assert json_backend.loads(encoded) == VALUE
+    assert json_backend.name == backend
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        json_backend.set_backend("simplejson")
+
+
+@pytest.mark.parametrize("value,decoded", UNUSUAL)
+def test_unusual_values(backend, value, decoded):
+    assert json.loads(json_backend.dumps({"value": value})) == {"value": decoded}
+
+
+def test_numpy_values(backend):
+    np = pytest.importorskip("numpy")
+    value = [np.float64(1.5), np.int64(-3), np.bool_(True), np.arange(3), np.zeros((2, 2))[:, 0]]
+    assert json.loads(json_backend.dumps(value)) == [1.5, -3, True, [0, 1, 2], [0.0, 0.0]]
+
+
+def test_unserializable(backend):
+    with pytest.raises(TypeError):
+        json_backend.dumps({"value": object()})
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "psutil", "cryptography", "requests", "httpx")
+
+# The default transport of the client needs requests.
+OPTIONAL_MODULES = tuple(module for module in HEAVY_MODULES if module != "requests")
+
+
+def _imported(statement: str) -> set:
+    code = "import sys; %s; print(' '.join(sorted(sys.modules)))" % (statement,)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+def test_heavy_dependencies_are_not_imported():
+    assert _imported("import absurdia").isdisjoint(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize("statement", [
+    "from absurdia import Client",
+    "from absurdia.clients import Client; Client('0' * 64)",
+    "from absurdia.resources.backtests import Backtest",
+])
+def test_optional_dependencies_are_imported_on_use(statement):
+    assert _imported(statement).isdisjoint(OPTIONAL_MODULES)
+
+
+def test_client_is_resolved_on_first_use():
+    import absurdia
+    from absurdia.clients import Client
+    assert absurdia.Client is Client
@@ -0,0 +1,25 @@
+import pytest
+
+
+@pytest.fixture
+def strategies(client):
+    return [client.strategies.create("S%d" % (i,)).id for i in range(25)]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_fetches_every_page(server, client, strategies, prefetch):
+    ids = [strategy.id for strategy in client.strategies.iter_all(page_size=10, prefetch=prefetch)]
+    assert ids == strategies
+    assert server.stats()["endpoints"]["GET /v1/strategies"] == 3
+
+
+def test_iter_all_is_lazy(server, client, strategies):
+    iterator = client.strategies.iter_all(page_size=10, prefetch=False)
+    assert next(iterator).id == strategies[0]
+    assert server.stats()["endpoints"]["GET /v1/strategies"] == 1
+    iterator.close()
+
+
+def test_list_limit(client):
+    with pytest.raises(ValueError):
+        client.strategies.list({"limit": 10001})
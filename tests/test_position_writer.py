@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from absurdia.api_error import APIError
+from absurdia.position_writer import PositionWriter
+
+
+def _backtest(client):
+    return client.backtests.create(1, 2, "5m", strategy_name="Writer")
+
+
+def test_positions_are_sent_in_batches(client):
+    backtest = _backtest(client)
+    with backtest.writer(max_batch_size=10) as writer:
+        writer.add_positions([{"symbol": "BTC/USDT", "price": float(i)} for i in range(25)])
+        writer.flush()
+        assert writer.positions_sent == 25
+    assert writer.batches_sent == 3
+    assert [p["price"] for p in backtest.positions()] == [float(i) for i in range(25)]
+
+
+def test_unencodable_position_raises_in_the_caller(client):
+    backtest = _backtest(client)
+    writer = PositionWriter(backtest)
+    writer.add_position({"symbol": "BTC/USDT", "price": 1.0})
+    with pytest.raises(TypeError):
+        writer.add_position({"symbol": "BTC/USDT", "tags": {"a", "b"}})
+    with pytest.raises(TypeError):
+        writer.add_position({"symbol": "BTC/USDT", "price": Decimal("1.5")})
+
+    # The positions buffered before are still sent.
+    writer.finish()
+    assert writer.errors == []
+    assert len(backtest.positions()) == 1
+
+
+class _Rejecting():
+    id = "bt_rejecting"
+
+    def add_positions(self, positions):
+        raise APIError("Not found", 404)
+
+
+def test_upload_errors_are_raised_by_finish():
+    writer = PositionWriter(_Rejecting())
+    writer.add_position({"symbol": "BTC/USDT"})
+    writer.flush()
+    assert len(writer.errors) == 1
+    with pytest.raises(APIError):
+        writer.finish()
+
+
+def test_writes_raise_once_the_worker_stopped(monkeypatch):
+    def broken(self, batch):
+        if batch:
+            raise RuntimeError("Broken")
+    monkeypatch.setattr(PositionWriter, "_send", broken)
+
+    writer = PositionWriter(_Rejecting(), max_batch_size=1)
+    writer.add_position({"symbol": "BTC/USDT"})
+    writer._worker.join(5)
+    assert not writer._worker.is_alive()
+    assert [str(e) for e in writer.errors] == ["Broken"]
+
+    with pytest.raises(RuntimeError):
+        writer.add_position({"symbol": "BTC/USDT"})
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    with pytest.raises(RuntimeError):
+        writer.finish()
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+from absurdia.profiling import ProcessProfiler
+
+# Busy for about 0.3 s in a child process of its own.
+BUSY = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', "
+    "'import time\\nend = time.time() + 0.3\\nwhile time.time() < end: pass'])\n"
+    "data = bytearray(20 * 1024 * 1024)\n"
+    "child.wait()\n"
+)
+
+
+def test_profiles_the_process_tree():
+    process = subprocess.Popen([sys.executable, "-c", BUSY])
+    with ProcessProfiler(process, interval=0.05) as profiler:
+        process.wait()
+    summary = profiler.summary()
+    assert summary["processes"] >= 2
+    assert summary["samples"] >= 2
+    assert summary["cpu_user_s"] + summary["cpu_system_s"] > 0.1
+    assert summary["peak_rss_bytes"] > 20 * 1024 * 1024
+    assert summary["wall_time_s"] >= 0.3
+    assert len(summary["per_core_percent"]["mean"]) > 0
+
+
+def test_import_freqtrade_uploads_the_profile(client):
+    profile = {"wall_time_s": 1.0, "peak_rss_bytes": 1}
+    backtest = client.backtests.import_freqtrade({"strategy": {}}, name="Profiled", profile=profile)
+    assert backtest["profile"] == profile
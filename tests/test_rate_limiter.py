@@ -0,0 +1,55 @@
+import time
+
+from absurdia.api_response import APIResponse
+from absurdia.clients import Client
+from absurdia.clients.rate_limiter import FileBackend, RateLimiter
+from absurdia.testing import LocalServer
+from tests.conftest import TOKEN
+
+
+def test_burst_then_paced():
+    limiter = RateLimiter(rate=100, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+    # Five tokens at once, then one every 10 ms.
+    assert 0.08 <= elapsed < 0.5
+    assert limiter.stats()["acquired"] == 15 and limiter.stats()["waited"] >= 9
+
+
+def test_unknown_rate_does_not_wait():
+    limiter = RateLimiter()
+    assert all(limiter.acquire() == 0 for _ in range(100))
+
+
+def test_rate_is_learnt_from_headers():
+    limiter = RateLimiter()
+    limiter.update(APIResponse(200, "{}", {
+        "ratelimit-limit": "20", "ratelimit-remaining": "19", "ratelimit-policy": "20;w=2"
+    }))
+    state = limiter.backend._state
+    assert (state.rate, state.burst) == (10.0, 20.0)
+
+
+def test_429_blocks_until_retry_after():
+    limiter = RateLimiter(rate=1000)
+    limiter.update(APIResponse(429, "{}", {"retry-after": "0.2"}))
+    assert 0.1 < limiter.acquire() < 1.0
+
+
+def test_file_backend_is_shared(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    first = RateLimiter(rate=1, burst=1, backend=FileBackend(path))
+    second = RateLimiter(rate=1, burst=1, backend=FileBackend(path))
+    assert first._try_acquire() == 0
+    assert second._try_acquire() > 0
+
+
+def test_client_stays_under_the_server_limit():
+    with LocalServer(rate_limit=50) as server:
+        client = Client(TOKEN, api_base=server.url, rate_limiter=True, max_network_retries=0)
+        for _ in range(80):
+            assert client.request("GET", "/v1/accounts", params={"current": "true"}).ok
+        assert server.stats()["throttled"] == 0
+        client.http_client.close()
@@ -0,0 +1,48 @@
+from absurdia.api_response import APIResponse
+from absurdia.clients import Client
+from absurdia.clients.retry import RetryBudget, RetryPolicy, parse_retry_after
+from absurdia.testing import LocalServer
+from tests.conftest import TOKEN
+
+
+def _policy(**options) -> RetryPolicy:
+    options.setdefault("budget", RetryBudget())
+    return RetryPolicy(backoff_base=0.001, jitter=False, **options)
+
+
+def test_only_idempotent_requests_are_retried():
+    policy = _policy(max_retries=2)
+    failed = APIResponse(503, "{}", {})
+    assert policy.should_retry("GET", {}, 0, response=failed)
+    assert not policy.should_retry("POST", {}, 0, response=failed)
+    assert policy.should_retry("POST", {"Idempotency-Key": "k"}, 0, response=failed)
+    assert not policy.should_retry("GET", {}, 2, response=failed)
+    assert not policy.should_retry("GET", {}, 0, response=APIResponse(400, "{}", {}))
+
+
+def test_retry_after_is_honoured():
+    policy = _policy(max_retries=2, max_retry_after=10)
+    assert policy.delay(0, APIResponse(429, "{}", {"retry-after": "2"})) == 2.0
+    assert not policy.should_retry("GET", {}, 0, response=APIResponse(429, "{}", {"retry-after": "60"}))
+    assert parse_retry_after("soon") is None
+
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, min_tokens=1, max_tokens=2)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2
+
+
+def test_requests_are_retried_until_they_succeed():
+    with LocalServer(error_rate=0.5, seed=3) as server:
+        client = Client(TOKEN, api_base=server.url, retry_policy=_policy(max_retries=20))
+        for _ in range(5):
+            assert client.strategies.create("Retried")
+        stats = server.stats()
+        assert stats["errors"] > 0
+        # Each creation is made once, whatever its number of attempts.
+        assert len(server.resources["strategies"]) == 5
+        client.http_client.close()
@@ -0,0 +1,60 @@
+import base64
+import json
+
+import pytest
+
+from absurdia.clients import Client
+from absurdia.signing import SIGNATURE_HEADER, BatchSigner, Signer, canonical
+from tests.conftest import TOKEN
+
+serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+
+
+@pytest.fixture
+def key():
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def _encoded(key) -> str:
+    raw = key.private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw,
+        serialization.NoEncryption()
+    )
+    return base64.b64encode(raw).decode()
+
+
+def _verify(key, header: str, body: bytes):
+    fields = dict(part.split("=", 1) for part in header.split(","))
+    signature = base64.urlsafe_b64decode(fields["s"] + "=" * (-len(fields["s"]) % 4))
+    key.public_key().verify(signature, b"%s.%s" % (fields["t"].encode(), body))
+
+
+def test_sign(key):
+    signer = Signer(_encoded(key))
+    header = signer.sign(b'{"a":1}', timestamp=123)
+    assert header.startswith("t=123,s=")
+    _verify(key, header, b'{"a":1}')
+
+
+def test_batch_is_signed_once(key):
+    batch = BatchSigner(Signer(key), max_payloads=3)
+    assert not batch.add({"a": 1})
+    assert not batch.add({"b": [1, 2]})
+    assert batch.add({"c": "d"})
+    body = batch.body()
+    assert json.loads(body) == [{"a": 1}, {"b": [1, 2]}, {"c": "d"}]
+    _verify(key, batch.headers()[SIGNATURE_HEADER], body)
+    batch.clear()
+    assert len(batch) == 0 and batch.body() == b"[]"
+
+
+def test_signed_request_sends_the_signed_bytes(server, key):
+    client = Client(TOKEN, api_base=server.url, signature_key=_encoded(key))
+    data = {"name": "Signed", "metadata": {"b": 1, "a": 2}}
+    assert client.request("POST", "/v1/strategies", data=data, signed=True).ok
+    sent = client.http_client.last_request
+    # Sent uncompressed, as the very bytes signed.
+    assert sent["data"] == canonical(data)
+    _verify(key, sent["headers"][SIGNATURE_HEADER], sent["data"])
+    client.http_client.close()
@@ -0,0 +1,102 @@
+import pytest
+
+from absurdia.clients import Client
+from absurdia.spool import REF_PREFIX, Spool
+from tests.conftest import TOKEN
+
+
+@pytest.fixture
+def spool(tmp_path):
+    # A long interval, so that only the tests flush.
+    spool = Spool(path=str(tmp_path / "spool.db"), flush_interval=3600)
+    yield spool
+    spool.close()
+
+
+@pytest.fixture
+def spooling_client(server, spool):
+    client = Client(TOKEN, api_base=server.url, enable_telemetry=False, spool=spool)
+    yield client
+    client.http_client.close()
+
+
+def test_writes_are_spooled_until_flushed(server, spooling_client, spool):
+    backtest = spooling_client.backtests.create(1, 2, "5m", strategy_name="Spool")
+    assert backtest.id.startswith(REF_PREFIX)
+    backtest.add_positions([{"symbol": "BTC/USDT", "price": 1.0}])
+    backtest.finish()
+
+    assert server.stats()["requests"] == 0
+    assert spool.status()["pending"] == 3
+
+
+def test_finish_is_sent_after_the_positions(client, spooling_client, spool):
+    backtest = spooling_client.backtests.create(1, 2, "5m", strategy_name="Spool")
+    for i in range(3):
+        backtest.add_positions([{"symbol": "BTC/USDT", "price": float(i)}] * 2)
+    backtest.finish()
+    spool.flush()
+
+    id = spool.resolve(backtest.id)
+    assert id is not None and not id.startswith(REF_PREFIX)
+    sent = client.backtests.retrieve(id)
+    assert sent["status"] == "finished"
+    assert [p["price"] for p in sent.positions()] == [0.0, 0.0, 1.0, 1.0, 2.0, 2.0]
+    assert spool.status()["pending"] == 0
+
+
+def test_finish_of_a_backtest_sent_already(client, spooling_client, spool):
+    backtest = client.backtests.create(1, 2, "5m", strategy_name="Spool")
+    spooled = spooling_client.backtests.retrieve(backtest.id)
+    spooled.add_positions([{"symbol": "BTC/USDT", "price": 1.0}])
+    spooled.finish()
+    spool.flush()
+
+    assert client.backtests.retrieve(backtest.id)["status"] == "finished"
+    assert len(backtest.positions()) == 1
+
+
+def test_spooled_import(client, spooling_client, spool):
+    backtest = spooling_client.backtests.import_freqtrade({"strategy": {}}, name="Import")
+    assert backtest.id.startswith(REF_PREFIX)
+    backtest.finish()
+    spool.flush()
+
+    assert client.backtests.retrieve(spool.resolve(backtest.id))["status"] == "finished"
+
+
+def test_spooled_import_stream(server, client, spooling_client, spool):
+    chunks = [b'{"strategy":', b'{"Spooled":{"trades":[]}}}']
+    backtest = spooling_client.backtests.import_freqtrade_stream(iter(chunks), name="Stream")
+    assert backtest.id.startswith(REF_PREFIX)
+    assert server.stats()["requests"] == 0
+    spool.flush()
+
+    imported = client.backtests.retrieve(spool.resolve(backtest.id))
+    assert imported["name"] == "Stream" and imported["strategies"] == ["Spooled"]
+
+
+def test_rejected_entries_are_set_aside(client, spool):
+    spool.client = client
+    spool.add_positions("bt_missing", [{"symbol": "BTC/USDT"}])
+    spool.finish_backtest("bt_missing")
+
+    assert spool.flush() == 2
+    status = spool.status()
+    assert status["pending"] == 0 and status["failed"] == 2
+    assert spool.retry_failed() == 2
+
+
+def test_writes_survive_a_new_spool(tmp_path):
+    path = str(tmp_path / "spool.db")
+    first = Spool(path=path)
+    first.add_positions("bt_1", [{"symbol": "BTC/USDT"}])
+    first.finish_backtest("bt_1")
+    first.close()
+
+    second = Spool(path=path)
+    assert second.status()["by_kind"] == {
+        "positions": {"pending": 1, "failed": 0},
+        "finish": {"pending": 1, "failed": 0},
+    }
+    second.close()
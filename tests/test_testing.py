@@ -0,0 +1,39 @@
+from absurdia import testing
+from absurdia.clients import Client
+from tests.conftest import TOKEN
+
+
+def _create(client, key: str, name: str = "Strategy"):
+    return client.request(
+        "POST", "/v1/strategies", data={"name": name},
+        additional_headers={"Idempotency-Key": key}
+    )
+
+
+def test_retried_requests_get_the_first_response(client):
+    first = _create(client, "key-1")
+    again = _create(client, "key-1", name="Other")
+    assert again.json["data"]["id"] == first.json["data"]["id"]
+    assert len(client.strategies.list()) == 1
+
+
+def test_idempotency_keys_are_bounded(monkeypatch, server, client):
+    monkeypatch.setattr(testing, "MAX_IDEMPOTENCY_KEYS", 3)
+    first = _create(client, "key-0")
+    for i in range(1, 4):
+        _create(client, "key-%d" % (i,))
+    assert len(server._idempotent) == 3
+    assert "key-0" not in server._idempotent
+
+    # Evicted, so the request is served again.
+    again = _create(client, "key-0")
+    assert again.json["data"]["id"] != first.json["data"]["id"]
+
+
+def test_error_injection():
+    with testing.LocalServer(error_rate=1.0) as server:
+        client = Client(TOKEN, api_base=server.url, max_network_retries=0)
+        response = client.request("GET", "/v1/users/me")
+        assert response.status_code == 503
+        assert server.stats()["errors"] == 1
+        client.http_client.close()
@@ -0,0 +1,39 @@
+import pytest
+
+from absurdia.clients import Client
+from absurdia.clients.transports import TRANSPORTS, Transport, get_transport
+from tests.conftest import TOKEN
+
+
+@pytest.fixture(params=TRANSPORTS)
+def transport_client(request, server):
+    try:
+        client = Client(TOKEN, api_base=server.url, transport=request.param)
+    except ImportError as e:
+        pytest.skip(str(e))
+    yield client
+    client.http_client.close()
+
+
+def test_requests_through_each_transport(transport_client):
+    strategy = transport_client.strategies.create("Transported")
+    assert transport_client.strategies.retrieve(strategy.id)["name"] == "Transported"
+    response = transport_client.request("GET", "/v1/strategies/str_missing")
+    assert response.status_code == 404
+
+
+def test_compressed_uploads_through_each_transport(transport_client):
+    transport_client.compression_threshold = 0
+    backtest = transport_client.backtests.create(1, 2, "5m", strategy_name="Transported")
+    positions = [{"symbol": "BTC/USDT", "price": float(i)} for i in range(100)]
+    backtest.add_positions(positions)
+    assert backtest.positions() == positions
+
+
+def test_get_transport():
+    transport = get_transport("urllib3")
+    assert isinstance(transport, Transport)
+    assert get_transport(transport) is transport
+    with pytest.raises(ValueError):
+        get_transport("curl")
+    transport.close()
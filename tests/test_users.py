@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from absurdia.clients.async_client import AsyncClient
+from tests.conftest import TOKEN
+
+
+def test_users_cannot_be_listed(server, client):
+    with pytest.raises(NotImplementedError):
+        client.users.list()
+    with pytest.raises(NotImplementedError):
+        next(client.users.iter_all())
+    assert server.stats()["requests"] == 0
+
+
+def test_users_cannot_be_listed_async(server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncClient(TOKEN, api_base=server.url) as client:
+            await client.users.list()
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(main())